@@ -0,0 +1,29 @@
+import argparse
+from dataclasses import replace
+from src.config.configuration_manager import ConfigurationManager
+from src.components.benchmark_component import BenchmarkComponent, SUITES, compare_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the input pipelines, training steps, inference and input "
+                                                 "memory on a synthetic dataset, or compare two benchmark results.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES), help="Suites to run")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=None,
+                        help="Training and inference batch sizes, defaults to benchmark.batch_sizes in config.yaml")
+    parser.add_argument("--images-per-class", type=int, default=None,
+                        help="Synthetic images per class, defaults to benchmark.images_per_class in config.yaml")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), default=None,
+                        help="Compare two result JSON files instead of running the benchmarks")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.compare:
+        print(compare_results(*args.compare).to_string(index=False, float_format="{:.2f}".format))
+    else:
+        benchmark_entity = ConfigurationManager().get_benchmark_entity()
+        overrides = dict(batch_sizes=args.batch_sizes, images_per_class=args.images_per_class)
+        benchmark_entity = replace(benchmark_entity, **{key: value for key, value in overrides.items()
+                                                        if value is not None})
+        BenchmarkComponent(benchmark_entity).run(suites=tuple(args.suites))
@@ -1,38 +1,85 @@
-from src.pipeline.s01_ingest_data import IngestDataPipeline
-from src.pipeline.stage_02_base_model_gen_pipeline import BaseModelPipeline
-from src.pipeline.stage_04_model_training_pipeline import ModelTrainingPipeline
-from src.pipeline.stage_05_model_evaluation_pipeline import ModelEvaluationPipeline
-
+import sys
+import json
+import time
+import argparse
+import subprocess
 from src.logger import logging
-stage01 = "Data Ingestion"
-stage02 = "Base Model Generator"
-stage03 = "Model Training"
-stage04 = "Model Evaluation"
-
-logging.info(f"{stage01} Started")
-ingest_data = IngestDataPipeline()
-ingest_data.main()
-logging.info(f"{stage01} Ended")
-
-try:
-    print(f"Stage 02 {stage02} started")
-    model_gen = BaseModelPipeline()
-    model_gen.main()
-    print(f"Stage 02 {stage02} ended")
-except Exception as e:
-    raise e
-
-try:
-    print(f"Stage 03 {stage03} started")
-    callbacks = ModelTrainingPipeline
-    callbacks.main()
-    print(f"Stage 03 {stage03} ended")
-except Exception as e:
-    raise e
-
-try:
-    print(f"Stage 04 {stage04} started")
-    model_eval = ModelEvaluationPipeline
-    model_eval.main()
-except Exception as e:
-    raise e
\ No newline at end of file
+from src.pipeline.stage_runner import StageRunner, STAGES
+
+# Start-up budget of this CLI: parsing the arguments and reading the stage fingerprints must not import any of
+# HEAVY_MODULES and must finish within STARTUP_BUDGET_SECONDS. Stage pipelines, and with them TensorFlow, pandas
+# or the Kaggle client, are imported only when a stage actually runs. `python main.py check-startup` enforces it.
+STARTUP_BUDGET_SECONDS = 1.0
+HEAVY_MODULES = ("tensorflow", "keras", "pandas", "sklearn", "matplotlib", "seaborn", "kaggle")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the pipeline stages whose inputs changed since their last run.")
+    parser.add_argument("--force", action="store_true", help="run even if the stage is up to date")
+    # suppressed default, so a subcommand does not reset a --force given before it
+    force = argparse.ArgumentParser(add_help=False)
+    force.add_argument("--force", action="store_true", default=argparse.SUPPRESS,
+                       help="run even if the stage is up to date")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("run", parents=[force], help="run every stage in order (the default)")
+    for number, stage in enumerate(STAGES, start=1):
+        commands.add_parser(stage.command, parents=[force], help=f"run stage {number:02d} {stage.name} only")
+    commands.add_parser("status", help="show which stages are up to date")
+    commands.add_parser("check-startup", help=f"check that the CLI starts within {STARTUP_BUDGET_SECONDS:.1f} s "
+                                              f"without importing {', '.join(HEAVY_MODULES)}")
+    return parser
+
+
+def run_stages(stages, force: bool) -> None:
+    runner = StageRunner()
+    for stage in stages:
+        number = STAGES.index(stage) + 1
+        try:
+            print(f"Stage {number:02d} {stage.name} started")
+            ran = runner.run(stage, force=force)
+            print(f"Stage {number:02d} {stage.name} {'ended' if ran else 'skipped (up to date)'}")
+        except Exception as e:
+            logging.exception(e)
+            raise e
+
+
+def print_status() -> None:
+    runner = StageRunner()
+    for number, stage in enumerate(STAGES, start=1):
+        state = "up to date" if runner.is_up_to_date(stage) else "needs to run"
+        print(f"{number:02d} {stage.command:<12} {stage.name:<22} {state}")
+
+
+def check_startup() -> int:
+    """
+    Imports this CLI, builds its parser and computes every stage fingerprint in a fresh interpreter, then checks
+    the time it took and the modules it imported against the start-up budget.
+
+    Returns:
+        int: Exit code, 0 when the budget is met.
+    """
+    probe = ("import sys, time, json; start = time.perf_counter(); import main; main.build_parser(); "
+             "runner = main.StageRunner(); [runner.fingerprint(stage) for stage in main.STAGES]; "
+             "print(json.dumps(dict(seconds=time.perf_counter() - start, "
+             "heavy=sorted(name for name in main.HEAVY_MODULES if name in sys.modules))))")
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    total = time.perf_counter() - start
+    result = json.loads(output.strip().splitlines()[-1])
+    print(f"Imports, parser and fingerprints: {result['seconds']:.3f} s, interpreter included: {total:.3f} s "
+          f"(budget {STARTUP_BUDGET_SECONDS:.1f} s)")
+    if result["heavy"]:
+        print(f"Heavy modules imported at start-up: {', '.join(result['heavy'])}")
+    return 0 if total <= STARTUP_BUDGET_SECONDS and not result["heavy"] else 1
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.command == "status":
+        print_status()
+    elif args.command == "check-startup":
+        sys.exit(check_startup())
+    elif args.command in (None, "run"):
+        run_stages(STAGES, force=args.force)
+    else:
+        run_stages([stage for stage in STAGES if stage.command == args.command], force=args.force)
@@ -0,0 +1,29 @@
+import argparse
+from src.config.configuration_manager import ConfigurationManager
+from src.components.inference_component import InferenceComponent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Classify images with a trained model.")
+    parser.add_argument("inputs", nargs="+",
+                        help="Image files, directories, glob patterns or .txt files listing image paths")
+    parser.add_argument("--model-no", type=int, default=None,
+                        help="Model number of trained_model_{n}.h5, defaults to MODEL in params.yaml")
+    parser.add_argument("--output", default=None,
+                        help="Predictions file, defaults to inference.output_path in config.yaml")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Predictions file format")
+    parser.add_argument("--top-k", type=int, default=None, help="Classes per image, defaults to TOP_K")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Images per batch, defaults to PREDICT_BATCH_SIZE")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cm = ConfigurationManager()
+    if args.model_no is not None:
+        cm.params.MODEL = args.model_no
+    if args.batch_size is not None:
+        cm.params.PREDICT_BATCH_SIZE = args.batch_size
+    inference = InferenceComponent(cm.get_inference_entity())
+    inference.predict(args.inputs, output_path=args.output, output_format=args.format, top_k=args.top_k)
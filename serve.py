@@ -0,0 +1,32 @@
+import argparse
+from src.config.configuration_manager import ConfigurationManager
+from src.components.inference_component import InferenceComponent
+from src.components.serving_component import ServingComponent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve a trained model over HTTP with micro-batching.")
+    parser.add_argument("--model-no", type=int, default=None,
+                        help="Model number of trained_model_{n}.h5, defaults to MODEL in params.yaml")
+    parser.add_argument("--host", default=None, help="Defaults to serving.host in config.yaml")
+    parser.add_argument("--port", type=int, default=None, help="Defaults to serving.port in config.yaml")
+    parser.add_argument("--max-batch-size", type=int, default=None, help="Defaults to SERVE_MAX_BATCH_SIZE")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="Defaults to SERVE_MAX_WAIT_MS")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cm = ConfigurationManager()
+    if args.model_no is not None:
+        cm.params.MODEL = args.model_no
+    if args.host is not None:
+        cm.config.serving.host = args.host
+    if args.port is not None:
+        cm.config.serving.port = args.port
+    if args.max_batch_size is not None:
+        cm.params.SERVE_MAX_BATCH_SIZE = args.max_batch_size
+    if args.max_wait_ms is not None:
+        cm.params.SERVE_MAX_WAIT_MS = args.max_wait_ms
+    server = ServingComponent(cm.get_serving_entity(), InferenceComponent(cm.get_inference_entity()))
+    server.serve()
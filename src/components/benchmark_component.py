@@ -0,0 +1,489 @@
+import os
+import time
+import platform
+import datetime
+import resource
+import subprocess
+import multiprocessing
+from dataclasses import asdict
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from src.logger import logging
+from src.entity.entity_config import DataSplitEntity, ModelExportEntity
+from src.components.data_split_component import DataSplitComponent
+from src.components.stage_02_base_model_generator import build_backbone, add_head
+from src.components.stage_06_model_export_component import ModelExportComponent, _path_size, saved_model_predict_fn
+from src.utils.common import create_dirs, save_json, load_json, trained_model_file
+from src.utils.data_pipeline import (read_manifest, subset_indices, make_dataset, tfrecord_dataset,
+                                     manifest_dataset)
+from src.utils.image_cache import image_cache_path, load_image_cache
+from src.utils.synthetic_data import make_synthetic_dataset
+from src.utils.tfrecords import write_tfrecord_shards
+
+SUITES = ("input", "train", "inference", "memory")
+TFRECORD_SHARDS = 8
+# dataset sizes of the memory suite, in multiples of images_per_class
+MEMORY_SCALES = (1, 10)
+WARMUP_CALLS = 2
+
+
+def _time_calls(fn, runs: int, warmup: int = WARMUP_CALLS) -> dict:
+    """
+    Times repeated calls of fn after a few untimed warm-up calls (tracing, allocation, thread pool start-up).
+
+    Args:
+        fn (callable): Does one unit of work and returns the number of images it processed.
+        runs (int): Number of timed calls.
+        warmup (int): Number of untimed calls before the timed ones.
+
+    Returns:
+        dict: Mean, p50 and p90 call time in milliseconds and the images processed per second.
+    """
+    for _ in range(warmup):
+        fn()
+    seconds, images = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        images += fn()
+        seconds.append(time.perf_counter() - start)
+    milliseconds = np.array(seconds) * 1000.0
+    return dict(calls=runs,
+                mean_ms=float(milliseconds.mean()),
+                p50_ms=float(np.percentile(milliseconds, 50)),
+                p90_ms=float(np.percentile(milliseconds, 90)),
+                images_per_second=float(images / sum(seconds)))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _peak_rss_probe(pipeline: str, manifest_path: str, data_dir: str, dataset_kwargs: dict, batches: int, queue):
+    """
+    Runs in a fresh process, so the peak resident memory it reports belongs to one input pipeline alone:
+    builds the shuffled training dataset of the manifest and reads batches from it.
+    """
+    baseline = _peak_rss_mb()
+    if pipeline == "streaming":
+        dataset = manifest_dataset(manifest_path, data_dir, "train", shuffle=True, **dataset_kwargs)
+    else:
+        paths, labels, splits, _ = read_manifest(manifest_path, data_dir)
+        dataset = make_dataset(paths, labels, subset_indices(splits, "train"), shuffle=True, **dataset_kwargs)
+    start = time.perf_counter()
+    for _ in dataset.take(batches):
+        pass
+    queue.put(dict(baseline_rss_mb=baseline, peak_rss_mb=_peak_rss_mb(), seconds=time.perf_counter() - start))
+
+
+def _git_commit() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return dict(commit=None, dirty=None)
+    return dict(commit=commit, dirty=bool(status.strip()))
+
+
+def _flatten(values: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in values.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_results(baseline_path: str, current_path: str) -> pd.DataFrame:
+    """
+    Lines up every number two benchmark result files have in common, e.g. the results of two commits.
+
+    Args:
+        baseline_path (str): Result JSON of the reference run.
+        current_path (str): Result JSON of the run to compare.
+
+    Returns:
+        pd.DataFrame: One row per metric with both values and the relative change in percent.
+            Lower is better for *_ms and *_seconds, higher is better for images_per_second.
+    """
+    baseline, current = load_json(baseline_path), load_json(current_path)
+    baseline_values = _flatten({key: value for key, value in baseline.items() if key != "meta"})
+    current_values = _flatten({key: value for key, value in current.items() if key != "meta"})
+    rows = [dict(metric=metric,
+                 baseline=baseline_values[metric],
+                 current=current_values[metric],
+                 change_pct=(current_values[metric] - baseline_values[metric]) / baseline_values[metric] * 100.0
+                 if baseline_values[metric] else None)
+            for metric in sorted(set(baseline_values) & set(current_values))]
+    return pd.DataFrame(rows, columns=["metric", "baseline", "current", "change_pct"])
+
+
+class BenchmarkComponent:
+    """
+    BenchmarkComponent is a class designed for measuring the performance of the pipeline without the Kaggle dataset.
+    It generates a synthetic class-per-folder dataset and a split manifest for it, then times three suites:
+    "input" reads batches from the ImageDataGenerator loaders (flow_from_directory, and flow_from_dataframe as used by
+    INPUT_PIPELINE: keras_generator), from the tf.data loaders with and without the image cache, and from TFRecord shards of
+    the dataset (INPUT_PIPELINE: tfrecord); "train" times
+    training steps of the project model at every batch size; "inference" exports the model like the export stage and
+    times the .h5 model, the SavedModel and the TFLite model at batch size 1 (latency) and every batch size (throughput);
+    "memory" measures the peak resident memory of the in-memory tf.data pipeline and of the streaming manifest pipeline
+    (STREAM_MANIFEST) on the synthetic dataset and on a copy with 10 times the images, each in a process of its own.
+    The results are written as JSON together with the git commit, so runs of different commits can be compared.
+
+    Attributes:
+        config (BenchmarkEntity): An instance of BenchmarkEntity containing configuration parameters.
+        manifest_path (str): Split manifest of the synthetic dataset.
+        image_cache_dir (str): Image cache of the synthetic dataset.
+        tfrecord_dir (str): TFRecord shards of the synthetic dataset.
+        model_path (str): trained_model_path the benchmarked model is saved under for the export.
+        input_shape (tuple): Input shape of the benchmarked model, derived from IMAGE_SIZE.
+
+    Methods:
+        __init__(self, BenchmarkEntity): Constructor method to initialize BenchmarkComponent with a BenchmarkEntity.
+        prepare_data(self): Generates the synthetic dataset and its split manifest.
+        input_pipelines(self) -> dict: Times every input pipeline.
+        build_model(self) -> tf.keras.Model: Builds the project model without pre-trained weights.
+        training_steps(self, model) -> dict: Times training steps at every batch size.
+        inference(self, model) -> dict: Exports the model and times every format at every batch size.
+        memory(self) -> dict: Measures the peak memory of the training input pipelines as the dataset grows.
+        metadata(self, suites) -> dict: Describes the run, including the git commit.
+        run(self, suites=SUITES) -> dict: Runs the suites and writes the result JSON.
+
+    Example Usage:
+        # Instantiate BenchmarkComponent with the benchmark configuration
+        benchmark = BenchmarkComponent(ConfigurationManager().get_benchmark_entity())
+
+        # Run the input and inference suites
+        results = benchmark.run(suites=("input", "inference"))
+    """
+    def __init__(self, BenchmarkEntity):
+        """
+        Initializes BenchmarkComponent with a given BenchmarkEntity.
+
+        Args:
+            BenchmarkEntity (BenchmarkEntity): An instance of BenchmarkEntity containing configuration parameters.
+        """
+        self.config = BenchmarkEntity
+        self.manifest_path = os.path.join(self.config.root_dir, "manifest.csv")
+        self.image_cache_dir = os.path.join(self.config.root_dir, "image_cache")
+        self.tfrecord_dir = os.path.join(self.config.root_dir, "tfrecords")
+        self.model_path = os.path.join(self.config.root_dir, "model", "trained_model.h5")
+        self.input_shape = (self.config.params_image_size[0], self.config.params_image_size[1], 3)
+
+    def prepare_data(self, scale: int = 1) -> tuple:
+        """
+        Generates the synthetic dataset (reused while its settings do not change) and writes its split manifest.
+
+        Args:
+            scale (int): Multiple of images_per_class; datasets other than 1 get a directory and manifest of their own.
+
+        Returns:
+            tuple: (data_dir, manifest_path) of the dataset.
+        """
+        data_dir, manifest_path = self.config.synthetic_data_dir, self.manifest_path
+        if scale != 1:
+            data_dir = f"{self.config.synthetic_data_dir}_x{scale}"
+            manifest_path = os.path.join(self.config.root_dir, f"manifest_x{scale}.csv")
+        make_synthetic_dataset(data_dir,
+                               classes=self.config.params_classes,
+                               images_per_class=self.config.images_per_class * scale,
+                               seed=self.config.params_seed)
+        DataSplitComponent(DataSplitEntity(root_dir=self.config.root_dir,
+                                           manifest_path=manifest_path,
+                                           training_data_path=data_dir,
+                                           params_test_size=0.2,
+                                           params_valid_size=0.2,
+                                           params_seed=self.config.params_seed,
+                                           tfrecord_dir=self.tfrecord_dir,
+                                           params_tfrecord_shards=0,
+                                           params_tfrecord_compression="")).write_manifest()
+        return data_dir, manifest_path
+
+    def input_pipelines(self) -> dict:
+        """
+        Reads input_batches shuffled training batches of params_batch_size images from every input pipeline.
+        The image cache and the TFRecord shards are built (or reused) before their loaders are timed; the time it
+        took is reported separately.
+
+        Returns:
+            dict: Timing of every loader, and the image cache build time.
+        """
+        paths, labels, splits, class_names = read_manifest(self.manifest_path, self.config.synthetic_data_dir)
+        train = subset_indices(splits, "train")
+        manifest = pd.read_csv(self.manifest_path)
+        seed = self.config.params_seed
+
+        plain = tf.keras.preprocessing.image.ImageDataGenerator(rescale=1./255)
+        augmented = tf.keras.preprocessing.image.ImageDataGenerator(rotation_range=40,
+                                                                    horizontal_flip=True,
+                                                                    width_shift_range=0.2,
+                                                                    height_shift_range=0.2,
+                                                                    shear_range=0.2,
+                                                                    zoom_range=0.2,
+                                                                    rescale=1./255)
+        flow_kwargs = dict(target_size=self.config.params_image_size[:2],
+                           batch_size=self.config.params_batch_size,
+                           shuffle=True,
+                           seed=seed)
+        dataframe_kwargs = dict(directory=self.config.synthetic_data_dir,
+                                x_col="path",
+                                y_col="class_name",
+                                classes=class_names,
+                                **flow_kwargs)
+        dataset_kwargs = dict(num_classes=len(class_names),
+                              image_size=self.config.params_image_size,
+                              resize_mode=self.config.params_resize_mode,
+                              batch_size=self.config.params_batch_size,
+                              shuffle=True,
+                              seed=seed)
+
+        cache_existed = os.path.exists(image_cache_path(paths, self.config.params_image_size, self.image_cache_dir,
+                                                        self.config.params_resize_mode))
+        start = time.perf_counter()
+        cache = load_image_cache(paths, self.config.params_image_size, self.image_cache_dir,
+                                 self.config.params_resize_mode)
+        results = dict(image_cache=dict(reused=cache_existed, seconds=time.perf_counter() - start))
+        start = time.perf_counter()
+        write_tfrecord_shards(paths, labels, splits, class_names,
+                              data_dir=self.config.synthetic_data_dir,
+                              output_dir=self.tfrecord_dir,
+                              num_shards=TFRECORD_SHARDS,
+                              compression=self.config.params_tfrecord_compression)
+        results["tfrecords"] = dict(seconds=time.perf_counter() - start)
+
+        train_frame = manifest[manifest.split == "train"]
+        loaders = dict(
+            flow_from_directory=lambda: plain.flow_from_directory(self.config.synthetic_data_dir, **flow_kwargs),
+            flow_from_dataframe=lambda: plain.flow_from_dataframe(train_frame, **dataframe_kwargs),
+            flow_from_dataframe_augmented=lambda: augmented.flow_from_dataframe(train_frame, **dataframe_kwargs),
+            tf_data=lambda: make_dataset(paths, labels, train, **dataset_kwargs),
+            tf_data_augmented=lambda: make_dataset(paths, labels, train, augment=True, **dataset_kwargs),
+            tf_data_image_cache=lambda: make_dataset(paths, labels, train, cache=cache, **dataset_kwargs),
+            tf_data_image_cache_augmented=lambda: make_dataset(paths, labels, train, cache=cache, augment=True,
+                                                               **dataset_kwargs),
+            tfrecord=lambda: tfrecord_dataset(self.tfrecord_dir, "train", **dataset_kwargs),
+            tfrecord_augmented=lambda: tfrecord_dataset(self.tfrecord_dir, "train", augment=True, **dataset_kwargs),
+        )
+        for name, loader in loaders.items():
+            iterator = iter(loader())
+
+            def _next_batch(iterator=iterator):
+                images, _ = next(iterator)
+                return len(images)
+
+            results[name] = _time_calls(_next_batch, runs=self.config.input_batches)
+            logging.info(f"Input pipeline {name}: {results[name]}")
+        return results
+
+    def build_model(self) -> tf.keras.Model:
+        """
+        Builds the model of the base model stage (params_backbone with the params_head head) with randomly
+        initialised weights, so nothing is downloaded. Step and prediction times do not depend on the weight values.
+
+        Returns:
+            tf.keras.Model: Compiled model.
+        """
+        backbone = build_backbone(self.config.params_backbone, self.input_shape, weights=None)
+        backbone.trainable = not self.config.params_freeze_all
+        model = add_head(backbone, self.config.params_head, self.config.params_classes)
+        model.compile(optimizer=tf.keras.optimizers.SGD(learning_rate=self.config.params_lr),
+                      loss=tf.keras.losses.CategoricalCrossentropy(),
+                      metrics=["accuracy"])
+        return model
+
+    def training_steps(self, model: tf.keras.Model) -> dict:
+        """
+        Times train_steps training steps on random in-memory batches at every batch size, so only the model is measured.
+        A batch size that does not fit in memory is reported with its error.
+
+        Args:
+            model (tf.keras.Model): Model from build_model.
+
+        Returns:
+            dict: Timing of one training step keyed by batch size.
+        """
+        rng = np.random.default_rng(self.config.params_seed)
+        results = {}
+        for batch_size in self.config.batch_sizes:
+            images = rng.random((batch_size, *self.input_shape), dtype=np.float32)
+            targets = np.eye(self.config.params_classes, dtype=np.float32)[
+                rng.integers(0, self.config.params_classes, batch_size)]
+
+            def _step(images=images, targets=targets):
+                model.train_on_batch(images, targets)
+                return len(images)
+
+            try:
+                results[str(batch_size)] = _time_calls(_step, runs=self.config.train_steps)
+            except tf.errors.ResourceExhaustedError as e:
+                results[str(batch_size)] = dict(error=str(e).splitlines()[0])
+            logging.info(f"Training step at batch size {batch_size}: {results[str(batch_size)]}")
+        return results
+
+    @staticmethod
+    def _tflite_predict_fn(tflite_path: str):
+        interpreters = {}
+
+        def predict(images):
+            # one interpreter per batch size, resized once, since resizing reallocates every tensor
+            if len(images) not in interpreters:
+                interpreter = tf.lite.Interpreter(model_path=tflite_path)
+                interpreter.resize_tensor_input(interpreter.get_input_details()[0]["index"], list(images.shape))
+                interpreter.allocate_tensors()
+                interpreters[len(images)] = interpreter
+            return ModelExportComponent._tflite_predict(interpreters[len(images)], images)
+        return predict
+
+    def inference(self, model: tf.keras.Model) -> dict:
+        """
+        Saves the model as .h5, exports it with the export stage (SavedModel, and TFLite with params_quantization
+        calibrated on the synthetic training split), and times latency_runs predictions of every format at batch
+        size 1 and at every batch size.
+
+        Args:
+            model (tf.keras.Model): Model from build_model.
+
+        Returns:
+            dict: File size of every format and its timing keyed by batch size.
+        """
+        model.save(trained_model_file(self.model_path, 0))
+        exporter = ModelExportComponent(ModelExportEntity(root_dir=os.path.join(self.config.root_dir, "export"),
+                                                          trained_model_path=self.model_path,
+                                                          training_data_path=self.config.synthetic_data_dir,
+                                                          manifest_path=self.manifest_path,
+                                                          params_image_size=self.config.params_image_size,
+                                                          params_resize_mode=self.config.params_resize_mode,
+                                                          params_quantization=self.config.params_quantization,
+                                                          params_calibration_samples=self.config.params_calibration_samples,
+                                                          params_eval_samples=0,
+                                                          params_weight_sparsity=self.config.params_weight_sparsity,
+                                                          params_seed=self.config.params_seed,
+                                                          model_no=0))
+        exporter.export_saved_model()
+        exporter.export_tflite()
+        formats = dict(
+            keras_h5=(exporter.model_path, exporter.model.predict_on_batch),
+            saved_model=(exporter.saved_model_dir, saved_model_predict_fn(exporter.saved_model_dir)),
+            tflite=(exporter.tflite_path, self._tflite_predict_fn(exporter.tflite_path)),
+        )
+        rng = np.random.default_rng(self.config.params_seed)
+        batch_sizes = sorted({1, *self.config.batch_sizes})
+        inputs = {batch_size: rng.random((batch_size, *self.input_shape), dtype=np.float32)
+                  for batch_size in batch_sizes}
+
+        results = dict(quantization=self.config.params_quantization)
+        for name, (path, predict_fn) in formats.items():
+            results[name] = dict(size_bytes=_path_size(path))
+            for batch_size in batch_sizes:
+                def _predict(images=inputs[batch_size], predict_fn=predict_fn):
+                    predict_fn(images)
+                    return len(images)
+
+                results[name][str(batch_size)] = _time_calls(_predict, runs=self.config.latency_runs)
+            logging.info(f"Inference {name}: {results[name]}")
+        return results
+
+    def memory(self) -> dict:
+        """
+        Reads input_batches shuffled training batches from the in-memory tf.data pipeline (the file lists of
+        read_manifest) and from the streaming manifest pipeline, at every scale of MEMORY_SCALES. Every measurement
+        runs in a spawned process, so the peak resident memory of one does not hide the next. growth_mb is the
+        increase of the peak memory above the process baseline (TensorFlow loaded) from the smallest to the
+        largest dataset; the streaming pipeline should stay flat.
+
+        Returns:
+            dict: Baseline and peak memory of every pipeline at every scale, and the growth per pipeline.
+        """
+        common_kwargs = dict(image_size=self.config.params_image_size,
+                             resize_mode=self.config.params_resize_mode,
+                             batch_size=self.config.params_batch_size,
+                             seed=self.config.params_seed)
+        pipelines = dict(in_memory=common_kwargs,
+                         streaming=dict(common_kwargs,
+                                        shuffle_buffer=self.config.params_shuffle_buffer,
+                                        prefetch=self.config.params_prefetch_batches))
+        context = multiprocessing.get_context("spawn")
+        results = {}
+        for scale in MEMORY_SCALES:
+            data_dir, manifest_path = self.prepare_data(scale)
+            num_classes = len(load_json(os.path.splitext(manifest_path)[0] + ".json")["class_names"])
+            for name, dataset_kwargs in pipelines.items():
+                queue = context.Queue()
+                process = context.Process(target=_peak_rss_probe,
+                                          args=(name, manifest_path, data_dir,
+                                                dict(dataset_kwargs, num_classes=num_classes),
+                                                self.config.input_batches, queue))
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    raise RuntimeError(f"Memory probe of {name} at scale {scale} exited with {process.exitcode}")
+                results.setdefault(name, {})[f"x{scale}"] = queue.get()
+                logging.info(f"Memory {name} x{scale}: {results[name][f'x{scale}']}")
+        for name, scales in results.items():
+            smallest, largest = scales[f"x{MEMORY_SCALES[0]}"], scales[f"x{MEMORY_SCALES[-1]}"]
+            scales["growth_mb"] = ((largest["peak_rss_mb"] - largest["baseline_rss_mb"])
+                                   - (smallest["peak_rss_mb"] - smallest["baseline_rss_mb"]))
+        return results
+
+    def metadata(self, suites) -> dict:
+        """
+        Describes the run: git commit, library versions, machine and settings.
+
+        Args:
+            suites (tuple): Suites that run.
+
+        Returns:
+            dict: Metadata stored under "meta" in the result JSON.
+        """
+        return dict(**_git_commit(),
+                    timestamp=datetime.datetime.now().isoformat(timespec="seconds"),
+                    suites=list(suites),
+                    backbone=self.config.params_backbone,
+                    head=self.config.params_head,
+                    tensorflow=tf.__version__,
+                    numpy=np.__version__,
+                    python=platform.python_version(),
+                    machine=platform.platform(),
+                    processor=platform.processor(),
+                    cpu_count=os.cpu_count(),
+                    gpus=len(tf.config.list_physical_devices("GPU")),
+                    config=asdict(self.config))
+
+    def run(self, suites=SUITES) -> dict:
+        """
+        Prepares the synthetic data, runs the suites and writes benchmark_{timestamp}_{commit}.json to results_dir.
+
+        Args:
+            suites (tuple): Any of "input", "train", "inference" and "memory".
+
+        Returns:
+            dict: The results, with the run metadata under "meta".
+        """
+        unknown = set(suites) - set(SUITES)
+        if unknown:
+            raise ValueError(f"Unknown benchmark suites {sorted(unknown)}, expected some of {SUITES}")
+        results = dict(meta=self.metadata(suites))
+        self.prepare_data()
+        if "input" in suites:
+            results["input"] = self.input_pipelines()
+        if "train" in suites or "inference" in suites:
+            model = self.build_model()
+            if "train" in suites:
+                results["train"] = self.training_steps(model)
+            if "inference" in suites:
+                results["inference"] = self.inference(model)
+        if "memory" in suites:
+            results["memory"] = self.memory()
+
+        commit = results["meta"]["commit"] or "nogit"
+        result_path = os.path.join(self.config.results_dir,
+                                   f"benchmark_{datetime.datetime.now():%Y%m%d_%H%M%S}_{commit[:10]}.json")
+        create_dirs([result_path])
+        save_json(values=results, path=result_path)
+        logging.info(f"Benchmark results written to {result_path}")
+        return results
@@ -0,0 +1,135 @@
+import os
+import csv
+import random
+from src.logger import logging
+from src.utils.common import create_dirs, save_json
+from src.utils.dataset_files import list_image_files, SPLITS
+
+
+class DataSplitComponent:
+    """
+    DataSplitComponent is a class designed for splitting the ingested dataset into training, validation and test sets.
+    It walks the class folders once, assigns every image to a split (stratified by class and seeded), and writes the
+    assignment to a manifest CSV that the training and evaluation stages stream from. The rows are written in a seeded
+    random order, so a reader streaming the manifest through a bounded shuffle buffer sees every class from the start.
+    With params_tfrecord_shards set, the images and their labels are also packed into TFRecord shards, one shard set per
+    split (see write_tfrecord_shards), so the "tfrecord" input pipeline reads a few large files of its own split
+    sequentially instead of opening every image.
+
+    Attributes:
+        config (DataSplitEntity): An instance of DataSplitEntity containing configuration parameters.
+
+    Methods:
+        __init__(self, DataSplitEntity): Constructor method to initialize DataSplitComponent with a DataSplitEntity.
+        assign_splits(self, labels) -> list: Assigns every sample to 'train', 'valid' or 'test', stratified by class.
+        write_manifest(self): Lists the dataset, assigns the splits and writes the manifest and its summary.
+        write_tfrecords(self, paths, labels, splits, class_names): Packs the images into per-split TFRecord shards.
+
+    Example Usage:
+        # Instantiate DataSplitEntity with necessary configuration parameters
+        split_entity = DataSplitEntity(
+            root_dir='path/to/data_split',
+            manifest_path='path/to/data_split/manifest.csv',
+            training_data_path='path/to/training/data',
+            params_test_size=0.2,
+            params_valid_size=0.2,
+            params_seed=42,
+            tfrecord_dir='path/to/data_split/tfrecords',
+            params_tfrecord_shards=8,
+            params_tfrecord_compression='GZIP'
+        )
+
+        # Instantiate DataSplitComponent with DataSplitEntity
+        split_component = DataSplitComponent(split_entity)
+
+        # Write the split manifest
+        split_component.write_manifest()
+    """
+    def __init__(self, DataSplitEntity):
+        """
+        Initializes DataSplitComponent with a given DataSplitEntity.
+
+        Args:
+            DataSplitEntity (DataSplitEntity): An instance of DataSplitEntity containing configuration parameters.
+        """
+        self.config = DataSplitEntity
+        create_dirs([self.config.manifest_path])
+
+    def assign_splits(self, labels: list) -> list:
+        """
+        Assigns every sample to a split. Each class is shuffled with the configured seed and cut into
+        test, validation and training parts, so every split keeps the class proportions.
+
+        Args:
+            labels (list): Integer label of every sample.
+
+        Returns:
+            list: Split name of every sample, aligned with labels.
+        """
+        rng = random.Random(self.config.params_seed)
+        per_class = {}
+        for index, label in enumerate(labels):
+            per_class.setdefault(label, []).append(index)
+
+        splits = [None] * len(labels)
+        for label in sorted(per_class):
+            class_indices = per_class[label]
+            rng.shuffle(class_indices)
+            n_test = round(self.config.params_test_size * len(class_indices))
+            n_valid = round(self.config.params_valid_size * len(class_indices))
+            for position, index in enumerate(class_indices):
+                if position < n_test:
+                    splits[index] = "test"
+                elif position < n_test + n_valid:
+                    splits[index] = "valid"
+                else:
+                    splits[index] = "train"
+        return splits
+
+    def write_manifest(self):
+        """
+        Lists the dataset, assigns the splits and writes the manifest CSV together with a JSON summary
+        holding the class names, split sizes and split parameters, then the TFRecord shards when enabled.
+        """
+        paths, labels, class_names = list_image_files(self.config.training_data_path)
+        splits = self.assign_splits(labels)
+
+        # the folders are listed class by class; a bounded shuffle buffer would otherwise see one class at a time
+        order = list(range(len(paths)))
+        random.Random(self.config.params_seed).shuffle(order)
+        with open(self.config.manifest_path, "w", newline="") as manifest_file:
+            writer = csv.writer(manifest_file)
+            writer.writerow(["path", "label", "class_name", "split"])
+            for index in order:
+                relative_path = os.path.relpath(paths[index], self.config.training_data_path)
+                writer.writerow([relative_path, labels[index], class_names[labels[index]], splits[index]])
+
+        counts = {split: splits.count(split) for split in SPLITS}
+        save_json(values=dict(class_names=class_names,
+                              counts=counts,
+                              test_size=self.config.params_test_size,
+                              valid_size=self.config.params_valid_size,
+                              seed=self.config.params_seed),
+                  path=os.path.splitext(self.config.manifest_path)[0] + ".json")
+        logging.info(f"Wrote split manifest {self.config.manifest_path}: {counts}")
+        if self.config.params_tfrecord_shards:
+            self.write_tfrecords(paths, labels, splits, class_names)
+
+    def write_tfrecords(self, paths: list, labels: list, splits: list, class_names: list):
+        """
+        Packs the images into params_tfrecord_shards TFRecord shards in tfrecord_dir, one shard set per split.
+        Nothing is rewritten when the shards already match the images and their splits.
+
+        Args:
+            paths (list): Image paths as returned by list_image_files.
+            labels (list): Integer labels aligned with paths.
+            splits (list): Split of every image, aligned with paths.
+            class_names (list): Class names in label order.
+        """
+        # TensorFlow is only loaded when shards are written
+        from src.utils.tfrecords import write_tfrecord_shards
+        write_tfrecord_shards(paths, labels, splits, class_names,
+                              data_dir=self.config.training_data_path,
+                              output_dir=self.config.tfrecord_dir,
+                              num_shards=self.config.params_tfrecord_shards,
+                              compression=self.config.params_tfrecord_compression)
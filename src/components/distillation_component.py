@@ -0,0 +1,229 @@
+import os
+import math
+import numpy as np
+import tensorflow as tf
+from src.config.configuration_manager import DistillationEntity
+from src.logger import logging
+from src.utils.common import create_dirs, save_json, trained_model_file
+from src.utils.data_pipeline import read_manifest, subset_indices, make_dataset, soft_target_dataset
+from src.utils.image_cache import load_image_cache
+from src.utils.feature_cache import load_feature_cache
+from src.utils.model_profile import profile_model
+
+# same clipping keras applies before the log of CategoricalCrossentropy
+EPSILON = 1e-7
+
+
+class DistillationLoss(tf.keras.losses.Loss):
+    """
+    Knowledge distillation loss for targets built by soft_target_dataset: the first num_classes columns are the
+    one-hot labels, the last num_classes the teacher probabilities. Both models end in a softmax, so the logits are
+    recovered as log-probabilities (up to a constant, which the softmax ignores) and softened by the temperature:
+
+        loss = alpha * CE(labels, student) + (1 - alpha) * T^2 * KL(teacher_T || student_T)
+
+    The T^2 factor keeps the gradients of the soft term at the scale of the hard term when T changes.
+
+    Attributes:
+        num_classes (int): Number of classes.
+        temperature (float): Softmax temperature T.
+        alpha (float): Weight of the hard-label cross-entropy.
+    """
+    def __init__(self, num_classes: int, temperature: float, alpha: float, name: str = "distillation_loss"):
+        super().__init__(name=name)
+        self.num_classes = num_classes
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def call(self, y_true, y_pred):
+        hard, soft = y_true[:, :self.num_classes], y_true[:, self.num_classes:]
+        log_student = tf.math.log(tf.clip_by_value(y_pred, EPSILON, 1.0))
+        hard_loss = -tf.reduce_sum(hard * log_student, axis=-1)
+        teacher = tf.nn.softmax(tf.math.log(tf.clip_by_value(soft, EPSILON, 1.0)) / self.temperature)
+        log_student_t = tf.nn.log_softmax(log_student / self.temperature)
+        soft_loss = tf.reduce_sum(teacher * (tf.math.log(tf.clip_by_value(teacher, EPSILON, 1.0)) - log_student_t),
+                                  axis=-1)
+        return self.alpha * hard_loss + (1.0 - self.alpha) * self.temperature ** 2 * soft_loss
+
+    def get_config(self) -> dict:
+        return dict(super().get_config(), num_classes=self.num_classes,
+                    temperature=self.temperature, alpha=self.alpha)
+
+
+def hard_label_accuracy(num_classes: int):
+    """
+    Returns the accuracy of the predictions against the one-hot part of distillation targets, named "accuracy"
+    so fit logs accuracy and val_accuracy like the training stage does.
+    """
+    def accuracy(y_true, y_pred):
+        return tf.keras.metrics.categorical_accuracy(y_true[:, :num_classes], y_pred)
+    return accuracy
+
+
+class DistillationComponent:
+    """
+    DistillationComponent is a class designed for distilling the trained model of the training stage (the teacher)
+    into a compact student model. The teacher runs once over the training split and its predictions are kept as soft
+    labels in a memory-mapped file, keyed by the images and the teacher weights (see load_feature_cache), so training
+    the student, or training it again with another temperature, never runs the teacher. The student learns from the
+    soft labels and the true labels together (see DistillationLoss) and is saved as trained_model_{student_model_no}.h5
+    next to the teacher, compiled with a plain cross-entropy loss, so the evaluation and export stages read it like
+    any other trained model.
+
+    Attributes:
+        config (DistillationEntity): An instance of DistillationEntity containing configuration parameters.
+        teacher (tf.keras.Model): The trained teacher model.
+        class_names (list): Class names in label order.
+        soft_labels (np.ndarray): Memory-mapped teacher probabilities of the training split, one row per training image.
+        train_dataset (tf.data.Dataset): Shuffled (images, targets) batches of the training split, repeating endlessly.
+        valid_dataset (tf.data.Dataset): (images, targets) batches of the validation split; its soft labels are
+            the true labels, so val_loss measures the student alone.
+        steps_per_epoch (int): Number of steps per training epoch.
+        history (dict): Epoch history of the student training.
+
+    Methods:
+        __init__(self, DistillationEntity): Constructor method to initialize the DistillationComponent with a DistillationEntity.
+        load_teacher(self) -> tf.keras.Model: Loads trained_model_{teacher_model_no}.h5.
+        prepare_data(self): Caches the soft labels of the teacher and prepares the student datasets.
+        distill(self, student) -> tf.keras.Model: Trains the student against the soft labels and saves it.
+        save_report(self, student): Saves the training settings and the cost of teacher and student.
+
+    Example Usage:
+        # Instantiate DistillationEntity with necessary configuration parameters
+        distillation_config = ConfigurationManager().get_distillation_entity()
+
+        # Distill the teacher into a student built by the base model generator
+        distillation = DistillationComponent(distillation_config)
+        distillation.load_teacher()
+        distillation.prepare_data()
+        student = distillation.distill(student_model)
+        distillation.save_report(student)
+    """
+    def __init__(self, DistillationEntity):
+        """
+        Initializes the DistillationComponent with a given DistillationEntity.
+
+        Args:
+            DistillationEntity (DistillationEntity): An instance of DistillationEntity containing configuration parameters.
+        """
+        self.config = DistillationEntity
+        self.history_dir = os.path.join(os.path.dirname(self.config.trained_model_path), "history_csv")
+
+    def load_teacher(self) -> tf.keras.Model:
+        """
+        Loads the teacher model; the optimizer state is not needed to predict, so it is not restored.
+
+        Returns:
+            tf.keras.Model: The teacher.
+        """
+        teacher_path = trained_model_file(self.config.trained_model_path, self.config.teacher_model_no)
+        self.teacher = tf.keras.models.load_model(teacher_path, compile=False)
+        logging.info(f"Loaded teacher {teacher_path}")
+        return self.teacher
+
+    def prepare_data(self):
+        """
+        Runs the teacher over the training split once, or reads its cached soft labels, and prepares the shuffled
+        training dataset and the validation dataset of the student.
+        """
+        paths, labels, splits, class_names = read_manifest(self.config.manifest_path, self.config.training_data_path)
+        self.class_names = class_names
+        train_indices = subset_indices(splits, 'train')
+        valid_indices = subset_indices(splits, 'valid')
+        cache = None
+        if self.config.params_cache_images:
+            cache = load_image_cache(paths, self.config.params_image_size, self.config.image_cache_dir,
+                                     self.config.params_resize_mode)
+        dataset_kwargs = dict(num_classes=len(class_names),
+                              image_size=self.config.params_image_size,
+                              resize_mode=self.config.params_resize_mode,
+                              batch_size=self.config.params_batch_size)
+
+        teacher_inputs = make_dataset(paths, labels, train_indices, cache=cache, **dataset_kwargs)
+        self.soft_labels = load_feature_cache(self.teacher, teacher_inputs,
+                                              [paths[index] for index in train_indices],
+                                              self.config.params_image_size, self.config.soft_label_dir,
+                                              self.config.params_resize_mode)
+
+        self.train_dataset = soft_target_dataset(paths, labels, train_indices, self.soft_labels,
+                                                 cache=cache,
+                                                 augment=self.config.params_is_augment,
+                                                 shuffle=True,
+                                                 seed=self.config.params_seed,
+                                                 **dataset_kwargs)
+        self.steps_per_epoch = math.ceil(len(train_indices) / self.config.params_batch_size)
+        self.valid_dataset = make_dataset(paths, labels, valid_indices, cache=cache, **dataset_kwargs).map(
+            lambda images, one_hot: (images, tf.concat([one_hot, one_hot], axis=-1)))
+        logging.info(f"Prepared {len(train_indices)} training images with soft labels "
+                     f"and {len(valid_indices)} validation images")
+
+    def distill(self, student: tf.keras.Model) -> tf.keras.Model:
+        """
+        Trains the student against the soft labels and the true labels, keeping the weights of the epoch with the
+        best validation accuracy when early stopping is enabled, and saves it as trained_model_{student_model_no}.h5.
+
+        Args:
+            student (tf.keras.Model): Compiled student model, e.g. from BaseModelGeneratorComponent.actual_model.
+
+        Returns:
+            tf.keras.Model: The trained student.
+        """
+        num_classes = len(self.class_names)
+        optimizer = tf.keras.optimizers.deserialize(tf.keras.optimizers.serialize(student.optimizer))
+        student.compile(optimizer=optimizer,
+                        loss=DistillationLoss(num_classes,
+                                              temperature=self.config.params_temperature,
+                                              alpha=self.config.params_alpha),
+                        metrics=[hard_label_accuracy(num_classes)])
+
+        epoch_his_path = os.path.join(self.history_dir, f"epoch_his_{self.config.student_model_no}.csv")
+        create_dirs([epoch_his_path])
+        callbacks = [tf.keras.callbacks.CSVLogger(epoch_his_path)]
+        if self.config.params_early_stopping_patience:
+            callbacks.append(tf.keras.callbacks.EarlyStopping(monitor="val_accuracy",
+                                                              patience=self.config.params_early_stopping_patience,
+                                                              restore_best_weights=True))
+        self.history = student.fit(self.train_dataset,
+                                   epochs=self.config.params_epochs,
+                                   steps_per_epoch=self.steps_per_epoch,
+                                   validation_data=self.valid_dataset,
+                                   callbacks=callbacks).history
+
+        # saved with the loss of a regular trained model, so loading it needs no custom objects
+        student.compile(optimizer=student.optimizer,
+                        loss=tf.keras.losses.CategoricalCrossentropy(),
+                        metrics=["accuracy"])
+        student_path = trained_model_file(self.config.trained_model_path, self.config.student_model_no)
+        student.save(student_path)
+        logging.info(f"Saved student {student_path}")
+        return student
+
+    def save_report(self, student: tf.keras.Model):
+        """
+        Saves distillation_{student_model_no}.json in root_dir: the distillation settings, the best validation
+        accuracy of the student and the profile (parameters, FLOPs, CPU latency) of teacher and student.
+
+        Args:
+            student (tf.keras.Model): The trained student.
+        """
+        teacher_profile = profile_model(self.teacher)
+        student_profile = profile_model(student)
+        report = dict(
+            teacher_model_no=self.config.teacher_model_no,
+            student_model_no=self.config.student_model_no,
+            student_backbone=self.config.params_student_backbone,
+            student_head=self.config.params_student_head,
+            temperature=self.config.params_temperature,
+            alpha=self.config.params_alpha,
+            epochs=len(self.history["loss"]),
+            best_val_accuracy=float(np.max(self.history["val_accuracy"])),
+            teacher=teacher_profile,
+            student=student_profile,
+            flops_ratio=student_profile["flops"] / teacher_profile["flops"] if teacher_profile["flops"] else None,
+            latency_ratio=student_profile["latency_ms"]["mean"] / teacher_profile["latency_ms"]["mean"],
+        )
+        report_path = os.path.join(self.config.root_dir, f"distillation_{self.config.student_model_no}.json")
+        create_dirs([report_path])
+        save_json(values=report, path=report_path)
+        logging.info(f"Student {self.config.student_model_no}: best val_accuracy {report['best_val_accuracy']:.4f}, "
+                     f"{report['latency_ratio']:.1%} of the teacher's CPU latency")
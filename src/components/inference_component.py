@@ -0,0 +1,166 @@
+import os
+import csv
+import glob
+import json
+import time
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import create_dirs, load_json, trained_model_file
+from src.utils.data_pipeline import AUTOTUNE, decode_and_resize
+from src.utils.dataset_files import IMAGE_EXTENSIONS
+
+
+class InferenceComponent:
+    """
+    InferenceComponent is a class designed for classifying new images with a trained model.
+    Images are decoded in parallel into a bounded queue of batches, the model is loaded once and reused for every
+    batch, and the top-k predictions are written to a CSV or JSONL file as each batch completes.
+
+    Attributes:
+        config (InferenceEntity): An instance of InferenceEntity containing configuration parameters.
+        model (tf.keras.Model): The trained model, loaded once.
+        class_names (list): Class names indexed by the model outputs.
+
+    Methods:
+        __init__(self, InferenceEntity): Constructor method to initialize InferenceComponent with an InferenceEntity.
+        resolve_inputs(inputs) -> list: Expands directories, glob patterns and list files into image paths.
+        _dataset(self, paths) -> tf.data.Dataset: Builds the bounded, parallel decode pipeline.
+        top_k(self, probabilities, k) -> list: Converts a batch of probabilities into top-k (class, score) lists.
+        predict(self, inputs, output_path, output_format, top_k) -> int: Classifies the inputs and writes the predictions.
+
+    Example Usage:
+        # Instantiate InferenceEntity with necessary configuration parameters
+        inference_entity = ConfigurationManager().get_inference_entity()
+
+        # Instantiate InferenceComponent with the InferenceEntity
+        inference = InferenceComponent(inference_entity)
+
+        # Classify every image below a directory
+        inference.predict(['path/to/images'], 'path/to/predictions.jsonl', output_format='jsonl')
+    """
+    def __init__(self, InferenceEntity):
+        """
+        Initializes InferenceComponent with a given InferenceEntity and loads the trained model.
+
+        Args:
+            InferenceEntity (InferenceEntity): An instance of InferenceEntity containing configuration parameters.
+        """
+        self.config = InferenceEntity
+        model_path = trained_model_file(self.config.trained_model_path, self.config.model_no)
+        self.model = tf.keras.models.load_model(model_path)
+        summary_path = os.path.splitext(self.config.manifest_path)[0] + ".json"
+        self.class_names = load_json(summary_path)["class_names"]
+        logging.info(f"Loaded {model_path} for inference over {len(self.class_names)} classes")
+
+    @staticmethod
+    def resolve_inputs(inputs: list) -> list:
+        """
+        Expands the command line inputs into a list of image paths.
+
+        Args:
+            inputs (list): Directories (searched recursively), glob patterns, image files, or .txt files
+                listing one image path per line.
+
+        Returns:
+            list: Image paths in the order given.
+        """
+        paths = []
+        for item in inputs:
+            if os.path.isdir(item):
+                for root, _, files in sorted(os.walk(item), key=lambda walk: walk[0]):
+                    paths.extend(os.path.join(root, fname) for fname in sorted(files)
+                                 if fname.lower().endswith(IMAGE_EXTENSIONS))
+            elif item.endswith(".txt") and os.path.isfile(item):
+                with open(item) as list_file:
+                    paths.extend(line.strip() for line in list_file if line.strip())
+            elif glob.has_magic(item):
+                paths.extend(path for path in sorted(glob.glob(item, recursive=True))
+                             if path.lower().endswith(IMAGE_EXTENSIONS))
+            else:
+                paths.append(item)
+        return paths
+
+    def _dataset(self, paths: list) -> tf.data.Dataset:
+        """
+        Builds the decode pipeline: images are decoded and resized in parallel, batched, and at most
+        params_queue_size batches are buffered ahead of the model. Unreadable files are skipped and logged
+        by predict, since every image travels together with its path.
+
+        Args:
+            paths (list): Image paths.
+
+        Returns:
+            tf.data.Dataset: Dataset yielding (paths, images) batches.
+        """
+        def _load(path):
+            return path, decode_and_resize(path, self.config.params_image_size, self.config.params_resize_mode) / 255.0
+
+        dataset = tf.data.Dataset.from_tensor_slices(paths)
+        dataset = dataset.map(_load, num_parallel_calls=AUTOTUNE, deterministic=True)
+        dataset = dataset.ignore_errors()
+        return dataset.batch(self.config.params_batch_size).prefetch(self.config.params_queue_size)
+
+    def top_k(self, probabilities: np.ndarray, k: int) -> list:
+        """
+        Converts a batch of class probabilities into the k most likely classes per image.
+
+        Args:
+            probabilities (np.ndarray): Array of shape (batch, classes).
+            k (int): Number of classes per image.
+
+        Returns:
+            list: One list of (class_name, score) tuples per image, most likely first.
+        """
+        k = min(k, probabilities.shape[1])
+        top = np.argsort(-probabilities, axis=1)[:, :k]
+        return [[(self.class_names[index], float(row[index])) for index in indices]
+                for row, indices in zip(probabilities, top)]
+
+    def predict(self, inputs: list, output_path: str = None, output_format: str = "csv", top_k: int = None) -> int:
+        """
+        Classifies the inputs and writes the predictions batch by batch.
+
+        Args:
+            inputs (list): Directories, glob patterns, image files or .txt list files.
+            output_path (str): Destination file, defaults to output_path from config.yaml.
+            output_format (str): Either "csv" or "jsonl".
+            top_k (int): Classes reported per image, defaults to TOP_K from params.yaml.
+
+        Returns:
+            int: Number of images classified.
+        """
+        if output_format not in ("csv", "jsonl"):
+            raise ValueError(f"output_format must be 'csv' or 'jsonl', got {output_format!r}")
+        output_path = output_path or self.config.output_path
+        top_k = top_k or self.config.params_top_k
+        paths = self.resolve_inputs(inputs)
+        create_dirs([output_path])
+
+        done, start = 0, time.perf_counter()
+        with open(output_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file) if output_format == "csv" else None
+            if writer:
+                header = ["path"]
+                for rank in range(1, top_k + 1):
+                    header += [f"top{rank}_class", f"top{rank}_score"]
+                writer.writerow(header)
+            for batch_paths, images in self._dataset(paths):
+                predictions = self.top_k(self.model.predict_on_batch(images), top_k)
+                for path, prediction in zip(batch_paths.numpy(), predictions):
+                    path = path.decode()
+                    if writer:
+                        writer.writerow([path] + [value for pair in prediction for value in pair])
+                    else:
+                        output_file.write(json.dumps(dict(
+                            path=path,
+                            predictions=[dict(label=label, score=score) for label, score in prediction]
+                        )) + "\n")
+                output_file.flush()
+                done += len(predictions)
+        elapsed = time.perf_counter() - start
+        if done < len(paths):
+            logging.warning(f"Skipped {len(paths) - done} unreadable images")
+        logging.info(f"Classified {done} images in {elapsed:.1f}s "
+                     f"({done / max(elapsed, 1e-9):.1f} images/sec), predictions written to {output_path}")
+        return done
@@ -1,21 +1,39 @@
-import kaggle # used for data downloading
+import os
+import json
+import shutil
+import hashlib
+import zipfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import logging
+from src.utils.common import create_dirs, save_json, load_json
 class IngestDataComponent:
     """
     IngestDataComponent is a class designed for downloading and ingesting data from a specified source, such as Kaggle.
-    It utilizes the Kaggle API to download files associated with a given dataset and extracts them into a specified data folder.
+    It fetches the dataset archive from a local path, a mirror URL or the Kaggle API, extracts it with parallel file
+    writes, and keeps a manifest of the extracted files (size, CRC and SHA-256). Re-running the stage skips the download
+    and extraction when the files on disk still match the manifest, and an interrupted extraction resumes where it stopped.
 
     Attributes:
         config (ConfigDataIngest): An instance of ConfigDataIngest containing configuration parameters.
 
     Methods:
         __init__(self, config_data_ingest): Constructor method to initialize IngestDataComponent with a ConfigDataIngest.
-        download_data_from_source(self): Downloads and extracts data files from the specified source using the Kaggle API.
+        is_intact(self) -> bool: Checks the extracted files against the ingest manifest.
+        _fetch_archive(self) -> str: Returns a local copy of the dataset archive, downloading it if needed.
+        _extract(self, archive_path) -> dict: Extracts the archive with parallel writes and returns the manifest entries.
+        download_data_from_source(self): Ingests the dataset unless the local copy is intact.
 
     Example Usage:
         # Instantiate ConfigDataIngest with necessary configuration parameters
         ingest_config = ConfigDataIngest(
             dataset_name='username/dataset-name',
-            data_folder='path/to/data/folder'
+            data_folder='path/to/data/folder',
+            source_archive='',
+            manifest_path='path/to/data/folder/ingest_manifest.json',
+            extract_workers=8,
+            verify_hashes=False
         )
 
         # Instantiate IngestDataComponent with ConfigDataIngest
@@ -32,11 +50,139 @@ class IngestDataComponent:
             config_data_ingest (ConfigDataIngest): An instance of ConfigDataIngest containing configuration parameters.
         """
         self.config = config_data_ingest
-    
+        self.partial_manifest_path = f"{self.config.manifest_path}.partial"
+
+    def is_intact(self) -> bool:
+        """
+        Checks that every file of the ingest manifest exists with its recorded size, and also with its recorded
+        SHA-256 when verify_hashes is set.
+
+        Returns:
+            bool: True if the local copy matches the manifest.
+        """
+        if not os.path.exists(self.config.manifest_path):
+            return False
+        files = load_json(self.config.manifest_path)["files"]
+        for relative_path, entry in files.items():
+            path = os.path.join(self.config.data_folder, relative_path)
+            if not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+                logging.info(f"{path} is missing or has changed")
+                return False
+            if self.config.verify_hashes and _sha256(path) != entry["sha256"]:
+                logging.info(f"{path} does not match its recorded hash")
+                return False
+        return True
+
+    def _fetch_archive(self) -> str:
+        """
+        Returns a local copy of the dataset archive. source_archive may be a local file (used in place) or an
+        http(s) mirror URL; when it is empty the archive is downloaded through the Kaggle API. A previously
+        downloaded archive is reused.
+
+        Returns:
+            str: Path to the archive.
+        """
+        source = self.config.source_archive
+        if source and not source.startswith(("http://", "https://")):
+            return source
+        if source:
+            archive_path = os.path.join(self.config.data_folder, os.path.basename(source.split("?")[0]))
+        else:
+            archive_path = os.path.join(self.config.data_folder, f"{self.config.dataset_name.split('/')[-1]}.zip")
+        if zipfile.is_zipfile(archive_path):
+            logging.info(f"Reusing downloaded archive {archive_path}")
+            return archive_path
+
+        create_dirs([archive_path])
+        if source:
+            logging.info(f"Downloading {source}")
+            with urllib.request.urlopen(source) as response, open(f"{archive_path}.part", "wb") as archive_file:
+                shutil.copyfileobj(response, archive_file, length=1 << 20)
+            os.replace(f"{archive_path}.part", archive_path)
+        else:
+            import kaggle # authenticates on import, so only loaded when a download is needed
+            kaggle.api.dataset_download_files(self.config.dataset_name, self.config.data_folder, unzip=False)
+        return archive_path
+
+    def _extract(self, archive_path: str) -> dict:
+        """
+        Extracts the archive into data_folder. Members are streamed to disk by extract_workers threads, each
+        with its own handle on the archive, and hashed while they are written. Members already extracted by an
+        interrupted run (listed in the partial manifest with the same CRC and size) are skipped.
+
+        Args:
+            archive_path (str): Path to the zip archive.
+
+        Returns:
+            dict: Manifest entries keyed by path relative to data_folder.
+        """
+        done = {}
+        if os.path.exists(self.partial_manifest_path):
+            with open(self.partial_manifest_path) as partial_file:
+                for line in partial_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        done[entry.pop("path")] = entry
+
+        data_root = os.path.realpath(self.config.data_folder)
+        with zipfile.ZipFile(archive_path) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir()]
+        for info in members:
+            target = os.path.realpath(os.path.join(data_root, info.filename))
+            if not target.startswith(data_root + os.sep):
+                raise ValueError(f"Refusing to extract {info.filename} outside {data_root}")
+
+        local = threading.local()
+        lock = threading.Lock()
+        partial_file = open(self.partial_manifest_path, "a")
+
+        def _extract_member(info):
+            target = os.path.join(self.config.data_folder, info.filename)
+            previous = done.get(info.filename)
+            if previous and previous["crc"] == info.CRC and os.path.isfile(target) \
+                    and os.path.getsize(target) == previous["size"]:
+                return info.filename, previous
+            if not hasattr(local, "archive"):
+                local.archive = zipfile.ZipFile(archive_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            digest = hashlib.sha256()
+            with local.archive.open(info) as source, open(target, "wb") as destination:
+                for chunk in iter(lambda: source.read(1 << 20), b""):
+                    digest.update(chunk)
+                    destination.write(chunk)
+            entry = dict(size=info.file_size, crc=info.CRC, sha256=digest.hexdigest())
+            with lock:
+                partial_file.write(json.dumps(dict(path=info.filename, **entry)) + "\n")
+            return info.filename, entry
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.extract_workers) as executor:
+                files = dict(executor.map(_extract_member, members))
+        finally:
+            partial_file.close()
+        logging.info(f"Extracted {len(files)} files from {archive_path} into {self.config.data_folder}")
+        return files
+
     def download_data_from_source(self):
         """
-        Downloads and extracts data files from the specified source using the Kaggle API.
+        Ingests the dataset: skips everything when the local copy matches the ingest manifest, otherwise
+        fetches the archive, extracts it and writes a new manifest.
         """
-        kaggle.api.dataset_download_files(self.config.dataset_name,self.config.data_folder,
-                                     unzip=True)
-    
+        if self.is_intact():
+            logging.info(f"{self.config.data_folder} matches {self.config.manifest_path}, skipping ingestion")
+            return
+        archive_path = self._fetch_archive()
+        files = self._extract(archive_path)
+        save_json(values=dict(source=self.config.source_archive or self.config.dataset_name,
+                              archive=os.path.basename(archive_path),
+                              files=files),
+                  path=self.config.manifest_path)
+        os.remove(self.partial_manifest_path)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
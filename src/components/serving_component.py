@@ -0,0 +1,224 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from src.logger import logging
+from src.utils.preprocessing import decode_bytes
+
+
+class MicroBatcher:
+    """
+    MicroBatcher is a class designed for coalescing concurrent single-image requests into batches.
+    A single worker thread waits for the first queued image, then keeps collecting until max_batch_size images are
+    queued or max_wait_ms has passed since the first one, and runs the model once for the whole batch.
+
+    Attributes:
+        predict_fn (callable): Function mapping an image batch of shape (n, height, width, 3) to probabilities.
+        max_batch_size (int): Largest batch passed to predict_fn.
+        max_wait_ms (float): Longest time the first image of a batch waits for more images.
+        batch_sizes (deque): Sizes of the most recent batches.
+
+    Methods:
+        __init__(self, predict_fn, max_batch_size, max_wait_ms): Starts the worker thread.
+        submit(self, image) -> Future: Queues one preprocessed image and returns a future for its probabilities.
+        _collect(self) -> list: Blocks until a batch is ready and returns its queued items.
+        _run(self): Worker loop.
+
+    Example Usage:
+        batcher = MicroBatcher(model.predict_on_batch, max_batch_size=32, max_wait_ms=10)
+        probabilities = batcher.submit(image).result()
+    """
+    def __init__(self, predict_fn, max_batch_size: int, max_wait_ms: float):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batch_sizes = deque(maxlen=10000)
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="micro-batcher", daemon=True).start()
+
+    def submit(self, image: np.ndarray) -> Future:
+        """
+        Queues one preprocessed image.
+
+        Args:
+            image (np.ndarray): Image of shape (height, width, 3).
+
+        Returns:
+            Future: Resolves to the probabilities of the image.
+        """
+        future = Future()
+        self._queue.put((image, future))
+        return future
+
+    def _collect(self) -> list:
+        items = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            try:
+                probabilities = self.predict_fn(np.stack([image for image, _ in items]))
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.batch_sizes.append(len(items))
+            for (_, future), row in zip(items, probabilities):
+                future.set_result(row)
+
+
+class ServingComponent:
+    """
+    ServingComponent is a class designed for serving a trained model behind a local HTTP endpoint.
+    The model is loaded once through InferenceComponent and warmed up at startup, concurrent requests are coalesced
+    by a MicroBatcher, and per-request latency percentiles are reported.
+
+    Endpoints:
+        POST /predict: Request body is the raw image file; responds with the top-k classes as JSON, or with a JSON
+            error (400 for an image that cannot be decoded, 500 when the model fails).
+        GET /stats: Latency percentiles (ms), request count and mean batch size.
+        GET /health: Liveness check.
+
+    Attributes:
+        config (ServingEntity): An instance of ServingEntity containing configuration parameters.
+        inference (InferenceComponent): Holds the loaded model, the class names and the top-k helper.
+        batcher (MicroBatcher): Coalesces concurrent requests into batches.
+        latencies (deque): Latencies in milliseconds of the most recent requests.
+
+    Methods:
+        __init__(self, ServingEntity, inference_component): Loads and warms up the model and starts the batcher.
+        preprocess(self, image_bytes) -> np.ndarray: Decodes and resizes one request image.
+        warm_up(self): Runs the model once at batch size 1 and max_batch_size.
+        stats(self) -> dict: Summarizes the recorded latencies and batch sizes.
+        serve(self): Starts the HTTP server and blocks.
+
+    Example Usage:
+        cm = ConfigurationManager()
+        server = ServingComponent(cm.get_serving_entity(), InferenceComponent(cm.get_inference_entity()))
+        server.serve()
+    """
+    def __init__(self, ServingEntity, inference_component):
+        self.config = ServingEntity
+        self.inference = inference_component
+        self.latencies = deque(maxlen=10000)
+        self.warm_up()
+        self.batcher = MicroBatcher(self.inference.model.predict_on_batch,
+                                    max_batch_size=self.config.params_max_batch_size,
+                                    max_wait_ms=self.config.params_max_wait_ms)
+
+    def preprocess(self, image_bytes: bytes) -> np.ndarray:
+        """
+        Decodes and resizes one request image the same way the training pipeline does.
+
+        Args:
+            image_bytes (bytes): Encoded image file.
+
+        Returns:
+            np.ndarray: float32 image of shape (height, width, 3) with values in [0, 1].
+        """
+        image = decode_bytes(image_bytes, self.inference.config.params_image_size,
+                             self.inference.config.params_resize_mode)
+        return (image / 255.0).numpy()
+
+    def warm_up(self):
+        """
+        Runs the model once at batch size 1 and once at max_batch_size so the first requests do not pay for tracing.
+        """
+        height, width = self.inference.config.params_image_size[:2]
+        for batch_size in sorted({1, self.config.params_max_batch_size}):
+            self.inference.model.predict_on_batch(np.zeros((batch_size, height, width, 3), dtype=np.float32))
+        logging.info("Model warm-up finished")
+
+    def stats(self) -> dict:
+        """
+        Summarizes the recorded requests.
+
+        Returns:
+            dict: Request count, latency percentiles in milliseconds and mean batch size.
+        """
+        latencies = np.array(self.latencies)
+        batch_sizes = np.array(self.batcher.batch_sizes)
+        if not len(latencies):
+            return dict(requests=0)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        return dict(requests=len(latencies),
+                    latency_ms=dict(p50=float(p50), p90=float(p90), p99=float(p99),
+                                    max=float(latencies.max()), mean=float(latencies.mean())),
+                    mean_batch_size=float(batch_sizes.mean()) if len(batch_sizes) else 0.0)
+
+    def _handler(self):
+        component = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send_json(200, dict(status="ok"))
+                elif self.path == "/stats":
+                    self._send_json(200, component.stats())
+                else:
+                    self._send_json(404, dict(error=f"unknown path {self.path}"))
+
+            def do_POST(self):
+                if self.path != "/predict":
+                    self._send_json(404, dict(error=f"unknown path {self.path}"))
+                    return
+                start = time.perf_counter()
+                try:
+                    image = component.preprocess(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                except Exception as e:
+                    self._send_json(400, dict(error=f"could not decode image: {e}"))
+                    return
+                try:
+                    probabilities = component.batcher.submit(image).result()
+                except Exception as e:
+                    logging.exception(e)
+                    self._send_json(500, dict(error=f"prediction failed: {e}"))
+                    return
+                prediction = component.inference.top_k(probabilities[np.newaxis],
+                                                       component.inference.config.params_top_k)[0]
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                component.latencies.append(latency_ms)
+                self._send_json(200, dict(predictions=[dict(label=label, score=score) for label, score in prediction],
+                                          latency_ms=latency_ms))
+
+            def log_message(self, format, *args):
+                pass  # per-request access logs would dominate the log file
+
+        return Handler
+
+    def serve(self):
+        """
+        Starts the HTTP server on the configured host and port and blocks until interrupted.
+        """
+        server = ThreadingHTTPServer((self.config.host, self.config.port), self._handler())
+        logging.info(f"Serving on http://{self.config.host}:{self.config.port} "
+                     f"(max_batch_size={self.config.params_max_batch_size}, max_wait_ms={self.config.params_max_wait_ms})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            logging.info(f"Server stopped: {self.stats()}")
@@ -1,17 +1,103 @@
 import tensorflow as tf
-from src.utils.common import create_dirs
+from src.utils.common import create_dirs, save_json, load_json
+from src.utils.model_profile import profile_model
+from src.logger import logging
 import os
+
+# constructor, and the (scale, offset) mapping the [0, 1] images of the input pipelines to the range the
+# pre-trained weights expect; ResNet152V2Legacy is ResNet152V2 fed [0, 1] inputs unchanged, as models trained
+# before the mapping was added were, so they can be rebuilt and compared
+BACKBONES = {
+    "ResNet152V2": (tf.keras.applications.resnet_v2.ResNet152V2, (2.0, -1.0)),
+    "ResNet152V2Legacy": (tf.keras.applications.resnet_v2.ResNet152V2, None),
+    "ResNet50V2": (tf.keras.applications.resnet_v2.ResNet50V2, (2.0, -1.0)),
+    "MobileNetV2": (tf.keras.applications.mobilenet_v2.MobileNetV2, (2.0, -1.0)),
+    "EfficientNetB0": (tf.keras.applications.efficientnet.EfficientNetB0, (255.0, 0.0)),
+}
+HEADS = ("flatten", "gap")
+BACKBONE = "ResNet152V2"
+BACKBONE_WEIGHTS = "imagenet"
+
+
+def input_mapping(name: str) -> dict:
+    """
+    Returns the (scale, offset) a backbone of BACKBONES applies to the [0, 1] images, as a dict.
+    """
+    if name not in BACKBONES:
+        raise ValueError(f"BACKBONE must be one of {sorted(BACKBONES)}, got {name!r}")
+    scale, offset = BACKBONES[name][1] or (1.0, 0.0)
+    return dict(scale=scale, offset=offset)
+
+
+def build_backbone(name: str, input_shape: tuple, weights=BACKBONE_WEIGHTS) -> tf.keras.Model:
+    """
+    Builds a backbone of BACKBONES without its classification top. When the backbone expects another input
+    range than [0, 1], a Rescaling layer in front of it converts the images.
+
+    Args:
+        name (str): Key of BACKBONES.
+        input_shape (tuple): (height, width, 3).
+        weights (str): Pre-trained weights, or None for random initialisation.
+
+    Returns:
+        tf.keras.Model: Backbone taking [0, 1] images.
+    """
+    if name not in BACKBONES:
+        raise ValueError(f"BACKBONE must be one of {sorted(BACKBONES)}, got {name!r}")
+    constructor, rescale = BACKBONES[name]
+    if rescale is None:
+        return constructor(include_top=False, weights=weights, input_shape=input_shape)
+    inputs = tf.keras.Input(shape=input_shape)
+    scaled = tf.keras.layers.Rescaling(*rescale, name="backbone_rescaling")(inputs)
+    return constructor(include_top=False, weights=weights, input_tensor=scaled)
+
+
+def add_head(backbone: tf.keras.Model, head: str, classes: int) -> tf.keras.Model:
+    """
+    Puts the classification head on a backbone: "flatten" (Flatten and Dense) or "gap" (GlobalAveragePooling2D
+    and Dense). At 224x224 the Flatten head of ResNet152V2 feeds a 7x7x2048 = 100k wide Dense layer, while the
+    global-average-pooling head feeds it 2048 features.
+
+    Args:
+        backbone (tf.keras.Model): Backbone from build_backbone.
+        head (str): One of HEADS.
+        classes (int): Number of output classes.
+
+    Returns:
+        tf.keras.Model: Uncompiled classifier.
+    """
+    if head not in HEADS:
+        raise ValueError(f"HEAD must be one of {HEADS}, got {head!r}")
+    if head == "gap":
+        features = tf.keras.layers.GlobalAveragePooling2D()(backbone.output)
+    else:
+        features = tf.keras.layers.Flatten()(backbone.output)
+    prediction = tf.keras.layers.Dense(
+        units=classes,
+        activation="softmax"
+    )(features)
+    return tf.keras.models.Model(
+        inputs=backbone.input,
+        outputs=prediction
+    )
+
 class BaseModelGeneratorComponent:
     """
     BaseModelGeneratorComponent is a class designed for generating base and actual deep learning models using TensorFlow and Keras.
     It includes functionalities for loading a pre-trained base model, modifying it to create an actual model with customizable
-    configurations, and saving the models.
+    configurations, and saving the models. The backbone (BACKBONES) and the classification head (HEADS) are selected in
+    params.yaml, and the cost of the actual model (parameters, FLOPs, CPU latency) is saved next to it. The backbone is constructed at most once per run and its weights are kept in a
+    backbone cache keyed by architecture, input shape and weights, so later runs do not rebuild it from the pre-trained file.
 
     Attributes:
         config (BaseModelGeneratorEntity): An instance of BaseModelGeneratorEntity containing configuration parameters.
+        input_shape (tuple): Input shape of the backbone, derived from IMAGE_SIZE.
+        profile_path (str): JSON file next to the actual model holding its profile.
+        backbone_key (str): Cache key of the backbone, built from architecture, input shape and weights.
 
     Methods:
         __init__(self, BaseModelGeneratorEntity): Constructor method to initialize the BaseModelGeneratorComponent with a BaseModelGeneratorEntity.
+        _backbone(self) -> tf.keras.Model: Returns the backbone, building it once per run from the backbone cache.
         load_base_model(self) -> tf.keras.Model: Loads a pre-trained base model, compiles it, and saves it for future use.
         actual_model(self, classes, freeze_all, freeze_till, learning_rate) -> tf.keras.Model: Generates an actual model based on the
             loaded base model with customizable configurations, compiles it, and saves it.
@@ -21,8 +107,11 @@ class BaseModelGeneratorComponent:
         generator_entity = BaseModelGeneratorEntity(
             base_model_path='path/to/base/model.h5',
             actual_model_path='path/to/actual/model.h5',
+            backbone_cache_dir='path/to/backbone_cache',
             IMAGE_SIZE=(224, 224),
-            CLASSES=10
+            CLASSES=10,
+            BACKBONE='MobileNetV2',
+            HEAD='gap'
         )
 
         # Instantiate BaseModelGeneratorComponent with BaseModelGeneratorEntity
@@ -42,35 +131,67 @@ class BaseModelGeneratorComponent:
             BaseModelGeneratorEntity (BaseModelGeneratorEntity): An instance of BaseModelGeneratorEntity containing configuration parameters.
         """
         self.config = BaseModelGeneratorEntity
+        self.input_shape = (self.config.IMAGE_SIZE[0], self.config.IMAGE_SIZE[1], 3)
+        mapping = input_mapping(self.config.BACKBONE)
+        # the input mapping changes the layers of the backbone, so it is part of the key of the cached weights
+        self.backbone_key = (f"{self.config.BACKBONE}_{'x'.join(str(dim) for dim in self.input_shape)}_{BACKBONE_WEIGHTS}"
+                             f"_in{mapping['scale']:g}_{mapping['offset']:g}")
+        self.profile_path = os.path.splitext(self.config.actual_model_path)[0] + "_profile.json"
+        self._backbone_model = None
+
+    def _backbone(self) -> tf.keras.Model:
+        """
+        Returns the backbone network, constructing it at most once per run. The first run builds it with the
+        pre-trained weights and stores them in the backbone cache; later runs build the network without weights
+        and load the cached ones.
+
+        Returns:
+            tf.keras.Model: Backbone without its classification top.
+        """
+        if self._backbone_model is not None:
+            return self._backbone_model
+        weights_path = os.path.join(self.config.backbone_cache_dir, f"{self.backbone_key}.weights.h5")
+        if os.path.exists(weights_path):
+            logging.info(f"Loading {self.config.BACKBONE} weights from backbone cache {weights_path}")
+            model = build_backbone(self.config.BACKBONE, self.input_shape, weights=None)
+            model.load_weights(weights_path)
+        else:
+            model = build_backbone(self.config.BACKBONE, self.input_shape)
+            create_dirs([weights_path])
+            model.save_weights(weights_path)
+            logging.info(f"Stored {self.config.BACKBONE} weights in backbone cache {weights_path}")
+        self._backbone_model = model
+        return model
     
     def load_base_model(self)-> tf.keras.Model:
         """
         Loads a pre-trained base model, compiles it, and saves it for future use.
+        The base model file is only rewritten when the backbone key differs from the one it was saved with.
 
         Returns:
             tf.keras.Model: Loaded and compiled base model.
         """
         #create dirs
-        create_dirs([os.path.dirname(self.config.base_model_path)])
+        create_dirs([self.config.base_model_path])
         #building base model
-        model = tf.keras.applications.resnet_v2.ResNet152V2(
-            include_top=False, 
-            weights='imagenet',
-            input_shape=(self.config.IMAGE_SIZE[0], self.config.IMAGE_SIZE[1], 3),
-            classes= self.config.CLASSES
-        )
+        model = self._backbone()
         model.compile(
             optimizer='rmsprop', 
             loss='categorical_crossentropy', 
             metrics=['accuracy'])
-        model.save(self.config.base_model_path)
-        # model.save(self.config.base_model_path)
+        key_path = os.path.splitext(self.config.base_model_path)[0] + ".json"
+        if os.path.exists(self.config.base_model_path) and os.path.exists(key_path) \
+                and load_json(key_path).get("backbone_key") == self.backbone_key:
+            logging.info(f"Base model {self.config.base_model_path} is up to date")
+        else:
+            model.save(self.config.base_model_path)
+            save_json(values=dict(backbone_key=self.backbone_key), path=key_path)
         return model
     # @staticmethod
     def actual_model(self, classes, freeze_all, freeze_till, learning_rate)-> tf.keras.Model:
         """
-        Generates an actual model based on the loaded base model with customizable configurations,
-        compiles it, and saves it.
+        Generates an actual model based on the loaded base model with customizable configurations and the HEAD
+        of params.yaml, compiles it, and saves it together with its profile (see profile_model).
 
         Args:
             classes (int): Number of output classes for the actual model.
@@ -81,28 +202,15 @@ class BaseModelGeneratorComponent:
         Returns:
             tf.keras.Model: Generated and compiled actual model.
         """
-        create_dirs([os.path.dirname(self.config.actual_model_path)])
-        model = tf.keras.applications.resnet_v2.ResNet152V2(
-            include_top=False, 
-            weights='imagenet',
-            input_shape=(self.config.IMAGE_SIZE[0], self.config.IMAGE_SIZE[1], 3),
-            classes= self.config.CLASSES
-        )
+        create_dirs([self.config.actual_model_path])
+        model = self._backbone()
         if freeze_all:
             for _ in model.layers:
                 model.trainable = False
         if freeze_till !=0:
-            for _ in model.layers[:-freeze_till]:
-                model.trainable = False
-        flatten = tf.keras.layers.Flatten()(model.output)
-        prediction = tf.keras.layers.Dense(
-            units=classes,
-            activation="softmax"
-        )(flatten)
-        model = tf.keras.models.Model(
-            inputs=model.input,
-            outputs=prediction
-        )
+            for layer in model.layers[:-freeze_till]:
+                layer.trainable = False
+        model = add_head(model, self.config.HEAD, classes)
         model.compile(
             optimizer=tf.keras.optimizers.SGD(learning_rate=learning_rate),
             loss=tf.keras.losses.CategoricalCrossentropy(),
@@ -110,5 +218,9 @@ class BaseModelGeneratorComponent:
         )
         model.save(self.config.actual_model_path)
         model.summary()
+        profile = dict(backbone=self.config.BACKBONE, head=self.config.HEAD,
+                       input_mapping=input_mapping(self.config.BACKBONE), **profile_model(model))
+        save_json(values=profile, path=self.profile_path)
+        logging.info(f"Actual model profile: {profile}")
         return model
         
@@ -1,12 +1,203 @@
 import tensorflow as tf
 from src.utils.common import create_dirs
 import os
+import json
 import time
+import resource
+import numpy as np
+from src.logger import logging
+
+# share of the training step time spent waiting for input above which a run is reported as input-bound
+INPUT_BOUND_FRACTION = 0.2
+
+
+class ThroughputProfilerCallback(tf.keras.callbacks.Callback):
+    """
+    Keras callback that instruments training throughput. Every step is timed, and for a training dataset passed through
+    instrument() the time the step waited for its batch is measured as well. Per epoch it logs and adds to the epoch logs
+    (and so to the history CSV) the mean step time (step_time_ms), the mean input wait (input_wait_ms), the training
+    images per second (images_per_sec) and the peak resident memory of the process (peak_rss_mb). Optionally a TF
+    profiler trace is captured for the global steps [profile_steps[0], profile_steps[1]). summary() returns the epoch
+    figures and whether the run was input-bound or compute-bound.
+    """
+    def __init__(self, profile_steps=None, profile_dir=None, batch_size=None):
+        super().__init__()
+        self.profile_steps = tuple(profile_steps) if profile_steps else None
+        self.profile_dir = profile_dir
+        self.batch_size = batch_size
+        self.epochs = []
+        self._global_step = 0
+        self._delivered = None
+        self._profiling = False
+
+    def instrument(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+        """
+        Appends a probe to a (images, targets) dataset that records when each batch is handed to the model and its size.
+        The probe is a synchronous map after the final prefetch, so it runs inside the training step's get_next: the time
+        from the start of the step to the probe is the time the step waited for input.
+
+        Args:
+            dataset (tf.data.Dataset): Training dataset.
+
+        Returns:
+            tf.data.Dataset: The same batches, probed.
+        """
+        def _record(batch_size):
+            self._delivered = (time.perf_counter(), int(batch_size))
+            return np.int64(0)
+
+        def _probe(images, targets):
+            stamp = tf.numpy_function(_record, [tf.shape(images)[0]], tf.int64)
+            with tf.control_dependencies([stamp]):
+                return tf.identity(images), targets
+
+        return dataset.map(_probe)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.step_times, self.input_waits, self.images = [], [], 0
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.profile_steps and self._global_step == self.profile_steps[0] and not self._profiling:
+            tf.profiler.experimental.start(self.profile_dir)
+            self._profiling = True
+        self._delivered = None
+        self.step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        step_end = time.perf_counter()
+        self.step_times.append((step_end - self.step_start) * 1000.0)
+        if self._delivered is not None:
+            delivered_at, batch_size = self._delivered
+            self.input_waits.append(max(delivered_at - self.step_start, 0.0) * 1000.0)
+            self.images += batch_size
+        elif self.batch_size:
+            self.images += self.batch_size
+        self._global_step += 1
+        if self._profiling and self._global_step >= self.profile_steps[1]:
+            self._stop_profiler()
+
+    def _stop_profiler(self):
+        tf.profiler.experimental.stop()
+        self._profiling = False
+        logging.info(f"Profiler trace of steps {self.profile_steps[0]}-{self.profile_steps[1]} written to {self.profile_dir}")
+
+    def on_epoch_end(self, epoch, logs=None):
+        # the first step of a run includes tracing/compilation and would skew the figures
+        skip = 1 if not self.epochs and len(self.step_times) > 1 else 0
+        step_times, input_waits = self.step_times[skip:], self.input_waits[skip:]
+        if not step_times:
+            return
+        figures = dict(epoch=epoch + 1,
+                       steps=len(self.step_times),
+                       step_time_ms=float(np.mean(step_times)),
+                       step_time_p50_ms=float(np.median(step_times)),
+                       step_time_p90_ms=float(np.percentile(step_times, 90)),
+                       input_wait_ms=float(np.mean(input_waits)) if input_waits else None,
+                       input_wait_fraction=float(np.sum(input_waits) / np.sum(step_times)) if input_waits else None,
+                       images_per_sec=self.images / (np.sum(self.step_times) / 1000.0),
+                       peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0)
+        self.epochs.append(figures)
+        input_wait = f"{figures['input_wait_ms']:.1f} ms" if input_waits else "not measured"
+        logging.info(f"Epoch {epoch + 1}: mean step time {figures['step_time_ms']:.1f} ms "
+                     f"(median {figures['step_time_p50_ms']:.1f} ms), input wait {input_wait}, "
+                     f"{figures['images_per_sec']:.1f} images/s, peak RSS {figures['peak_rss_mb']:.0f} MB")
+        if logs is not None:
+            logs.update({key: value for key, value in figures.items()
+                         if key in ("step_time_ms", "input_wait_ms", "images_per_sec", "peak_rss_mb") and value is not None})
+
+    def on_train_end(self, logs=None):
+        if self._profiling:
+            self._stop_profiler()
+
+    def summary(self) -> dict:
+        """
+        Summarizes the recorded epochs.
+
+        Returns:
+            dict: Per-epoch figures, their means over the run, and "bound": "input" when more than
+                INPUT_BOUND_FRACTION of the step time was spent waiting for input, "compute" otherwise.
+        """
+        summary = dict(epochs=self.epochs, profile_steps=self.profile_steps, profile_dir=self.profile_dir)
+        if not self.epochs:
+            return summary
+        for key in ("step_time_ms", "input_wait_ms", "input_wait_fraction", "images_per_sec"):
+            values = [epoch[key] for epoch in self.epochs if epoch[key] is not None]
+            summary[key] = float(np.mean(values)) if values else None
+        summary["peak_rss_mb"] = max(epoch["peak_rss_mb"] for epoch in self.epochs)
+        if summary["input_wait_fraction"] is not None:
+            summary["bound"] = "input" if summary["input_wait_fraction"] > INPUT_BOUND_FRACTION else "compute"
+        return summary
+
+class SuccessiveHalvingPruningCallback(tf.keras.callbacks.Callback):
+    """
+    Keras callback that stops unpromising trials of a multi-trial run, asynchronous successive halving (ASHA) style.
+    Rungs are at epochs min_epochs * reduction_factor**k. At a rung the trial appends its monitored value to the
+    rung file shared by all trials in rung_dir, and keeps training only if the value is within the best
+    1/reduction_factor of the values recorded at that rung so far. Nothing is pruned while fewer than
+    reduction_factor values are recorded at the rung, since the top 1/reduction_factor is not defined yet.
+    A pruned trial stops like an early-stopped one; pruned_epoch tells them apart.
+    """
+    def __init__(self, rung_dir, trial_id, monitor="val_accuracy", min_epochs=1, reduction_factor=3):
+        super().__init__()
+        self.rung_dir = rung_dir
+        self.trial_id = trial_id
+        self.monitor = monitor
+        self.min_epochs = min_epochs
+        self.reduction_factor = reduction_factor
+        self.pruned_epoch = None
+
+    def _is_rung(self, epochs_done):
+        rung = self.min_epochs
+        while rung < epochs_done:
+            rung *= self.reduction_factor
+        return rung == epochs_done
+
+    def on_epoch_end(self, epoch, logs=None):
+        value = (logs or {}).get(self.monitor)
+        if value is None or not self._is_rung(epoch + 1):
+            return
+        rung_path = os.path.join(self.rung_dir, f"rung_{epoch + 1}.jsonl")
+        os.makedirs(self.rung_dir, exist_ok=True)
+        # single short appends are atomic, so trials in other processes can share the file
+        with open(rung_path, "a") as rung_file:
+            rung_file.write(json.dumps(dict(trial=self.trial_id, value=float(value))) + "\n")
+        with open(rung_path) as rung_file:
+            values = [json.loads(line)["value"] for line in rung_file if line.strip()]
+        if len(values) < self.reduction_factor:
+            return
+        sign = -1.0 if "loss" in self.monitor else 1.0
+        ranked = sorted((sign * v for v in values), reverse=True)
+        cutoff = ranked[len(ranked) // self.reduction_factor - 1]
+        if sign * float(value) < cutoff:
+            self.pruned_epoch = epoch + 1
+            self.model.stop_training = True
+            logging.info(f"Trial {self.trial_id} pruned at epoch {epoch + 1}: {self.monitor}={float(value):.4f} "
+                         f"is outside the best 1/{self.reduction_factor} of {len(values)} trials at this rung")
+
+class ResumableCheckpointCallback(tf.keras.callbacks.Callback):
+    """
+    Keras callback that saves a training checkpoint (model weights, optimizer state and learning rate) through a
+    tf.train.CheckpointManager every every_epochs epochs. Checkpoints are numbered by the number of completed epochs,
+    which is the epoch a resumed run starts at. With async checkpoint options the variables are copied when the
+    checkpoint is taken and written to disk in a background thread, so saving does not stall the next epoch.
+    """
+    def __init__(self, manager, every_epochs=1, options=None):
+        super().__init__()
+        self.manager = manager
+        self.every_epochs = every_epochs
+        self.options = options
+
+    def on_epoch_end(self, epoch, logs=None):
+        if (epoch + 1) % self.every_epochs == 0:
+            path = self.manager.save(checkpoint_number=epoch + 1, options=self.options)
+            logging.info(f"Checkpoint of epoch {epoch + 1} saved to {path}")
+
 class CALLBACKSCOMPONENT:
     """
     CALLBACKSCOMPONENT is a class designed for managing and creating callbacks commonly used in deep learning model training.
     It includes functionalities to create TensorBoard callbacks for monitoring training and create ModelCheckpoint callbacks
-    for saving the best model during training.
+    for saving the best model during training. Plateau-based early stopping and learning rate reduction stop runs that no
+    longer improve, and a successive-halving pruning callback stops unpromising trials of a multi-trial run.
 
     Attributes:
         config (CALLBACKSENTITY): An instance of CALLBACKSENTITY containing configuration parameters.
@@ -15,6 +206,9 @@ class CALLBACKSCOMPONENT:
         __init__(self, CALLBACKSENTITY): Constructor method to initialize CALLBACKSCOMPONENT with a CALLBACKSENTITY.
         _create_tb_callbacks(self): Creates and returns a TensorBoard callback for monitoring training progress.
         _create_checkpoint_callback(self): Creates and returns a ModelCheckpoint callback for saving the best model.
+        _create_throughput_callback(self): Creates and returns a ThroughputProfilerCallback for instrumenting training throughput.
+        _create_plateau_callbacks(self): Creates the EarlyStopping and ReduceLROnPlateau callbacks.
+        _create_pruning_callback(self): Creates and returns a SuccessiveHalvingPruningCallback.
         callbacks_list(self): Retrieves a list of commonly used callbacks for deep learning model training.
 
     Example Usage:
@@ -22,7 +216,16 @@ class CALLBACKSCOMPONENT:
         callbacks_entity = CALLBACKSENTITY(
             root_dir='path/to/root',
             tensorboard_log_dir='path/to/tensorboard/logs',
-            checkpoint_file_path='path/to/checkpoint/file.h5'
+            checkpoint_file_path='path/to/checkpoint/file.h5',
+            pruning_dir='path/to/pruning/rungs',
+            params_early_stopping_patience=3,
+            params_reduce_lr_patience=2,
+            params_reduce_lr_factor=0.2,
+            params_pruning=False,
+            params_pruning_min_epochs=1,
+            params_pruning_reduction_factor=3,
+            params_profile_steps=[20, 30],
+            trial_id=1
         )
 
         # Instantiate CALLBACKSCOMPONENT with CALLBACKSENTITY
@@ -67,11 +270,63 @@ class CALLBACKSCOMPONENT:
         return tf.keras.callbacks.ModelCheckpoint(self.config.checkpoint_file_path, 
                                                   save_best_only=True)
     
+    @property
+    def _create_throughput_callback(self):
+        """
+        Creates and returns a ThroughputProfilerCallback, capturing a profiler trace into the TensorBoard
+        log directory when profile steps are configured.
+
+        Returns:
+            ThroughputProfilerCallback: Throughput callback.
+        """
+        return ThroughputProfilerCallback(profile_steps=self.config.params_profile_steps,
+                                          profile_dir=os.path.join(self.config.tensorboard_log_dir, "profile"))
+    
+    @property
+    def _create_plateau_callbacks(self):
+        """
+        Creates the EarlyStopping and ReduceLROnPlateau callbacks monitoring val_loss.
+        A patience of 0 disables the corresponding callback.
+
+        Returns:
+            list: Plateau callbacks.
+        """
+        callbacks = []
+        if self.config.params_reduce_lr_patience:
+            callbacks.append(tf.keras.callbacks.ReduceLROnPlateau(monitor="val_loss",
+                                                                  factor=self.config.params_reduce_lr_factor,
+                                                                  patience=self.config.params_reduce_lr_patience,
+                                                                  verbose=1))
+        if self.config.params_early_stopping_patience:
+            callbacks.append(tf.keras.callbacks.EarlyStopping(monitor="val_loss",
+                                                              patience=self.config.params_early_stopping_patience,
+                                                              restore_best_weights=True,
+                                                              verbose=1))
+        return callbacks
+
+    @property
+    def _create_pruning_callback(self):
+        """
+        Creates and returns a SuccessiveHalvingPruningCallback recording to pruning_dir.
+
+        Returns:
+            SuccessiveHalvingPruningCallback: Pruning callback.
+        """
+        return SuccessiveHalvingPruningCallback(rung_dir=self.config.pruning_dir,
+                                                trial_id=self.config.trial_id,
+                                                min_epochs=self.config.params_pruning_min_epochs,
+                                                reduction_factor=self.config.params_pruning_reduction_factor)
+
     def callbacks_list(self):
         """
         Retrieves a list of commonly used callbacks for deep learning model training.
+        The pruning callback is only included when pruning is enabled.
 
         Returns:
             list: List of callbacks.
         """
-        return [self._create_tb_callbacks, self._create_checkpoint_callback]
\ No newline at end of file
+        callbacks = [self._create_tb_callbacks, self._create_checkpoint_callback, self._create_throughput_callback]
+        callbacks += self._create_plateau_callbacks
+        if self.config.params_pruning:
+            callbacks.append(self._create_pruning_callback)
+        return callbacks
\ No newline at end of file
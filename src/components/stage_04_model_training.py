@@ -1,24 +1,88 @@
-from src.utils.common import create_dirs
+from src.utils.common import create_dirs, save_json, load_json
+from src.utils.data_pipeline import read_manifest, subset_indices, make_dataset, tfrecord_dataset, manifest_dataset
+from src.utils.image_cache import load_image_cache
+from src.utils.tfrecords import read_tfrecord_index
+from src.utils.feature_cache import backbone_is_frozen, split_frozen_backbone, load_feature_cache
+from src.utils.precision import resolve_precision_policy, apply_precision_policy
+from src.utils.distribute import get_strategy, is_chief, worker_dir, broadcast_from_chief
+from src.components.stage_03_callbacks import ResumableCheckpointCallback, ThroughputProfilerCallback
+from src.logger import logging
 import tensorflow as tf
 import os
+import math
+import json
+import resource
+import shutil
+import dataclasses
 import pandas as pd 
+
+
+def _async_checkpoint_options() -> tf.train.CheckpointOptions:
+    # the option was renamed when async checkpointing left experimental
+    for kwargs in (dict(enable_async=True), dict(experimental_enable_async_checkpoint=True)):
+        try:
+            return tf.train.CheckpointOptions(**kwargs)
+        except TypeError:
+            continue
+    return tf.train.CheckpointOptions()
+
+class FullModelCheckpoint(tf.keras.callbacks.ModelCheckpoint):
+    """
+    ModelCheckpoint that saves full_model while fit trains only a part of it that shares its layers,
+    such as the classification head trained on bottleneck features.
+    """
+    def __init__(self, full_model: tf.keras.Model, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.full_model = full_model
+
+    def set_model(self, model):
+        super().set_model(self.full_model)
+
 class TrainingComponent():
     """
     TrainingComponent is a class designed to streamline the process of training and evaluating a deep learning model
     using TensorFlow and Keras. It includes functionalities for loading a pre-trained model, performing a train-test split,
-    and training the model with specified callbacks.
+    and training the model with specified callbacks. The training samples are reshuffled every epoch in an order that only
+    depends on the seed and the epoch, and a checkpoint of the model and optimizer state is written asynchronously every
+    params_checkpoint_every_epochs epochs. An interrupted run resumes from its latest checkpoint at the start of the next epoch,
+    reading the same batches an uninterrupted run would have read. The checkpoints are removed once training completes.
+    With distribute_strategy "multi_worker_mirrored" the model is replicated on every worker of the TF_CONFIG cluster,
+    each worker reads its own shard of the training samples, BATCH_SIZE is the per-worker batch size (the global batch is
+    BATCH_SIZE times the number of replicas) and the learning rate is scaled linearly with the number of replicas when
+    distribute_scale_lr is set. Only the chief worker writes the model, the history and the shared checkpoints.
+    Images are fitted to params_image_size by the shared preprocessing module (see resize_images) with params_resize_mode,
+    the same way the evaluation, inference and serving code does. With params_stream_manifest the training and validation
+    data are read from the manifest CSV inside the input pipeline, so no file list is held in memory, the shuffle holds
+    params_shuffle_buffer manifest rows and at most params_prefetch_batches batches wait for the model: memory stays flat
+    as the dataset grows. The peak resident memory of every run is written next to the training history.
 
     Attributes:
         config (TrainingEntity): An instance of TrainingEntity containing configuration parameters for training.
         model (tf.keras.models.Model): The neural network model to be trained and evaluated.
-        train_generator (tf.keras.preprocessing.image.DirectoryIterator): Generator for training data.
-        valid_generator (tf.keras.preprocessing.image.DirectoryIterator): Generator for validation data.
+        fit_model (tf.keras.models.Model): The model passed to fit; the classification head of model when training
+            on bottleneck features, model itself otherwise.
+        trains_head_only (bool): Whether fit trains only the head on bottleneck features.
+        train_generator (DirectoryIterator or tf.data.Dataset): Training data, depending on params_input_pipeline.
+        valid_generator (DirectoryIterator or tf.data.Dataset): Validation data, depending on params_input_pipeline.
         steps_per_epochs (int): Number of steps per training epoch.
         validation_steps (int): Number of steps per validation epoch.
+        checkpoint_dir (str): Directory of the resumable checkpoints of this model number.
+        initial_epoch (int): Number of epochs completed by the run being resumed, 0 for a new run.
+        strategy (tf.distribute.Strategy): Distribution strategy the model is built and trained under.
+        global_batch_size (int): Batch size summed over all replicas.
 
     Methods:
         __init__(self, TrainingEntity): Constructor method to initialize the TrainingComponent with a TrainingEntity.
-        test_train_split(self): Splits the data into training and validation sets and prepares data generators.
+        test_train_split(self): Prepares the training and validation data listed in the split manifest.
+        _image_data_generator_split(self): Prepares ImageDataGenerator based generators over the manifest.
+        _tf_data_split(self): Prepares parallel tf.data pipelines over the manifest.
+        _tfrecord_split(self): Prepares tf.data pipelines over the per-split TFRecord shards of the data split stage.
+        _streaming_split(self): Prepares tf.data pipelines that stream the manifest, with bounded memory.
+        _bottleneck_split(self): Runs the frozen backbone once and prepares the cached features for head-only training.
+        _configure_precision(self): Compiles the model passed to fit with the mixed precision and XLA settings.
+        _resume_epoch(self) -> int: Returns the epoch to resume at, discarding checkpoints of a different configuration.
+        _train_dataset(self, paths, labels, train_indices, **dataset_kwargs): Builds the shuffled, sharded training dataset.
+        _valid_dataset(self, paths, labels, valid_indices, **dataset_kwargs): Builds the validation dataset.
         train(self, callback_list): Trains the model using the specified callbacks and saves the trained model.
 
     Example Usage:
@@ -27,10 +91,29 @@ class TrainingComponent():
                                         trained_model_path='path/to/trained/model.h5',
                                         actual_model_path='path/to/actual/model.h5',
                                         training_data_path='path/to/training/data',
+                                        manifest_path='path/to/data_split/manifest.csv',
                                         params_image_size=(224, 224, 3),
+                                        params_resize_mode='stretch',
                                         params_batch_size=32,
                                         params_is_augment=True,
                                         params_epochs=10,
+                                        params_input_pipeline='tf_data',
+                                        params_cache_images=True,
+                                        image_cache_dir='path/to/image_cache',
+                                        tfrecord_dir='path/to/tfrecords',
+                                        params_stream_manifest=False,
+                                        params_shuffle_buffer=2048,
+                                        params_prefetch_batches=2,
+                                        params_bottleneck_features=True,
+                                        feature_cache_dir='path/to/features',
+                                        params_mixed_precision=False,
+                                        params_jit_compile=False,
+                                        params_seed=42,
+                                        checkpoint_dir='path/to/checkpoints',
+                                        params_checkpoint_every_epochs=1,
+                                        params_checkpoint_keep=2,
+                                        distribute_strategy='none',
+                                        distribute_scale_lr=True,
                                         model_no=1)
 
         # Instantiate TrainingComponent with the TrainingEntity
@@ -46,25 +129,121 @@ class TrainingComponent():
     def __init__(self, TrainingEntity):
         self.config = TrainingEntity
         create_dirs([self.config.root_dir, os.path.dirname(self.config.trained_model_path)])
+        # the strategy has to exist before any other TensorFlow op runs
+        self.strategy = get_strategy(self.config.distribute_strategy)
+        self.distributed = self.config.distribute_strategy != "none"
+        self.is_chief = is_chief(self.strategy)
+        self.global_batch_size = self.config.params_batch_size * self.strategy.num_replicas_in_sync
+        self.checkpoint_dir = os.path.join(self.config.checkpoint_dir, f"model_{self.config.model_no}")
+        # non-chief workers take part in every save, but into scratch directories of their own
+        self.write_checkpoint_dir = worker_dir(self.checkpoint_dir, self.strategy)
     
     # def load_model(self):
 
+    def _resume_epoch(self) -> int:
+        """
+        Returns the number of epochs completed by an interrupted run of this model number. Checkpoints written
+        with a different training configuration are discarded, so only a genuinely interrupted run is resumed.
+        In a cluster every worker resumes at the chief's epoch, and restores the chief's checkpoint, so
+        checkpoint_dir has to be on storage shared by every worker.
+
+        Returns:
+            int: Epoch to resume at, 0 to start a new run.
+
+        Raises:
+            RuntimeError: If the chief resumes but this worker cannot see the chief's checkpoint.
+        """
+        run_path = os.path.join(self.checkpoint_dir, "run.json")
+        run = json.loads(json.dumps(dataclasses.asdict(self.config), default=str))
+        latest = tf.train.latest_checkpoint(self.checkpoint_dir)
+        epoch = 0
+        if latest and os.path.exists(run_path) and load_json(run_path) == run:
+            epoch = int(latest.rsplit("-", 1)[-1])
+        elif self.is_chief:
+            if os.path.exists(self.checkpoint_dir):
+                logging.info(f"Discarding checkpoints in {self.checkpoint_dir} written with another configuration")
+                shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+            create_dirs([run_path])
+            save_json(values=run, path=run_path)
+        chief_epoch = broadcast_from_chief(self.strategy, epoch)
+        if chief_epoch != epoch:
+            raise RuntimeError(f"The chief resumes at epoch {chief_epoch}, but this worker finds "
+                               f"{'no checkpoint' if not epoch else f'epoch {epoch}'} of this run in {self.checkpoint_dir}. "
+                               f"checkpoint_dir must be on storage shared by every worker.")
+        return chief_epoch
+
     def test_train_split(self):
-        self.model = tf.keras.models.load_model(self.config.actual_model_path)
-        preprocessing_kwargs = dict(
-            rescale = 1./255,
-            validation_split=0.2
+        with self.strategy.scope():
+            self.model = tf.keras.models.load_model(self.config.actual_model_path)
+            self.initial_epoch = self._resume_epoch()
+            self.fit_model = self.model
+            self.trains_head_only = False
+            if self.config.params_bottleneck_features and self.config.params_is_augment:
+                raise ValueError("BOTTLENECK_FEATURES trains on features of the original images; set AUG: False")
+            if self.config.params_stream_manifest:
+                if self.distributed:
+                    raise ValueError("Distributed training needs STREAM_MANIFEST: False")
+                self._streaming_split()
+            elif (self.config.params_bottleneck_features and self.config.params_input_pipeline == "tf_data"
+                  and backbone_is_frozen(self.model)):
+                self._bottleneck_split()
+            elif self.config.params_input_pipeline == "tf_data":
+                self._tf_data_split()
+            elif self.config.params_input_pipeline == "tfrecord":
+                if self.distributed:
+                    raise ValueError("Distributed training needs INPUT_PIPELINE: tf_data")
+                self._tfrecord_split()
+            elif self.config.params_input_pipeline == "keras_generator":
+                if self.distributed:
+                    raise ValueError("Distributed training needs INPUT_PIPELINE: tf_data")
+                self._image_data_generator_split()
+            else:
+                raise ValueError(f"Unknown INPUT_PIPELINE: {self.config.params_input_pipeline}")
+            self._configure_precision()
+
+    def _configure_precision(self):
+        """
+        Compiles the model passed to fit with the configured dtype policy and XLA setting. A mixed precision
+        run trains a clone of the model whose weights are copied back before saving, so the saved model stays float32.
+        """
+        self._copy_weights_back = False
+        policy = resolve_precision_policy(self.config.params_mixed_precision)
+        if policy != "float32" and self.fit_model is self.model:
+            self.fit_model = apply_precision_policy(self.model, policy)
+            self._copy_weights_back = True
+        optimizer_config = tf.keras.optimizers.serialize(self.model.optimizer)
+        if self.distributed and self.config.distribute_scale_lr:
+            # linear scaling rule: the global batch grows with the number of replicas, so does the learning rate
+            optimizer_config["config"]["learning_rate"] *= self.strategy.num_replicas_in_sync
+        self.fit_model.compile(
+            optimizer=tf.keras.optimizers.deserialize(optimizer_config),
+            loss=self.model.loss,
+            metrics=["accuracy"],
+            jit_compile=self.config.params_jit_compile
         )
+        self.checkpoint = tf.train.Checkpoint(model=self.fit_model, optimizer=self.fit_model.optimizer)
+        self.checkpoint_manager = tf.train.CheckpointManager(self.checkpoint, self.write_checkpoint_dir,
+                                                             max_to_keep=self.config.params_checkpoint_keep)
 
-        #  generates validation data
-        valid_data_gen = tf.keras.preprocessing.image.ImageDataGenerator(**preprocessing_kwargs)
-        self.valid_generator = valid_data_gen.flow_from_directory( directory=self.config.training_data_path, 
+    def _image_data_generator_split(self):
+        if self.config.params_resize_mode != "stretch":
+            raise ValueError("INPUT_PIPELINE: keras_generator only supports RESIZE_MODE: stretch")
+        manifest = pd.read_csv(self.config.manifest_path)
+        flow_kwargs = dict(
+            directory=self.config.training_data_path,
+            x_col='path',
+            y_col='class_name',
+            classes=manifest.sort_values('label').class_name.unique().tolist(),
             target_size=self.config.params_image_size[:-1],
             batch_size=self.config.params_batch_size,
-            subset='validation',
             shuffle=False
         )
 
+        #  generates validation data
+        valid_data_gen = tf.keras.preprocessing.image.ImageDataGenerator(rescale = 1./255)
+        self.valid_generator = valid_data_gen.flow_from_dataframe(manifest[manifest.split == 'valid'],
+                                                                  **flow_kwargs)
+
         # generate training data 
         if self.config.params_is_augment:
             train_data_generator = tf.keras.preprocessing.image.ImageDataGenerator(rotation_range=40,
@@ -73,39 +252,233 @@ class TrainingComponent():
                                                                               height_shift_range=0.2, 
                                                                               shear_range=0.2, 
                                                                               zoom_range=0.2,
-                                                                              **preprocessing_kwargs)
+                                                                              rescale = 1./255)
         else:
             train_data_generator = valid_data_gen
 
-        self.train_generator = train_data_generator.flow_from_directory(directory=self.config.training_data_path, 
-            target_size=self.config.params_image_size[:-1],
+        # ImageDataGenerator iterators cannot be positioned, so a resumed run only restores the model and optimizer
+        self.train_generator = train_data_generator.flow_from_dataframe(manifest[manifest.split == 'train'],
+                                                                        **dict(flow_kwargs, shuffle=True,
+                                                                               seed=self.config.params_seed))
+
+    def _tf_data_split(self):
+        paths, labels, splits, class_names = read_manifest(self.config.manifest_path,
+                                                           self.config.training_data_path)
+        cache = None
+        if self.config.params_cache_images:
+            cache = load_image_cache(paths, self.config.params_image_size, self.config.image_cache_dir,
+                                     self.config.params_resize_mode)
+        dataset_kwargs = dict(
+            num_classes=len(class_names),
+            image_size=self.config.params_image_size,
+            resize_mode=self.config.params_resize_mode,
+            cache=cache
+        )
+
+        self.valid_generator = self._valid_dataset(paths, labels, subset_indices(splits, 'valid'), **dataset_kwargs)
+        self.train_generator = self._train_dataset(paths, labels, subset_indices(splits, 'train'),
+                                                   augment=self.config.params_is_augment,
+                                                   **dataset_kwargs)
+
+    def _tfrecord_split(self):
+        # every split has shards of its own, so training and validation only read their own records
+        index = read_tfrecord_index(self.config.tfrecord_dir)
+        dataset_kwargs = dict(
+            num_classes=len(index["class_names"]),
+            image_size=self.config.params_image_size,
+            resize_mode=self.config.params_resize_mode
+        )
+        self.valid_generator = tfrecord_dataset(self.config.tfrecord_dir, 'valid',
+                                                batch_size=self.config.params_batch_size, **dataset_kwargs)
+        # the record shuffle is not positioned by epoch, so a resumed run only restores the model and optimizer
+        self.train_generator = tfrecord_dataset(self.config.tfrecord_dir, 'train',
+                                                batch_size=self.config.params_batch_size,
+                                                augment=self.config.params_is_augment,
+                                                shuffle=True,
+                                                seed=self.config.params_seed,
+                                                shuffle_buffer=self.config.params_shuffle_buffer,
+                                                prefetch=self.config.params_prefetch_batches,
+                                                **dataset_kwargs)
+        self.steps_per_epochs = math.ceil(index["splits"]["train"]["records"] / self.config.params_batch_size)
+
+    def _streaming_split(self):
+        # class names and split sizes come from the summary the data split stage writes next to the manifest
+        summary = load_json(os.path.splitext(self.config.manifest_path)[0] + ".json")
+        if self.config.params_cache_images or self.config.params_bottleneck_features:
+            logging.warning("CACHE_IMAGES and BOTTLENECK_FEATURES are ignored with STREAM_MANIFEST, "
+                            "their caches grow with the dataset")
+        dataset_kwargs = dict(
+            num_classes=len(summary["class_names"]),
+            image_size=self.config.params_image_size,
+            resize_mode=self.config.params_resize_mode,
             batch_size=self.config.params_batch_size,
-            subset='training',
-            shuffle=False
+            prefetch=self.config.params_prefetch_batches
+        )
+        self.valid_generator = manifest_dataset(self.config.manifest_path, self.config.training_data_path,
+                                                'valid', **dataset_kwargs)
+        # the row shuffle is not positioned by epoch, so a resumed run only restores the model and optimizer
+        self.train_generator = manifest_dataset(self.config.manifest_path, self.config.training_data_path,
+                                                'train',
+                                                augment=self.config.params_is_augment,
+                                                shuffle=True,
+                                                seed=self.config.params_seed,
+                                                shuffle_buffer=self.config.params_shuffle_buffer,
+                                                **dataset_kwargs)
+        self.steps_per_epochs = math.ceil(summary["counts"]["train"] / self.config.params_batch_size)
+
+    def _bottleneck_split(self):
+        paths, labels, splits, class_names = read_manifest(self.config.manifest_path,
+                                                           self.config.training_data_path)
+        cache = None
+        if self.config.params_cache_images:
+            cache = load_image_cache(paths, self.config.params_image_size, self.config.image_cache_dir,
+                                     self.config.params_resize_mode)
+        images = make_dataset(paths, labels, list(range(len(paths))),
+                              cache=cache,
+                              num_classes=len(class_names),
+                              image_size=self.config.params_image_size,
+                              resize_mode=self.config.params_resize_mode,
+                              batch_size=self.config.params_batch_size)
+
+        # the frozen backbone runs once over the dataset; only the head is fitted afterwards
+        feature_model, self.fit_model = split_frozen_backbone(self.model)
+        self.trains_head_only = True
+        features = load_feature_cache(feature_model, images, paths,
+                                      self.config.params_image_size, self.config.feature_cache_dir,
+                                      self.config.params_resize_mode)
+
+        dataset_kwargs = dict(
+            num_classes=len(class_names),
+            cache=features,
+            scale=1.0
         )
+        self.valid_generator = self._valid_dataset(paths, labels, subset_indices(splits, 'valid'), **dataset_kwargs)
+        self.train_generator = self._train_dataset(paths, labels, subset_indices(splits, 'train'), **dataset_kwargs)
+
+    def _train_dataset(self, paths, labels, train_indices, **dataset_kwargs):
+        """
+        Builds the shuffled training dataset and sets steps_per_epochs. Distributed, every worker's input pipeline
+        reads its own equally sized shard of train_indices (up to num_workers - 1 samples are left out) in batches
+        of the per-replica batch size.
+
+        Args:
+            paths (list): Image paths as returned by read_manifest.
+            labels (list): Integer labels aligned with paths.
+            train_indices (list): Indices of the training samples.
+            **dataset_kwargs: Remaining make_dataset arguments.
+
+        Returns:
+            tf.data.Dataset or tf.distribute.DistributedDataset: The training data.
+        """
+        shuffle_kwargs = dict(shuffle=True, seed=self.config.params_seed, initial_epoch=self.initial_epoch)
+        self.steps_per_epochs = math.ceil(len(train_indices) / self.global_batch_size)
+        if not self.distributed:
+            return make_dataset(paths, labels, train_indices, batch_size=self.config.params_batch_size,
+                                **shuffle_kwargs, **dataset_kwargs)
+
+        def _dataset_fn(input_context):
+            shard_size = len(train_indices) // input_context.num_input_pipelines
+            shard = train_indices[input_context.input_pipeline_id::input_context.num_input_pipelines][:shard_size]
+            return make_dataset(paths, labels, shard,
+                                batch_size=input_context.get_per_replica_batch_size(self.global_batch_size),
+                                **shuffle_kwargs, **dataset_kwargs)
+
+        # CPU workers hold one replica each, so a shard yields ceil(shard_size / BATCH_SIZE) batches per epoch
+        self.steps_per_epochs = math.ceil((len(train_indices) // self.strategy.num_replicas_in_sync)
+                                          / self.config.params_batch_size)
+        return self.strategy.distribute_datasets_from_function(_dataset_fn)
+
+    def _valid_dataset(self, paths, labels, valid_indices, **dataset_kwargs) -> tf.data.Dataset:
+        """
+        Builds the validation dataset in batches of the global batch size. Distributed, Keras splits every
+        batch between the replicas.
+        """
+        dataset = make_dataset(paths, labels, valid_indices, batch_size=self.global_batch_size, **dataset_kwargs)
+        if self.distributed:
+            options = tf.data.Options()
+            options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.DATA
+            dataset = dataset.with_options(options)
+        return dataset
 
     def train(self, callback_list):
-        self.steps_per_epochs = self.train_generator.samples // self.train_generator.batch_size
-        self.validation_steps = self.valid_generator.samples // self.valid_generator.batch_size
+        if hasattr(self.train_generator, "samples"):
+            self.steps_per_epochs = self.train_generator.samples // self.train_generator.batch_size
+            self.validation_steps = self.valid_generator.samples // self.valid_generator.batch_size
+        else:
+            # the shuffled training dataset repeats endlessly (steps_per_epochs is set with it);
+            # the finite validation dataset is iterated once per epoch, last partial batch included
+            self.validation_steps = None
+
+        if self.initial_epoch:
+            if hasattr(self.fit_model.optimizer, "build"):
+                self.fit_model.optimizer.build(self.fit_model.trainable_variables)
+            latest = tf.train.latest_checkpoint(self.checkpoint_dir)
+            self.checkpoint.restore(latest)
+            logging.info(f"Resuming training from {latest} at epoch {self.initial_epoch + 1}")
+        # the epoch log is appended across resumed runs and becomes the history CSV once training completes
+        epoch_log_path = os.path.join(self.write_checkpoint_dir, "epoch_log.csv")
+        create_dirs([epoch_log_path])
+        if self.trains_head_only:
+            # fit sees the head alone; the best-model checkpoint has to hold the full network
+            callback_list = [FullModelCheckpoint(self.model, callback.filepath,
+                                                 monitor=callback.monitor,
+                                                 save_best_only=callback.save_best_only,
+                                                 save_weights_only=callback.save_weights_only)
+                             if isinstance(callback, tf.keras.callbacks.ModelCheckpoint) else callback
+                             for callback in callback_list]
+        callback_list = list(callback_list) + [
+            ResumableCheckpointCallback(self.checkpoint_manager,
+                                        every_epochs=self.config.params_checkpoint_every_epochs,
+                                        options=_async_checkpoint_options()),
+            tf.keras.callbacks.CSVLogger(epoch_log_path, append=self.initial_epoch > 0),
+        ]
+        train_data = self.train_generator
+        profiler = next((callback for callback in callback_list if isinstance(callback, ThroughputProfilerCallback)), None)
+        if profiler is not None and isinstance(train_data, tf.data.Dataset):
+            train_data = profiler.instrument(train_data)
+        elif profiler is not None:
+            # generators and distributed datasets cannot be probed: images/s is counted from the batch size
+            profiler.batch_size = getattr(train_data, "batch_size", self.global_batch_size)
 
-        history = self.model.fit(self.train_generator, 
+        self.fit_model.fit(train_data, 
                         epochs = self.config.params_epochs,
+                        initial_epoch = self.initial_epoch,
                         steps_per_epoch = self.steps_per_epochs,
                         validation_steps = self.validation_steps, 
                         validation_data = self.valid_generator,
                         callbacks =callback_list
                         )
+        if hasattr(self.checkpoint, "sync"):
+            self.checkpoint.sync()  # wait for pending async checkpoint writes
+        if self._copy_weights_back:
+            self.model.set_weights(self.fit_model.get_weights())
+        if not self.is_chief:
+            shutil.rmtree(self.write_checkpoint_dir, ignore_errors=True)
+            return
         path_to_model_history = os.path.join(os.path.dirname(self.config.trained_model_path), "history_csv")
-        create_dirs([path_to_model_history])
         epoch_his_path = os.path.join(
             path_to_model_history,
             f"epoch_his_{self.config.model_no}.csv")
-        epoch_history = history.history
-        epoch_history_df = pd.DataFrame(epoch_history)
+        create_dirs([epoch_his_path])
+        # epochs after the last checkpoint of an interrupted run were trained again after resuming
+        epoch_history_df = pd.read_csv(epoch_log_path).drop_duplicates("epoch", keep="last").set_index("epoch")
         epoch_history_df.to_csv(epoch_his_path)
+        if profiler is not None:
+            save_json(values=profiler.summary(),
+                      path=os.path.join(path_to_model_history, f"throughput_{self.config.model_no}.json"))
+        # ru_maxrss is in KiB on Linux; the peak covers the whole process, model and input pipeline together
+        save_json(values=dict(peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                              stream_manifest=self.config.params_stream_manifest,
+                              input_pipeline=self.config.params_input_pipeline,
+                              shuffle_buffer=self.config.params_shuffle_buffer,
+                              prefetch_batches=self.config.params_prefetch_batches,
+                              batch_size=self.config.params_batch_size,
+                              steps_per_epoch=self.steps_per_epochs),
+                  path=os.path.join(path_to_model_history, f"memory_{self.config.model_no}.json"))
         
         trained_model_path = os.path.join(
             os.path.dirname(self.config.trained_model_path),
             f"trained_model_{self.config.model_no}.h5")
         
         self.model.save(trained_model_path)
+        shutil.rmtree(self.checkpoint_dir)
@@ -1,33 +1,57 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from src.config.configuration_manager import ModelEvaluationEntity
 import tensorflow as tf
-from pathlib import Path
-from src.utils.common import save_json, create_dirs
+import pandas as pd
+from src.logger import logging
+from src.utils.common import save_json, create_dirs, trained_model_file, eval_model_numbers
+from src.utils.data_pipeline import read_manifest, subset_indices, make_dataset, tfrecord_dataset
+from src.utils.image_cache import load_image_cache
+from src.utils.metrics import StreamingClassificationMetrics, plot_confusion_matrix
 
 class ModelEvaluation:
     """
     ModelEvaluation is a class designed for evaluating a trained deep learning model using TensorFlow and Keras.
-    It includes functionalities for loading a trained model, preparing a validation data generator, and conducting
-    evaluation. The evaluation results are then saved as a JSON file.
+    It includes functionalities for loading a trained model, preparing a data generator over the held-out test split
+    of the split manifest, and conducting evaluation. The predictions are streamed batch by batch into running counts
+    (see StreamingClassificationMetrics), so loss, accuracy, top-k accuracy, calibration error and per-class precision,
+    recall and F1 all come out of one pass over the test split with constant memory. Several trained models (params_eval_models)
+    are evaluated in the same pass: every decoded batch is fed to all of them by a thread pool, so comparing n models reads
+    the dataset once instead of n times. The evaluation results are then saved as JSON files, together with a confusion
+    matrix plot, and a comparative report when more than one model was evaluated.
 
     Attributes:
         config (ModelEvaluationEntity): An instance of ModelEvaluationEntity containing configuration parameters.
-        valid_data_generator (tf.keras.preprocessing.image.DirectoryIterator): Generator for validation data.
-        score (list): Evaluation scores, typically containing loss and accuracy.
+        valid_data_generator (DirectoryIterator or tf.data.Dataset): Validation data, depending on params_input_pipeline.
+        class_names (list): Class names in label order.
+        reports (dict): Evaluation metrics of every evaluated model number, as returned by StreamingClassificationMetrics.result.
+        report (dict): Evaluation metrics of model_no (or of the first evaluated model).
 
     Methods:
         __init__(self, ModelEvaluationEntity): Constructor method to initialize the ModelEvaluation with a ModelEvaluationEntity.
-        _valid_generator(self): Prepares the validation data generator based on the provided configuration.
-        evaluation(self): Evaluates the trained model using the validation data generator.
-        save_score(self): Saves the evaluation scores as a JSON file.
+        _valid_generator(self): Prepares the test split data generator based on the provided configuration.
+        _valid_dataset(self): Prepares the test split as a tf.data pipeline, reading the image cache or the TFRecord shards.
+        _batches(self): Yields the (images, one_hot_labels) batches of the test split once.
+        model_numbers(self) -> list: Resolves params_eval_models into the model numbers to evaluate.
+        evaluation(self, model=None): Evaluates the trained models on the test split in a single streaming pass.
+        save_score(self): Saves the evaluation scores and the full reports as JSON files, and the comparison of the models.
 
     Example Usage:
         # Instantiate ModelEvaluationEntity with necessary configuration parameters
         evaluation_config = ModelEvaluationEntity(
             trained_model_path='path/to/trained/model.h5',
             training_data_path='path/to/training/data',
+            manifest_path='path/to/data_split/manifest.csv',
             params_image_size=(224, 224, 3),
+            params_resize_mode='stretch',
             params_batch_size=32,
+            params_input_pipeline='tf_data',
+            params_cache_images=True,
+            image_cache_dir='path/to/image_cache',
+            tfrecord_dir='path/to/tfrecords',
+            params_top_k=3,
+            params_eval_models=[1, 2, 3],
+            params_eval_workers=0,
             model_no=1
         )
 
@@ -40,42 +64,130 @@ class ModelEvaluation:
     """
     def __init__(self, ModelEvaluationEntity):
         self.config = ModelEvaluationEntity
-    
+
     def _valid_generator(self):
-        data_preprocessing_kwargs = dict(
-            rescale=1./255, 
-            validation_split = 0.3
-        )
-        valid_data_preprocessing = tf.keras.preprocessing.image.ImageDataGenerator(**data_preprocessing_kwargs)
-        self.valid_data_generator  = valid_data_preprocessing.flow_from_directory(
-            directory = self.config.training_data_path, 
+        if self.config.params_input_pipeline in ("tf_data", "tfrecord"):
+            self._valid_dataset()
+            return
+        if self.config.params_resize_mode != "stretch":
+            raise ValueError("INPUT_PIPELINE: keras_generator only supports RESIZE_MODE: stretch")
+        manifest = pd.read_csv(self.config.manifest_path)
+        self.class_names = manifest.sort_values('label').class_name.unique().tolist()
+        valid_data_preprocessing = tf.keras.preprocessing.image.ImageDataGenerator(rescale=1./255)
+        self.valid_data_generator  = valid_data_preprocessing.flow_from_dataframe(
+            manifest[manifest.split == 'test'],
+            directory = self.config.training_data_path,
+            x_col='path',
+            y_col='class_name',
+            classes=self.class_names,
             target_size= self.config.params_image_size[:-1],
-            batch_size= self.config.params_batch_size, 
+            batch_size= self.config.params_batch_size,
             shuffle=False
         )
-    
-    @property
-    def _load_model(path:Path):  
-        print(path)
-        return tf.keras.models.load_model(path)
-    
-    def evaluation(self):
-        trained_model_path = os.path.join(
-            os.path.dirname(self.config.trained_model_path),
-            f"trained_model_{self.config.model_no}.h5")
-        # self.model = self._load_model(self.config.trained_model_path)
-        model = tf.keras.models.load_model(trained_model_path)
+
+    def _valid_dataset(self):
+        paths, labels, splits, class_names = read_manifest(self.config.manifest_path,
+                                                           self.config.training_data_path)
+        self.class_names = class_names
+        if self.config.params_input_pipeline == "tfrecord":
+            self.valid_data_generator = tfrecord_dataset(self.config.tfrecord_dir, 'test',
+                num_classes=len(class_names),
+                image_size=self.config.params_image_size,
+                resize_mode=self.config.params_resize_mode,
+                batch_size=self.config.params_batch_size
+            )
+            return
+        cache = None
+        if self.config.params_cache_images:
+            cache = load_image_cache(paths, self.config.params_image_size, self.config.image_cache_dir,
+                                     self.config.params_resize_mode)
+        self.valid_data_generator = make_dataset(paths, labels, subset_indices(splits, 'test'),
+            cache=cache,
+            num_classes=len(class_names),
+            image_size=self.config.params_image_size,
+            resize_mode=self.config.params_resize_mode,
+            batch_size=self.config.params_batch_size
+        )
+
+    def _batches(self):
+        if isinstance(self.valid_data_generator, tf.data.Dataset):
+            yield from self.valid_data_generator.as_numpy_iterator()
+        else:
+            # a DirectoryIterator loops forever, so it is read by index for exactly one pass
+            for index in range(len(self.valid_data_generator)):
+                yield self.valid_data_generator[index]
+
+    def model_numbers(self) -> list:
+        """
+        Resolves params_eval_models: a list of model numbers is used as is, a glob (e.g. "trained_model_*.h5") is
+        matched against the files next to trained_model_path, and an empty value selects model_no only.
+
+        Returns:
+            list: Model numbers to evaluate.
+        """
+        return eval_model_numbers(self.config.trained_model_path, self.config.params_eval_models, self.config.model_no)
+
+    def evaluation(self, model: tf.keras.Model = None):
+        """
+        Streams the test split once and feeds every batch to all models, each model accumulating its own metrics.
+        The models of a batch run concurrently on params_eval_workers threads (TensorFlow releases the GIL while
+        it computes), while the input pipeline already prepares the next batch.
+
+        Args:
+            model (tf.keras.Model): Model to evaluate as model_no, e.g. one still in memory after training.
+                Defaults to loading trained_model_{n}.h5 for every number of model_numbers().
+        """
+        if model is not None:
+            models = {self.config.model_no: model}
+        else:
+            # the optimizer state is not needed to predict, so it is not restored
+            models = {number: tf.keras.models.load_model(trained_model_file(self.config.trained_model_path, number),
+                                                         compile=False)
+                      for number in self.model_numbers()}
         self._valid_generator()
-        self.score = model.evaluate(self.valid_data_generator) # list ["loss", "acc"]
-    
+        metrics = {number: StreamingClassificationMetrics(num_classes=len(self.class_names),
+                                                          top_k=self.config.params_top_k)
+                   for number in models}
+        workers = self.config.params_eval_workers or len(models)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for images, targets in self._batches():
+                predictions = {number: executor.submit(model.predict_on_batch, images)
+                               for number, model in models.items()}
+                for number, prediction in predictions.items():
+                    metrics[number].update(targets, prediction.result())
+
+        self.reports = {number: metric.result(self.class_names) for number, metric in metrics.items()}
+        self.report = self.reports.get(self.config.model_no, next(iter(self.reports.values())))
+        for number, report in self.reports.items():
+            logging.info(f"Evaluated model {number} on {report['samples']} test images: "
+                         f"loss {report['loss']:.4f}, accuracy {report['accuracy']:.4f}, "
+                         f"macro F1 {report['macro_f1']:.4f}, ECE {report['ece']:.4f}")
+
     def save_score(self):
-        scores = dict(
-            loss = self.score[0],
-            accuracy = self.score[1]
-        )
+        """
+        Saves, for every evaluated model, the scalar metrics to training_score_{n}.json, the full report with the
+        per-class scores and the confusion matrix to evaluation_report_{n}.json, and the confusion matrix plot next
+        to them. With more than one model, model_comparison.csv ranks the models by accuracy.
+        """
         path_to_save_scores = os.path.join(os.path.dirname(self.config.trained_model_path), 'scores')
-        create_dirs([path_to_save_scores])
-        save_json(values= scores, 
-                  path=os.path.join(path_to_save_scores,f"training_score_{self.config.model_no}.json"))
-        
+        comparison = []
+        for number, report in self.reports.items():
+            scores = {name: value for name, value in report.items()
+                      if isinstance(value, (int, float)) and name != "samples"}
+            score_path = os.path.join(path_to_save_scores, f"training_score_{number}.json")
+            create_dirs([score_path])
+            save_json(values= scores,
+                      path=score_path)
+            save_json(values=report,
+                      path=os.path.join(path_to_save_scores, f"evaluation_report_{number}.json"))
+            try:
+                plot_confusion_matrix(report["confusion_matrix"], self.class_names,
+                                      os.path.join(path_to_save_scores, f"confusion_matrix_{number}.png"))
+            except ImportError as e:
+                logging.info(f"Skipping the confusion matrix plot: {e}")
+            comparison.append(dict(model_no=number, **scores))
 
+        if len(comparison) > 1:
+            comparison_path = os.path.join(path_to_save_scores, "model_comparison.csv")
+            pd.DataFrame(comparison).sort_values("accuracy", ascending=False).to_csv(comparison_path, index=False)
+            logging.info(f"Model comparison written to {comparison_path}")
@@ -0,0 +1,242 @@
+import os
+import time
+import zlib
+import random
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import create_dirs, save_json, trained_model_file
+from src.utils.data_pipeline import read_manifest, subset_indices, make_dataset
+from src.utils.model_profile import prune_by_magnitude, weight_sparsity
+
+QUANTIZATION_MODES = ("none", "dynamic", "int8")
+
+
+def _path_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, fname))
+               for root, _, files in os.walk(path) for fname in files)
+
+
+def _compressed_size(path: str) -> int:
+    # zero runs of a pruned model only shrink the download once the file is compressed
+    files = [path] if os.path.isfile(path) else [os.path.join(root, fname)
+                                                  for root, _, names in os.walk(path) for fname in names]
+    size = 0
+    for fname in files:
+        with open(fname, "rb") as model_file:
+            size += len(zlib.compress(model_file.read(), 6))
+    return size
+
+
+def saved_model_predict_fn(saved_model_dir: str):
+    """
+    Loads the serving_default signature of a SavedModel and returns a function mapping an image batch to the
+    class probabilities. Loaded signatures only take keyword arguments, so the batch is passed under the name of
+    the signature's single input.
+
+    Args:
+        saved_model_dir (str): Directory of the SavedModel.
+
+    Returns:
+        callable: Maps a float32 numpy batch to a numpy array of probabilities.
+    """
+    serving_fn = tf.saved_model.load(saved_model_dir).signatures["serving_default"]
+    input_name = next(iter(serving_fn.structured_input_signature[1]))
+
+    def predict(images):
+        return list(serving_fn(**{input_name: tf.constant(images)}).values())[0].numpy()
+    return predict
+
+
+class ModelExportComponent:
+    """
+    ModelExportComponent is a class designed for exporting a trained Keras model for serving.
+    It writes a SavedModel and a TFLite model (float, dynamic-range quantized, or full-int8 quantized with calibration
+    images drawn from the training split), and reports file size, accuracy and single-image CPU latency of every
+    exported format against the float Keras model. With params_weight_sparsity the model is magnitude-pruned before
+    the export, the TFLite converter encodes the sparse weights, and the report shows what the pruning costs in accuracy.
+
+    Attributes:
+        config (ModelExportEntity): An instance of ModelExportEntity containing configuration parameters.
+        model (tf.keras.Model): The trained Keras model, pruned when params_weight_sparsity is set.
+        model_path (str): .h5 file of model; the pruned model is saved to the export directory.
+        saved_model_dir (str): Directory of the exported SavedModel.
+        tflite_path (str): Path of the exported TFLite model.
+
+    Methods:
+        __init__(self, ModelExportEntity): Constructor method to initialize ModelExportComponent with a ModelExportEntity.
+        _samples(self, subset, count) -> tf.data.Dataset: Seeded sample of single-image batches from a manifest split.
+        export_saved_model(self): Writes the SavedModel.
+        export_tflite(self): Converts the model to TFLite with the configured quantization.
+        _tflite_predict(interpreter, image) -> np.ndarray: Runs one image through a TFLite interpreter.
+        benchmark(self, predict_fn, dataset) -> dict: Measures accuracy and latency of a predict function.
+        report(self) -> dict: Compares the exported formats with the Keras model and saves the report.
+
+    Example Usage:
+        # Instantiate ModelExportEntity with necessary configuration parameters
+        export_entity = ConfigurationManager().get_model_export_entity()
+
+        # Instantiate ModelExportComponent with ModelExportEntity
+        exporter = ModelExportComponent(export_entity)
+
+        # Export and compare
+        exporter.export_saved_model()
+        exporter.export_tflite()
+        exporter.report()
+    """
+    def __init__(self, ModelExportEntity):
+        """
+        Initializes ModelExportComponent with a given ModelExportEntity and loads the trained model.
+
+        Args:
+            ModelExportEntity (ModelExportEntity): An instance of ModelExportEntity containing configuration parameters.
+        """
+        self.config = ModelExportEntity
+        if self.config.params_quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"QUANTIZATION must be one of {QUANTIZATION_MODES}, got {self.config.params_quantization!r}")
+        self.model_path = trained_model_file(self.config.trained_model_path, self.config.model_no)
+        self.model = tf.keras.models.load_model(self.model_path)
+        self.saved_model_dir = os.path.join(self.config.root_dir, f"saved_model_{self.config.model_no}")
+        self.tflite_path = os.path.join(self.config.root_dir,
+                                        f"model_{self.config.model_no}_{self.config.params_quantization}.tflite")
+        create_dirs([self.tflite_path])
+        if self.config.params_weight_sparsity:
+            prune_by_magnitude(self.model, self.config.params_weight_sparsity)
+            self.model_path = os.path.join(self.config.root_dir, f"pruned_model_{self.config.model_no}.h5")
+            self.model.save(self.model_path)
+
+    def _samples(self, subset: str, count: int) -> tf.data.Dataset:
+        """
+        Draws a seeded random sample of a manifest split.
+
+        Args:
+            subset (str): Manifest split to sample from.
+            count (int): Maximum number of images.
+
+        Returns:
+            tf.data.Dataset: Dataset yielding (image, one_hot_label) batches of one image.
+        """
+        paths, labels, splits, class_names = read_manifest(self.config.manifest_path,
+                                                           self.config.training_data_path)
+        indices = subset_indices(splits, subset)
+        indices = sorted(random.Random(self.config.params_seed).sample(indices, min(count, len(indices))))
+        return make_dataset(paths, labels, indices,
+                            num_classes=len(class_names),
+                            image_size=self.config.params_image_size,
+                            resize_mode=self.config.params_resize_mode,
+                            batch_size=1)
+
+    def export_saved_model(self):
+        """
+        Writes the model in the SavedModel format.
+        """
+        tf.saved_model.save(self.model, self.saved_model_dir)
+        logging.info(f"Exported SavedModel to {self.saved_model_dir}")
+
+    def export_tflite(self):
+        """
+        Converts the model to TFLite. "dynamic" quantizes the weights to int8; "int8" also quantizes the
+        activations and the input/output tensors, calibrated on params_calibration_samples training images.
+        """
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        if self.config.params_quantization in ("dynamic", "int8"):
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if self.config.params_weight_sparsity:
+            converter.optimizations = [*converter.optimizations, tf.lite.Optimize.EXPERIMENTAL_SPARSITY]
+        if self.config.params_quantization == "int8":
+            calibration = self._samples("train", self.config.params_calibration_samples)
+
+            def representative_dataset():
+                for image, _ in calibration:
+                    yield [image]
+
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.uint8
+            converter.inference_output_type = tf.uint8
+        with open(self.tflite_path, "wb") as tflite_file:
+            tflite_file.write(converter.convert())
+        logging.info(f"Exported {self.config.params_quantization} TFLite model to {self.tflite_path}")
+
+    @staticmethod
+    def _tflite_predict(interpreter: tf.lite.Interpreter, image: np.ndarray) -> np.ndarray:
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        if input_details["dtype"] != np.float32:
+            scale, zero_point = input_details["quantization"]
+            image = np.round(image / scale + zero_point).astype(input_details["dtype"])
+        interpreter.set_tensor(input_details["index"], image)
+        interpreter.invoke()
+        output = interpreter.get_tensor(output_details["index"])
+        if output_details["dtype"] != np.float32:
+            scale, zero_point = output_details["quantization"]
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    @staticmethod
+    def benchmark(predict_fn, dataset: tf.data.Dataset) -> dict:
+        """
+        Runs every image of dataset through predict_fn one at a time.
+
+        Args:
+            predict_fn (callable): Maps an image batch of one image to class probabilities.
+            dataset (tf.data.Dataset): Batches of one (image, one_hot_label).
+
+        Returns:
+            dict: Accuracy and latency statistics in milliseconds.
+        """
+        latencies, correct, total = [], 0, 0
+        for image, label in dataset.as_numpy_iterator():
+            start = time.perf_counter()
+            probabilities = predict_fn(image)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            correct += int(np.argmax(probabilities[0]) == np.argmax(label[0]))
+            total += 1
+        # the first call includes tracing/allocation and is left out of the latency figures
+        latencies = np.array(latencies[1:] or latencies)
+        return dict(accuracy=correct / max(total, 1),
+                    samples=total,
+                    latency_ms=dict(mean=float(latencies.mean()),
+                                    p50=float(np.percentile(latencies, 50)),
+                                    p90=float(np.percentile(latencies, 90))))
+
+    def report(self) -> dict:
+        """
+        Compares the Keras, SavedModel and TFLite models on params_eval_samples test images and saves
+        export_report_{model_no}.json next to the exported models. A pruned model is also compared with the
+        trained model before pruning.
+
+        Returns:
+            dict: Size, accuracy and latency of every format, and the deltas of the TFLite model.
+        """
+        dataset = self._samples("test", self.config.params_eval_samples)
+
+        interpreter = tf.lite.Interpreter(model_path=self.tflite_path)
+        interpreter.allocate_tensors()
+
+        formats = dict(
+            keras_h5=(self.model_path, self.model.predict_on_batch),
+            saved_model=(self.saved_model_dir, saved_model_predict_fn(self.saved_model_dir)),
+            tflite=(self.tflite_path, lambda image: self._tflite_predict(interpreter, image)),
+        )
+        if self.config.params_weight_sparsity:
+            unpruned_path = trained_model_file(self.config.trained_model_path, self.config.model_no)
+            unpruned = tf.keras.models.load_model(unpruned_path, compile=False)
+            formats = dict(keras_h5_unpruned=(unpruned_path, unpruned.predict_on_batch), **formats)
+        report = dict(model_no=self.config.model_no, quantization=self.config.params_quantization,
+                      sparsity=weight_sparsity(self.model))
+        for name, (path, predict_fn) in formats.items():
+            report[name] = dict(path=str(path), size_bytes=_path_size(path), compressed_size_bytes=_compressed_size(path),
+                                **self.benchmark(predict_fn, dataset))
+            logging.info(f"{name}: {report[name]}")
+
+        report["tflite_vs_keras"] = dict(
+            accuracy_delta=report["tflite"]["accuracy"] - report["keras_h5"]["accuracy"],
+            size_ratio=report["tflite"]["size_bytes"] / report["keras_h5"]["size_bytes"],
+            latency_speedup=report["keras_h5"]["latency_ms"]["mean"] / report["tflite"]["latency_ms"]["mean"],
+        )
+        save_json(values=report,
+                  path=os.path.join(self.config.root_dir, f"export_report_{self.config.model_no}.json"))
+        return report
@@ -0,0 +1,281 @@
+import os
+import json
+import time
+import shutil
+import random
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+import tensorflow as tf
+from __init__ import config_path, params_path
+from src.logger import logging
+from src.config.configuration_manager import ConfigurationManager
+from src.components.stage_02_base_model_generator import BaseModelGeneratorComponent
+from src.components.stage_03_callbacks import CALLBACKSCOMPONENT, SuccessiveHalvingPruningCallback
+from src.components.stage_04_model_training import TrainingComponent
+from src.components.stage_05_model_evaluation_component import ModelEvaluation
+from src.utils.common import read_yaml, write_yaml, create_dirs, save_json, load_json, trained_model_file
+from src.utils.model_profile import profile_model
+
+
+def _core_slots(workers: int, threads_per_trial: int) -> list:
+    """
+    Splits the CPU cores available to this process into one core set per worker.
+
+    Args:
+        workers (int): Number of workers.
+        threads_per_trial (int): Cores per worker, 0 to split the cores evenly.
+
+    Returns:
+        list: One list of core ids per worker.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    per_worker = threads_per_trial or max(1, len(cores) // workers)
+    return [[cores[(worker * per_worker + i) % len(cores)] for i in range(per_worker)] for worker in range(workers)]
+
+
+def _init_worker(core_slots) -> None:
+    """
+    Pins a sweep worker to its own core set and sizes the TensorFlow thread pools to it,
+    so parallel trials do not oversubscribe the CPU.
+
+    Args:
+        core_slots (multiprocessing.Queue): Queue of core sets, one taken per worker.
+    """
+    cores = core_slots.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    os.environ["OMP_NUM_THREADS"] = str(len(cores))
+    tf.config.threading.set_intra_op_parallelism_threads(len(cores))
+    tf.config.threading.set_inter_op_parallelism_threads(min(2, len(cores)))
+    logging.info(f"Sweep worker {os.getpid()} pinned to cores {cores}")
+
+
+def _build_actual_model(cm: ConfigurationManager) -> None:
+    params = cm.params
+    generator = BaseModelGeneratorComponent(cm.get_base_model_generator_entity())
+    generator.actual_model(classes=params.CLASSES,
+                           freeze_all=params.FREEZE_ALL,
+                           freeze_till=params.FREEZE_TILL,
+                           learning_rate=params.LR)
+
+
+def run_trial(trial: dict) -> dict:
+    """
+    Trains and evaluates one trial from its own config.yaml and params.yaml.
+
+    Args:
+        trial (dict): Trial from SweepComponent.trials with its config_path and params_path.
+
+    Returns:
+        dict: Trial name, overridden params, test scores, best validation accuracy, training time, and the parameter
+            count, FLOPs and single-image CPU latency (on the worker's pinned cores) of the trained model.
+    """
+    tf.keras.backend.clear_session()
+    start = time.perf_counter()
+    cm = ConfigurationManager(config_path=trial["config_path"], params_path=trial["params_path"])
+    _build_actual_model(cm)
+    callbacks = CALLBACKSCOMPONENT(cm.get_callbacks_entity()).callbacks_list()
+    pruning = next((callback for callback in callbacks if isinstance(callback, SuccessiveHalvingPruningCallback)), None)
+    training_entity = cm.get_training_entity()
+    training = TrainingComponent(TrainingEntity=training_entity)
+    training.test_train_split()
+    training.train(callback_list=callbacks)
+    evaluation = ModelEvaluation(cm.get_model_evaluation_entity())
+    evaluation.evaluation()
+    evaluation.save_score()
+
+    model_dir = os.path.dirname(training_entity.trained_model_path)
+    scores = load_json(os.path.join(model_dir, "scores", f"training_score_{training_entity.model_no}.json"))
+    history = pd.read_csv(os.path.join(model_dir, "history_csv", f"epoch_his_{training_entity.model_no}.csv"))
+    model_path = trained_model_file(training_entity.trained_model_path, training_entity.model_no)
+    profile = profile_model(tf.keras.models.load_model(model_path, compile=False))
+    return dict(trial=trial["name"],
+                **trial["overrides"],
+                **scores,
+                best_val_accuracy=float(history["val_accuracy"].max()) if "val_accuracy" in history else None,
+                epochs_run=len(history),
+                train_seconds=round(time.perf_counter() - start, 1),
+                params=profile["params"],
+                flops=profile["flops"],
+                latency_ms=round(profile["latency_ms"]["mean"], 2),
+                model_path=model_path,
+                status=f"pruned at epoch {pruning.pruned_epoch}" if pruning and pruning.pruned_epoch else "ok")
+
+
+class SweepComponent:
+    """
+    SweepComponent is a class designed for running a hyperparameter sweep over params.yaml.
+    Every trial gets its own directory with a config.yaml and a params.yaml (the base params overridden by one point of the
+    search space, and MODEL set to the trial number), so its base model, checkpoints, trained model, history and scores never
+    collide with other trials. The dataset, split manifest, backbone cache, image cache and feature cache are shared: they are
+    prepared once before the trials start, and the trials then run in a process pool with one pinned core set per worker.
+    With pruning enabled the trials share one rung directory, so trials that fall behind the others at a rung stop early
+    (see SuccessiveHalvingPruningCallback). Every trial also reports the cost of its model (parameters, FLOPs, CPU latency),
+    and the fastest trial whose test accuracy reaches the accuracy bar is selected, so the space can mix backbones and heads.
+
+    Attributes:
+        config (SweepEntity): An instance of SweepEntity containing the sweep configuration and search space.
+        base_config (ConfigBox): Contents of config.yaml.
+        base_params (ConfigBox): Contents of params.yaml.
+        pruning_dir (str): Rung directory shared by the trials of the sweep.
+
+    Methods:
+        __init__(self, SweepEntity, config_path=config_path, params_path=params_path): Reads the base configuration.
+        trials(self) -> list: Expands the search space into trials and writes their configuration files.
+        prepare_shared_artifacts(self, trials): Builds the artifacts every trial reuses.
+        select(self, leaderboard) -> dict: Selects the fastest trial that reaches the accuracy bar.
+        run(self) -> pd.DataFrame: Runs every trial and writes the leaderboard and the selection.
+
+    Example Usage:
+        sweep = SweepComponent(ConfigurationManager().get_sweep_entity())
+        leaderboard = sweep.run()
+    """
+    def __init__(self, SweepEntity, config_path=config_path, params_path=params_path):
+        self.config = SweepEntity
+        if self.config.strategy not in ("grid", "random"):
+            raise ValueError(f"STRATEGY must be 'grid' or 'random', got {self.config.strategy!r}")
+        self.base_config = read_yaml(config_path)
+        self.base_params = read_yaml(params_path)
+        self.pruning_dir = os.path.join(self.config.root_dir, "pruning_rungs")
+        unknown = set(self.config.space) - set(self.base_params)
+        if unknown:
+            raise ValueError(f"Sweep space keys {sorted(unknown)} are not in params.yaml")
+
+    def _write_trial_files(self, name: str, model_no: int, overrides: dict) -> dict:
+        trial_dir = os.path.join(self.config.root_dir, name)
+        config = self.base_config.to_dict()
+        config["base_model_generator"]["actual_model_path"] = os.path.join(trial_dir, "final_model.h5")
+        config["prepare_callbacks"].update(root_dir=trial_dir,
+                                           tensorboard_log_dir=os.path.join(trial_dir, "tensorboard_logs"),
+                                           checkpoint_file_path=os.path.join(trial_dir, "checkpoint", "model.h5"))
+        config["training"].update(root_dir=trial_dir,
+                                  trained_model_path=os.path.join(trial_dir, "trained_model.h5"),
+                                  checkpoint_dir=os.path.join(trial_dir, "checkpoints"))
+        config["prepare_callbacks"]["pruning_dir"] = self.pruning_dir
+        params = self.base_params.to_dict()
+        params.update(overrides, MODEL=model_no, PRUNING=self.config.pruning)
+
+        trial = dict(name=name,
+                     overrides=overrides,
+                     config_path=os.path.join(trial_dir, "config.yaml"),
+                     params_path=os.path.join(trial_dir, "params.yaml"))
+        create_dirs([trial["config_path"]])
+        write_yaml(config, trial["config_path"])
+        write_yaml(params, trial["params_path"])
+        return trial
+
+    def trials(self) -> list:
+        """
+        Expands the search space: every combination for the grid strategy, or a seeded sample of
+        `trials` distinct combinations for the random strategy.
+
+        Returns:
+            list: Trials with their name, overrides and configuration file paths.
+        """
+        keys = sorted(self.config.space)
+        grid = [dict(zip(keys, values)) for values in itertools.product(*(self.config.space[key] for key in keys))]
+        if self.config.strategy == "random":
+            grid = random.Random(self.config.seed).sample(grid, min(self.config.trials, len(grid)))
+        return [self._write_trial_files(f"trial_{number:03d}", number, overrides)
+                for number, overrides in enumerate(grid, start=1)]
+
+    def prepare_shared_artifacts(self, trials: list) -> None:
+        """
+        Runs the ingestion, data split and base model stages (the latter fills the backbone cache), and fills the
+        backbone cache for every other BACKBONE of the trials, so parallel trials never build the same one. Then it
+        prepares the training data of one trial, which builds the image cache and, for a frozen backbone, the feature
+        cache. A trial with a frozen backbone is preferred because its feature cache is shared by every frozen trial.
+
+        Args:
+            trials (list): Trials from trials().
+        """
+        from src.pipeline.stage_runner import StageRunner, STAGES
+        runner = StageRunner()
+        for stage in STAGES[:3]:
+            runner.run(stage)
+        backbones = {}
+        for trial in trials:
+            backbones.setdefault(trial["overrides"].get("BACKBONE", self.base_params.BACKBONE), trial)
+        for trial in backbones.values():
+            cm = ConfigurationManager(config_path=trial["config_path"], params_path=trial["params_path"])
+            BaseModelGeneratorComponent(cm.get_base_model_generator_entity())._backbone()
+            tf.keras.backend.clear_session()
+        trial = next((trial for trial in trials if trial["overrides"].get("FREEZE_ALL", self.base_params.FREEZE_ALL)),
+                     trials[0])
+        cm = ConfigurationManager(config_path=trial["config_path"], params_path=trial["params_path"])
+        _build_actual_model(cm)
+        TrainingComponent(TrainingEntity=cm.get_training_entity()).test_train_split()
+        tf.keras.backend.clear_session()
+
+    def run(self) -> pd.DataFrame:
+        """
+        Runs every trial in a pool of `workers` processes and writes the leaderboard CSV, best `metric` first.
+        A failed trial is recorded with its error and does not stop the sweep.
+
+        Returns:
+            pd.DataFrame: The leaderboard.
+        """
+        # rung results of an earlier sweep would make every new trial look worse than it is
+        shutil.rmtree(self.pruning_dir, ignore_errors=True)
+        trials = self.trials()
+        logging.info(f"Sweep of {len(trials)} {self.config.strategy} trials over {sorted(self.config.space)}")
+        self.prepare_shared_artifacts(trials)
+
+        workers = max(1, min(self.config.workers, len(trials)))
+        context = multiprocessing.get_context("spawn")  # TensorFlow is not fork-safe
+        core_slots = context.Queue()
+        for cores in _core_slots(workers, self.config.threads_per_trial):
+            core_slots.put(cores)
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(core_slots,)) as executor:
+            futures = {executor.submit(run_trial, trial): trial for trial in trials}
+            for future in as_completed(futures):
+                trial = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.exception(e)
+                    result = dict(trial=trial["name"], **trial["overrides"], status=f"failed: {e}")
+                logging.info(f"Sweep trial finished: {result}")
+                results.append(result)
+
+        leaderboard = pd.DataFrame(results)
+        if self.config.metric in leaderboard:
+            leaderboard = leaderboard.sort_values(self.config.metric, ascending=self.config.metric == "loss",
+                                                  na_position="last")
+        create_dirs([self.config.leaderboard_path])
+        leaderboard.to_csv(self.config.leaderboard_path, index=False)
+        logging.info(f"Sweep leaderboard written to {self.config.leaderboard_path}")
+        self.select(leaderboard)
+        return leaderboard
+
+    def select(self, leaderboard: pd.DataFrame) -> dict:
+        """
+        Selects the trial with the lowest CPU latency among those whose test accuracy reaches accuracy_bar,
+        and writes it to selection_path.
+
+        Args:
+            leaderboard (pd.DataFrame): Leaderboard from run().
+
+        Returns:
+            dict: The selected trial, or None when no trial reaches the bar.
+        """
+        selected = None
+        if {"accuracy", "latency_ms"} <= set(leaderboard):
+            candidates = leaderboard[leaderboard["accuracy"] >= self.config.accuracy_bar]
+            if len(candidates):
+                selected = json.loads(candidates.sort_values(["latency_ms", "flops"]).iloc[0].to_json())
+        if selected is None:
+            logging.warning(f"No sweep trial reached the accuracy bar of {self.config.accuracy_bar}")
+        else:
+            logging.info(f"Fastest trial reaching accuracy {self.config.accuracy_bar}: {selected}")
+        create_dirs([self.config.selection_path])
+        save_json(values=dict(accuracy_bar=self.config.accuracy_bar, selected=selected), path=self.config.selection_path)
+        return selected
@@ -1,9 +1,16 @@
 from __init__  import config_path, params_path
 from src.entity.entity_config import (ConfigDataIngest, 
+                                      DataSplitEntity,
                                       BaseModelGeneratorEntity,
                                       CALLBACKSENTITY,
                                       TrainingEntity, 
-                                      ModelEvaluationEntity)
+                                      DistillationEntity,
+                                      ModelEvaluationEntity,
+                                      ModelExportEntity,
+                                      InferenceEntity,
+                                      ServingEntity,
+                                      SweepEntity,
+                                      BenchmarkEntity)
 from src.utils. common import read_yaml
 
 class ConfigurationManager:
@@ -19,10 +26,17 @@ class ConfigurationManager:
         __init__(self, config_path=config_path, params_path=params_path): Constructor method
             to initialize the ConfigurationManager with paths to the configuration and parameter YAML files.
         get_ingest_data_config(self) -> ConfigDataIngest: Fetches configuration for the "ingest data stage."
+        get_data_split_entity(self) -> DataSplitEntity: Fetches configuration for the "data split stage."
         get_base_model_generator_entity(self) -> BaseModelGeneratorEntity: Fetches configuration for the "base model generator stage."
         get_callbacks_entity(self) -> CALLBACKSENTITY: Fetches configuration for callback entities used during training.
         get_training_entity(self) -> TrainingEntity: Fetches configuration for the "model training stage."
+        get_distillation_entity(self) -> DistillationEntity: Fetches configuration for the "distillation stage."
         get_model_evaluation_entity(self) -> ModelEvaluationEntity: Fetches configuration for the "model evaluation stage."
+        get_model_export_entity(self) -> ModelExportEntity: Fetches configuration for the "model export stage."
+        get_inference_entity(self) -> InferenceEntity: Fetches configuration for batch inference with a trained model.
+        get_serving_entity(self) -> ServingEntity: Fetches configuration for the local HTTP inference server.
+        get_sweep_entity(self) -> SweepEntity: Fetches configuration and search space of the hyperparameter sweep.
+        get_benchmark_entity(self) -> BenchmarkEntity: Fetches configuration for the benchmark suite.
 
     Example Usage:
         # Instantiate ConfigurationManager with paths to configuration and parameter YAML files
@@ -55,10 +69,33 @@ class ConfigurationManager:
         data_ingest_config = ConfigDataIngest(
             data_folder = self.config.Ingest_Data.data_folder,
             dataset_name = self.config.Ingest_Data.dataset_name,
+            source_archive = self.config.Ingest_Data.source_archive,
+            manifest_path = self.config.Ingest_Data.manifest_path,
+            extract_workers = self.config.Ingest_Data.extract_workers,
+            verify_hashes = self.config.Ingest_Data.verify_hashes,
         )
 
         return data_ingest_config
     
+    def get_data_split_entity(self) -> DataSplitEntity:
+        """
+        Fetches configuration for the "data split stage."
+
+        Returns:
+            DataSplitEntity: Configuration entity for the "data split stage."
+        """
+        config = self.config.data_split
+        data_split_entity = DataSplitEntity(root_dir=config.root_dir,
+                                            manifest_path=config.manifest_path,
+                                            training_data_path=self.config.training.training_data_path,
+                                            params_test_size=self.params.TEST_SIZE,
+                                            params_valid_size=self.params.VALID_SIZE,
+                                            params_seed=self.params.SEED,
+                                            tfrecord_dir=config.tfrecord_dir,
+                                            params_tfrecord_shards=self.params.TFRECORD_SHARDS,
+                                            params_tfrecord_compression=self.params.TFRECORD_COMPRESSION)
+        return data_split_entity
+
     def get_base_model_generator_entity(self)-> BaseModelGeneratorEntity:
         """
         Fetches configuration for the "base model generator stage."
@@ -70,12 +107,15 @@ class ConfigurationManager:
         base_model_entity = BaseModelGeneratorEntity(
             base_model_path  = self.config.base_model_generator.base_model_path,
             actual_model_path= self.config.base_model_generator.actual_model_path,
+            backbone_cache_dir= self.config.base_model_generator.backbone_cache_dir,
             CLASSES = self.params.CLASSES,
             EPOCHS = self.params.EPOCHS,
             BATCH_SIZE = self.params.BATCH_SIZE,
             LR = self.params.LR,
             TEST_SIZE = self.params.TEST_SIZE,
-            IMAGE_SIZE = self.params.IMAGE_SIZE
+            IMAGE_SIZE = self.params.IMAGE_SIZE,
+            BACKBONE = self.params.BACKBONE,
+            HEAD = self.params.HEAD
         )
         return base_model_entity
     
@@ -90,7 +130,16 @@ class ConfigurationManager:
         
         callback_entity = CALLBACKSENTITY(root_dir=config.root_dir, 
                                           tensorboard_log_dir=config.tensorboard_log_dir,
-                                          checkpoint_file_path=config.checkpoint_file_path
+                                          checkpoint_file_path=config.checkpoint_file_path,
+                                          pruning_dir=config.pruning_dir,
+                                          params_early_stopping_patience=self.params.EARLY_STOPPING_PATIENCE,
+                                          params_reduce_lr_patience=self.params.REDUCE_LR_PATIENCE,
+                                          params_reduce_lr_factor=self.params.REDUCE_LR_FACTOR,
+                                          params_pruning=self.params.PRUNING,
+                                          params_pruning_min_epochs=self.params.PRUNING_MIN_EPOCHS,
+                                          params_pruning_reduction_factor=self.params.PRUNING_REDUCTION_FACTOR,
+                                          params_profile_steps=list(self.params.PROFILE_STEPS),
+                                          trial_id=self.params.MODEL
                                           )
         return callback_entity
 
@@ -106,13 +155,66 @@ class ConfigurationManager:
                                          actual_model_path=self.config.base_model_generator.actual_model_path,
                                          trained_model_path=config.trained_model_path,
                                          training_data_path=config.training_data_path,
+                                         manifest_path=self.config.data_split.manifest_path,
                                          params_epochs= self.params.EPOCHS,
                                          params_batch_size=self.params.BATCH_SIZE,
                                          params_is_augment=self.params.AUG, 
                                          params_image_size=self.params.IMAGE_SIZE,
+                                         params_resize_mode=self.params.RESIZE_MODE,
+                                         params_input_pipeline=self.params.INPUT_PIPELINE,
+                                         params_cache_images=self.params.CACHE_IMAGES,
+                                         image_cache_dir=self.config.image_cache.cache_dir,
+                                         tfrecord_dir=self.config.data_split.tfrecord_dir,
+                                         params_stream_manifest=self.params.STREAM_MANIFEST,
+                                         params_shuffle_buffer=self.params.SHUFFLE_BUFFER,
+                                         params_prefetch_batches=self.params.PREFETCH_BATCHES,
+                                         params_bottleneck_features=self.params.BOTTLENECK_FEATURES,
+                                         feature_cache_dir=config.feature_cache_dir,
+                                         params_mixed_precision=self.params.MIXED_PRECISION,
+                                         params_jit_compile=self.params.JIT_COMPILE,
+                                         params_seed=self.params.SEED,
+                                         checkpoint_dir=config.checkpoint_dir,
+                                         params_checkpoint_every_epochs=self.params.CHECKPOINT_EVERY_EPOCHS,
+                                         params_checkpoint_keep=self.params.CHECKPOINT_KEEP,
+                                         distribute_strategy=self.config.distributed.strategy,
+                                         distribute_scale_lr=self.config.distributed.scale_lr,
                                          model_no=self.params.MODEL)
         return training_entity
 
+    def get_distillation_entity(self)->DistillationEntity:
+        """
+        Fetches configuration for the "distillation stage."
+
+        Returns:
+            DistillationEntity: Configuration entity for the "distillation stage."
+        """
+        config = self.config.distillation
+        distillation_entity = DistillationEntity(root_dir= config.root_dir,
+            student_model_path= config.student_model_path,
+            soft_label_dir= config.soft_label_dir,
+            trained_model_path= self.config.training.trained_model_path,
+            training_data_path= self.config.training.training_data_path,
+            manifest_path= self.config.data_split.manifest_path,
+            image_cache_dir= self.config.image_cache.cache_dir,
+            params_distill= self.params.DISTILL,
+            params_student_backbone= self.params.STUDENT_BACKBONE,
+            params_student_head= self.params.STUDENT_HEAD,
+            params_epochs= self.params.DISTILL_EPOCHS,
+            params_batch_size= self.params.BATCH_SIZE,
+            params_lr= self.params.LR,
+            params_temperature= self.params.DISTILL_TEMPERATURE,
+            params_alpha= self.params.DISTILL_ALPHA,
+            params_image_size= self.params.IMAGE_SIZE,
+            params_resize_mode= self.params.RESIZE_MODE,
+            params_is_augment= self.params.AUG,
+            params_cache_images= self.params.CACHE_IMAGES,
+            params_early_stopping_patience= self.params.EARLY_STOPPING_PATIENCE,
+            params_seed= self.params.SEED,
+            teacher_model_no= self.params.MODEL,
+            student_model_no= self.params.STUDENT_MODEL
+        )
+        return distillation_entity
+
     def get_model_evaluation_entity(self)->ModelEvaluationEntity:
         """
         Fetches configuration for the "model evaluation stage."
@@ -122,10 +224,132 @@ class ConfigurationManager:
         """
         model_evaluation_entity = ModelEvaluationEntity(trained_model_path= self.config.training.trained_model_path,
             training_data_path= self.config.training.training_data_path,
+            manifest_path= self.config.data_split.manifest_path,
             all_params= self.params,
-            params_batch_size= self.params.BATCH_SIZE,
+            params_batch_size= self.params.EVAL_BATCH_SIZE,
             params_image_size= self.params.IMAGE_SIZE,
+            params_resize_mode= self.params.RESIZE_MODE,
+            params_input_pipeline= self.params.INPUT_PIPELINE,
+            params_cache_images= self.params.CACHE_IMAGES,
+            image_cache_dir= self.config.image_cache.cache_dir,
+            tfrecord_dir= self.config.data_split.tfrecord_dir,
+            params_top_k= self.params.TOP_K,
+            params_eval_models= self.params.EVAL_MODELS,
+            params_eval_workers= self.params.EVAL_WORKERS,
             model_no=self.params.MODEL
         )
         return model_evaluation_entity
 
+    def get_model_export_entity(self)->ModelExportEntity:
+        """
+        Fetches configuration for the "model export stage."
+
+        Returns:
+            ModelExportEntity: Configuration entity for the "model export stage."
+        """
+        model_export_entity = ModelExportEntity(root_dir= self.config.model_export.root_dir,
+            trained_model_path= self.config.training.trained_model_path,
+            training_data_path= self.config.training.training_data_path,
+            manifest_path= self.config.data_split.manifest_path,
+            params_image_size= self.params.IMAGE_SIZE,
+            params_resize_mode= self.params.RESIZE_MODE,
+            params_quantization= self.params.QUANTIZATION,
+            params_calibration_samples= self.params.CALIBRATION_SAMPLES,
+            params_eval_samples= self.params.EXPORT_EVAL_SAMPLES,
+            params_weight_sparsity= self.params.WEIGHT_SPARSITY,
+            params_seed= self.params.SEED,
+            model_no=self.params.MODEL
+        )
+        return model_export_entity
+
+    def get_inference_entity(self)->InferenceEntity:
+        """
+        Fetches configuration for batch inference with a trained model.
+
+        Returns:
+            InferenceEntity: Configuration entity for batch inference.
+        """
+        inference_entity = InferenceEntity(trained_model_path= self.config.training.trained_model_path,
+            manifest_path= self.config.data_split.manifest_path,
+            output_path= self.config.inference.output_path,
+            params_image_size= self.params.IMAGE_SIZE,
+            params_resize_mode= self.params.RESIZE_MODE,
+            params_batch_size= self.params.PREDICT_BATCH_SIZE,
+            params_top_k= self.params.TOP_K,
+            params_queue_size= self.params.PREDICT_QUEUE_SIZE,
+            model_no=self.params.MODEL
+        )
+        return inference_entity
+
+    def get_serving_entity(self)->ServingEntity:
+        """
+        Fetches configuration for the local HTTP inference server.
+
+        Returns:
+            ServingEntity: Configuration entity for the inference server.
+        """
+        serving_entity = ServingEntity(host= self.config.serving.host,
+            port= self.config.serving.port,
+            params_max_batch_size= self.params.SERVE_MAX_BATCH_SIZE,
+            params_max_wait_ms= self.params.SERVE_MAX_WAIT_MS
+        )
+        return serving_entity
+
+    def get_sweep_entity(self)->SweepEntity:
+        """
+        Fetches configuration and search space of the hyperparameter sweep.
+        The search space is read from the file at sweep.space_path in config.yaml.
+
+        Returns:
+            SweepEntity: Configuration entity for the hyperparameter sweep.
+        """
+        config = self.config.sweep
+        space = read_yaml(config.space_path)
+        sweep_entity = SweepEntity(root_dir= config.root_dir,
+            leaderboard_path= config.leaderboard_path,
+            selection_path= config.selection_path,
+            strategy= space.STRATEGY,
+            trials= space.TRIALS,
+            seed= space.SEED,
+            workers= space.WORKERS,
+            threads_per_trial= space.THREADS_PER_TRIAL,
+            metric= space.METRIC,
+            pruning= space.PRUNING,
+            accuracy_bar= space.ACCURACY_BAR,
+            space= space.SPACE.to_dict()
+        )
+        return sweep_entity
+
+    def get_benchmark_entity(self)->BenchmarkEntity:
+        """
+        Fetches configuration for the benchmark suite.
+
+        Returns:
+            BenchmarkEntity: Configuration entity for the benchmark suite.
+        """
+        config = self.config.benchmark
+        benchmark_entity = BenchmarkEntity(root_dir= config.root_dir,
+            synthetic_data_dir= config.synthetic_data_dir,
+            results_dir= config.results_dir,
+            images_per_class= config.images_per_class,
+            batch_sizes= list(config.batch_sizes),
+            input_batches= config.input_batches,
+            train_steps= config.train_steps,
+            latency_runs= config.latency_runs,
+            params_image_size= self.params.IMAGE_SIZE,
+            params_resize_mode= self.params.RESIZE_MODE,
+            params_classes= self.params.CLASSES,
+            params_batch_size= self.params.BATCH_SIZE,
+            params_lr= self.params.LR,
+            params_freeze_all= self.params.FREEZE_ALL,
+            params_backbone= self.params.BACKBONE,
+            params_head= self.params.HEAD,
+            params_weight_sparsity= self.params.WEIGHT_SPARSITY,
+            params_tfrecord_compression= self.params.TFRECORD_COMPRESSION,
+            params_shuffle_buffer= self.params.SHUFFLE_BUFFER,
+            params_prefetch_batches= self.params.PREFETCH_BATCHES,
+            params_quantization= self.params.QUANTIZATION,
+            params_calibration_samples= self.params.CALIBRATION_SAMPLES,
+            params_seed= self.params.SEED
+        )
+        return benchmark_entity
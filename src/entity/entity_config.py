@@ -9,16 +9,68 @@ class ConfigDataIngest:
     Attributes:
         data_folder (Path): Path to the folder where data will be ingested.
         dataset_name (str): Name of the dataset to be ingested.
+        source_archive (str): Local archive path or http(s) mirror URL; empty to download through the Kaggle API.
+        manifest_path (Path): Path of the manifest of extracted files.
+        extract_workers (int): Number of threads writing extracted files.
+        verify_hashes (bool): Flag indicating whether the intact check also compares SHA-256 hashes.
 
     Example Usage:
         # Instantiate ConfigDataIngest with necessary attributes
         ingest_config = ConfigDataIngest(
             data_folder=Path('/path/to/data/folder'),
-            dataset_name='username/dataset-name'
+            dataset_name='username/dataset-name',
+            source_archive='',
+            manifest_path=Path('/path/to/data/folder/ingest_manifest.json'),
+            extract_workers=8,
+            verify_hashes=False
         )
     """
     data_folder : Path
     dataset_name: str
+    source_archive: str
+    manifest_path: Path
+    extract_workers: int
+    verify_hashes: bool
+
+@dataclass(frozen=True)
+class DataSplitEntity:
+    """
+    Configuration data class for the "Data Split" stage in the ML pipeline.
+
+    Attributes:
+        root_dir (Path): Root directory for the split artifacts.
+        manifest_path (Path): Path to save the split manifest CSV.
+        training_data_path (Path): Path to the ingested dataset.
+        params_test_size (float): Fraction of every class assigned to the test split.
+        params_valid_size (float): Fraction of every class assigned to the validation split.
+        params_seed (int): Seed of the split assignment.
+        tfrecord_dir (Path): Directory of the per-split TFRecord shards and their index.
+        params_tfrecord_shards (int): Number of TFRecord shards written with the manifest, 0 to disable.
+        params_tfrecord_compression (str): Compression of the shards, "", "GZIP" or "ZLIB".
+
+    Example Usage:
+        # Instantiate DataSplitEntity with necessary attributes
+        data_split_entity = DataSplitEntity(
+            root_dir=Path('/path/to/data_split'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
+            training_data_path=Path('/path/to/training/data'),
+            params_test_size=0.2,
+            params_valid_size=0.2,
+            params_seed=42,
+            tfrecord_dir=Path('/path/to/data_split/tfrecords'),
+            params_tfrecord_shards=8,
+            params_tfrecord_compression='GZIP'
+        )
+    """
+    root_dir: Path
+    manifest_path: Path
+    training_data_path: Path
+    params_test_size: float
+    params_valid_size: float
+    params_seed: int
+    tfrecord_dir: Path
+    params_tfrecord_shards: int
+    params_tfrecord_compression: str
 
 @dataclass(frozen=True)
 class BaseModelGeneratorEntity:
@@ -28,34 +80,43 @@ class BaseModelGeneratorEntity:
     Attributes:
         base_model_path (Path): Path to save the base model.
         actual_model_path (Path): Path to save the actual model.
+        backbone_cache_dir (Path): Directory holding the cached backbone weights.
         CLASSES (int): Number of classes in the classification task.
         EPOCHS (int): Number of training epochs.
         BATCH_SIZE (int): Batch size for training.
         LR (float): Learning rate for model training.
         TEST_SIZE (float): Size of the test set.
         IMAGE_SIZE (list): List specifying the dimensions of input images.
+        BACKBONE (str): Backbone architecture, a key of BACKBONES.
+        HEAD (str): Classification head, "flatten" or "gap".
 
     Example Usage:
         # Instantiate BaseModelGeneratorEntity with necessary attributes
         base_model_entity = BaseModelGeneratorEntity(
             base_model_path=Path('/path/to/base/model'),
             actual_model_path=Path('/path/to/actual/model'),
+            backbone_cache_dir=Path('/path/to/backbone_cache'),
             CLASSES=10,
             EPOCHS=50,
             BATCH_SIZE=32,
             LR=0.001,
             TEST_SIZE=0.2,
-            IMAGE_SIZE=[224, 224, 3]
+            IMAGE_SIZE=[224, 224, 3],
+            BACKBONE='MobileNetV2',
+            HEAD='gap'
         )
     """
     base_model_path : Path
     actual_model_path : Path
+    backbone_cache_dir : Path
     CLASSES: int 
     EPOCHS: int
     BATCH_SIZE: int
     LR: float
     TEST_SIZE: float
     IMAGE_SIZE: list
+    BACKBONE: str
+    HEAD: str
 
 @dataclass(frozen=True)
 class CALLBACKSENTITY:
@@ -66,18 +127,45 @@ class CALLBACKSENTITY:
         root_dir (Path): Root directory for saving logs and checkpoints.
         tensorboard_log_dir (Path): Directory for saving TensorBoard logs.
         checkpoint_file_path (Path): Path to save the model checkpoint.
+        pruning_dir (Path): Directory where trials sharing a pruning run record their rung results.
+        params_early_stopping_patience (int): Epochs without val_loss improvement before training stops, 0 to disable.
+        params_reduce_lr_patience (int): Epochs without val_loss improvement before the learning rate is reduced, 0 to disable.
+        params_reduce_lr_factor (float): Factor the learning rate is multiplied by on a plateau.
+        params_pruning (bool): Whether to stop unpromising trials with successive halving.
+        params_pruning_min_epochs (int): Epoch of the first rung.
+        params_pruning_reduction_factor (int): Rung spacing and the fraction (1/factor) of trials kept at each rung.
+        params_profile_steps (list): [first, last) global training steps traced by the TF profiler, empty to disable.
+        trial_id (int): Identifier of the trial in the pruning run (the model number).
 
     Example Usage:
         # Instantiate CALLBACKSENTITY with necessary attributes
         callbacks_entity = CALLBACKSENTITY(
             root_dir=Path('/path/to/root/dir'),
             tensorboard_log_dir=Path('/path/to/tensorboard/logs'),
-            checkpoint_file_path=Path('/path/to/checkpoint/file')
+            checkpoint_file_path=Path('/path/to/checkpoint/file'),
+            pruning_dir=Path('/path/to/pruning/rungs'),
+            params_early_stopping_patience=3,
+            params_reduce_lr_patience=2,
+            params_reduce_lr_factor=0.2,
+            params_pruning=False,
+            params_pruning_min_epochs=1,
+            params_pruning_reduction_factor=3,
+            params_profile_steps=[20, 30],
+            trial_id=1
         )
     """
     root_dir: Path
     tensorboard_log_dir: Path
     checkpoint_file_path: Path 
+    pruning_dir: Path
+    params_early_stopping_patience: int
+    params_reduce_lr_patience: int
+    params_reduce_lr_factor: float
+    params_pruning: bool
+    params_pruning_min_epochs: int
+    params_pruning_reduction_factor: int
+    params_profile_steps: list
+    trial_id: int
 
 @dataclass(frozen=True)
 class TrainingEntity:
@@ -89,10 +177,29 @@ class TrainingEntity:
         actual_model_path (Path): Path to the actual model for training.
         trained_model_path (Path): Path to save the trained model.
         training_data_path (Path): Path to the training dataset.
+        manifest_path (Path): Path to the split manifest listing the training and validation images.
         params_epochs (int): Number of training epochs.
         params_batch_size (int): Batch size for training.
         params_is_augment (bool): Flag indicating whether data augmentation is enabled.
         params_image_size (list): List specifying the dimensions of input images.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_input_pipeline (str): Input pipeline used for training, "tf_data", "tfrecord" or "keras_generator".
+        params_cache_images (bool): Flag indicating whether the tf_data pipeline reads the decoded image cache.
+        image_cache_dir (Path): Directory holding the decoded image cache.
+        tfrecord_dir (Path): Directory of the TFRecord shards written by the data split stage, read by the "tfrecord" pipeline.
+        params_stream_manifest (bool): Flag indicating whether training streams the split manifest instead of the file lists.
+        params_shuffle_buffer (int): Number of rows the shuffle of the streaming pipelines draws from.
+        params_prefetch_batches (int): Number of batches the streaming pipelines prepare ahead, 0 for AUTOTUNE.
+        params_bottleneck_features (bool): Flag indicating whether a frozen backbone is run once and only the head is trained.
+        feature_cache_dir (Path): Directory holding the cached bottleneck features.
+        params_mixed_precision (bool): Flag indicating whether to train with the mixed_bfloat16 policy where supported.
+        params_jit_compile (bool): Flag indicating whether to XLA-compile the training step.
+        params_seed (int): Seed of the per-epoch shuffle of the training samples.
+        checkpoint_dir (Path): Directory holding the resumable training checkpoints.
+        params_checkpoint_every_epochs (int): Number of epochs between two resumable checkpoints.
+        params_checkpoint_keep (int): Number of most recent resumable checkpoints kept.
+        distribute_strategy (str): "none" for single-process training, "multi_worker_mirrored" for a TF_CONFIG cluster.
+        distribute_scale_lr (bool): Flag indicating whether the learning rate is scaled with the number of replicas.
         model_no (int): Model number or identifier.
 
     Example Usage:
@@ -102,10 +209,29 @@ class TrainingEntity:
             actual_model_path=Path('/path/to/actual/model'),
             trained_model_path=Path('/path/to/trained/model'),
             training_data_path=Path('/path/to/training/data'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
             params_epochs=50,
             params_batch_size=32,
             params_is_augment=True,
             params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_input_pipeline="tf_data",
+            params_cache_images=True,
+            image_cache_dir=Path('/path/to/image_cache'),
+            tfrecord_dir=Path('/path/to/tfrecords'),
+            params_stream_manifest=False,
+            params_shuffle_buffer=2048,
+            params_prefetch_batches=2,
+            params_bottleneck_features=True,
+            feature_cache_dir=Path('/path/to/features'),
+            params_mixed_precision=False,
+            params_jit_compile=False,
+            params_seed=42,
+            checkpoint_dir=Path('/path/to/checkpoints'),
+            params_checkpoint_every_epochs=1,
+            params_checkpoint_keep=2,
+            distribute_strategy="none",
+            distribute_scale_lr=True,
             model_no=1
         )
     """
@@ -113,12 +239,113 @@ class TrainingEntity:
     actual_model_path : Path
     trained_model_path: Path
     training_data_path: Path
+    manifest_path: Path
     params_epochs: int
     params_batch_size: int
     params_is_augment: bool
     params_image_size: list
+    params_resize_mode: str
+    params_input_pipeline: str
+    params_cache_images: bool
+    image_cache_dir: Path
+    tfrecord_dir: Path
+    params_stream_manifest: bool
+    params_shuffle_buffer: int
+    params_prefetch_batches: int
+    params_bottleneck_features: bool
+    feature_cache_dir: Path
+    params_mixed_precision: bool
+    params_jit_compile: bool
+    params_seed: int
+    checkpoint_dir: Path
+    params_checkpoint_every_epochs: int
+    params_checkpoint_keep: int
+    distribute_strategy: str
+    distribute_scale_lr: bool
     model_no: int
 
+@dataclass(frozen=True)
+class DistillationEntity:
+    """
+    Configuration data class for the "Distillation" stage in the ML pipeline.
+
+    Attributes:
+        root_dir (Path): Directory for the student model files and the distillation report.
+        student_model_path (Path): Path the untrained student model is saved to.
+        soft_label_dir (Path): Directory holding the memory-mapped soft labels of the teacher.
+        trained_model_path (Path): trained_model_path of the training stage; teacher and student files are derived from it.
+        training_data_path (Path): Path to the dataset the manifest paths are relative to.
+        manifest_path (Path): Path to the split manifest.
+        image_cache_dir (Path): Directory holding the decoded image cache.
+        params_distill (bool): Whether the stage trains a student.
+        params_student_backbone (str): Backbone of the student, a key of BACKBONES.
+        params_student_head (str): Classification head of the student, "flatten" or "gap".
+        params_epochs (int): Number of epochs the student is trained for.
+        params_batch_size (int): Batch size for training the student.
+        params_lr (float): Learning rate of the student.
+        params_temperature (float): Softmax temperature applied to teacher and student.
+        params_alpha (float): Weight of the hard-label loss; 1 - alpha weights the soft-label loss.
+        params_image_size (list): List specifying the dimensions of input images.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_is_augment (bool): Whether the student is trained on augmented images.
+        params_cache_images (bool): Flag indicating whether the decoded image cache is read.
+        params_early_stopping_patience (int): Epochs without validation improvement before the student stops, 0 to disable.
+        params_seed (int): Seed for shuffling and augmentation.
+        teacher_model_no (int): Model number of the teacher.
+        student_model_no (int): Model number the student is saved under.
+
+    Example Usage:
+        # Instantiate DistillationEntity with necessary attributes
+        distillation_entity = DistillationEntity(
+            root_dir=Path('artifacts/distillation'),
+            student_model_path=Path('artifacts/distillation/student_model.h5'),
+            soft_label_dir=Path('artifacts/distillation/soft_labels'),
+            trained_model_path=Path('artifacts/training/trained_model.h5'),
+            training_data_path=Path('/path/to/training/data'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
+            image_cache_dir=Path('/path/to/image_cache'),
+            params_distill=True,
+            params_student_backbone='MobileNetV2',
+            params_student_head='gap',
+            params_epochs=10,
+            params_batch_size=16,
+            params_lr=0.005,
+            params_temperature=4.0,
+            params_alpha=0.1,
+            params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_is_augment=True,
+            params_cache_images=True,
+            params_early_stopping_patience=3,
+            params_seed=42,
+            teacher_model_no=2,
+            student_model_no=3
+        )
+    """
+    root_dir: Path
+    student_model_path: Path
+    soft_label_dir: Path
+    trained_model_path: Path
+    training_data_path: Path
+    manifest_path: Path
+    image_cache_dir: Path
+    params_distill: bool
+    params_student_backbone: str
+    params_student_head: str
+    params_epochs: int
+    params_batch_size: int
+    params_lr: float
+    params_temperature: float
+    params_alpha: float
+    params_image_size: list
+    params_resize_mode: str
+    params_is_augment: bool
+    params_cache_images: bool
+    params_early_stopping_patience: int
+    params_seed: int
+    teacher_model_no: int
+    student_model_no: int
+
 @dataclass(frozen=True)
 class ModelEvaluationEntity:
     """
@@ -127,9 +354,19 @@ class ModelEvaluationEntity:
     Attributes:
         trained_model_path (Path): Path to the trained model for evaluation.
         training_data_path (Path): Path to the evaluation dataset.
+        manifest_path (Path): Path to the split manifest listing the held-out test images.
         all_params (dict): Dictionary containing all relevant parameters.
         params_batch_size (int): Batch size for evaluation.
         params_image_size (list): List specifying the dimensions of input images.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_input_pipeline (str): Input pipeline used for evaluation, "tf_data", "tfrecord" or "keras_generator".
+        params_cache_images (bool): Flag indicating whether the tf_data pipeline reads the decoded image cache.
+        image_cache_dir (Path): Directory holding the decoded image cache.
+        tfrecord_dir (Path): Directory of the TFRecord shards written by the data split stage, read by the "tfrecord" pipeline.
+        params_top_k (int): Largest k of the reported top-k accuracies.
+        params_eval_models (list or str): Model numbers to evaluate together, or a glob of trained model files;
+            empty to evaluate model_no only.
+        params_eval_workers (int): Threads running the models on each batch, 0 for one per model.
         model_no (int): Model number or identifier.
 
     Example Usage:
@@ -137,15 +374,279 @@ class ModelEvaluationEntity:
         model_eval_entity = ModelEvaluationEntity(
             trained_model_path=Path('/path/to/trained/model'),
             training_data_path=Path('/path/to/evaluation/data'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
             all_params={'key': 'value'},
             params_batch_size=32,
             params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_input_pipeline="tf_data",
+            params_cache_images=True,
+            image_cache_dir=Path('/path/to/image_cache'),
+            tfrecord_dir=Path('/path/to/tfrecords'),
+            params_top_k=3,
+            params_eval_models=[1, 2, 3],
+            params_eval_workers=0,
             model_no=1
         )
     """
     trained_model_path: Path
     training_data_path: Path
+    manifest_path: Path
     all_params: dict
     params_batch_size: int
     params_image_size: list
+    params_resize_mode: str
+    params_input_pipeline: str
+    params_cache_images: bool
+    image_cache_dir: Path
+    tfrecord_dir: Path
+    params_top_k: int
+    params_eval_models: list
+    params_eval_workers: int
+    model_no: int
+
+@dataclass(frozen=True)
+class ModelExportEntity:
+    """
+    Configuration data class for the "Model Export" stage in the ML pipeline.
+
+    Attributes:
+        root_dir (Path): Directory for the exported models and the export report.
+        trained_model_path (Path): trained_model_path of the training stage; the model file is derived from it.
+        training_data_path (Path): Path to the dataset the manifest paths are relative to.
+        manifest_path (Path): Path to the split manifest used for calibration and accuracy checks.
+        params_image_size (list): List specifying the dimensions of input images.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_quantization (str): TFLite quantization, one of "none", "dynamic" or "int8".
+        params_calibration_samples (int): Number of training images used to calibrate int8 quantization.
+        params_eval_samples (int): Number of test images used to compare the exported models.
+        params_weight_sparsity (float): Fraction of every kernel zeroed by magnitude pruning before the export, 0 to disable.
+        params_seed (int): Seed used to sample the calibration and evaluation images.
+        model_no (int): Model number or identifier.
+
+    Example Usage:
+        # Instantiate ModelExportEntity with necessary attributes
+        model_export_entity = ModelExportEntity(
+            root_dir=Path('/path/to/export'),
+            trained_model_path=Path('/path/to/trained/model'),
+            training_data_path=Path('/path/to/training/data'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
+            params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_quantization="int8",
+            params_calibration_samples=200,
+            params_eval_samples=500,
+            params_weight_sparsity=0.5,
+            params_seed=42,
+            model_no=1
+        )
+    """
+    root_dir: Path
+    trained_model_path: Path
+    training_data_path: Path
+    manifest_path: Path
+    params_image_size: list
+    params_resize_mode: str
+    params_quantization: str
+    params_calibration_samples: int
+    params_eval_samples: int
+    params_weight_sparsity: float
+    params_seed: int
     model_no: int
+
+@dataclass(frozen=True)
+class InferenceEntity:
+    """
+    Configuration data class for batch inference with a trained model.
+
+    Attributes:
+        trained_model_path (Path): trained_model_path of the training stage; the model file is derived from it.
+        manifest_path (Path): Path to the split manifest whose summary holds the class names.
+        output_path (Path): Default path of the predictions file.
+        params_image_size (list): List specifying the dimensions of input images.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_batch_size (int): Maximum number of images per inference batch.
+        params_top_k (int): Number of classes reported per image.
+        params_queue_size (int): Number of decoded batches buffered ahead of the model.
+        model_no (int): Model number or identifier.
+
+    Example Usage:
+        # Instantiate InferenceEntity with necessary attributes
+        inference_entity = InferenceEntity(
+            trained_model_path=Path('/path/to/trained/model'),
+            manifest_path=Path('/path/to/data_split/manifest.csv'),
+            output_path=Path('/path/to/predictions.csv'),
+            params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_batch_size=64,
+            params_top_k=3,
+            params_queue_size=4,
+            model_no=1
+        )
+    """
+    trained_model_path: Path
+    manifest_path: Path
+    output_path: Path
+    params_image_size: list
+    params_resize_mode: str
+    params_batch_size: int
+    params_top_k: int
+    params_queue_size: int
+    model_no: int
+
+@dataclass(frozen=True)
+class ServingEntity:
+    """
+    Configuration data class for the local HTTP inference server.
+
+    Attributes:
+        host (str): Interface the server binds to.
+        port (int): Port the server listens on.
+        params_max_batch_size (int): Largest micro-batch passed to the model.
+        params_max_wait_ms (float): Longest time a request waits for a micro-batch to fill.
+
+    Example Usage:
+        # Instantiate ServingEntity with necessary attributes
+        serving_entity = ServingEntity(
+            host='127.0.0.1',
+            port=8080,
+            params_max_batch_size=32,
+            params_max_wait_ms=10
+        )
+    """
+    host: str
+    port: int
+    params_max_batch_size: int
+    params_max_wait_ms: float
+
+@dataclass(frozen=True)
+class SweepEntity:
+    """
+    Configuration data class for the hyperparameter sweep.
+
+    Attributes:
+        root_dir (Path): Directory holding one sub-directory per trial.
+        leaderboard_path (Path): CSV file ranking the trials.
+        selection_path (Path): JSON file naming the fastest trial that reaches accuracy_bar.
+        strategy (str): "grid" for every combination of space, "random" for sampled trials.
+        trials (int): Number of sampled trials for the random strategy.
+        seed (int): Seed of the random strategy.
+        workers (int): Number of trials trained in parallel.
+        threads_per_trial (int): CPU cores pinned to each worker, 0 to split the cores evenly.
+        metric (str): Test-split score the leaderboard is sorted by.
+        pruning (bool): Whether trials prune each other with successive halving.
+        accuracy_bar (float): Test accuracy a trial needs to be selected.
+        space (dict): params.yaml keys mapped to their candidate values.
+
+    Example Usage:
+        # Instantiate SweepEntity with necessary attributes
+        sweep_entity = SweepEntity(
+            root_dir='artifacts/sweep',
+            leaderboard_path='artifacts/sweep/leaderboard.csv',
+            selection_path='artifacts/sweep/selection.json',
+            strategy='grid',
+            trials=8,
+            seed=42,
+            workers=2,
+            threads_per_trial=0,
+            metric='accuracy',
+            pruning=True,
+            accuracy_bar=0.9,
+            space={'LR': [0.001, 0.005], 'AUG': [True, False]}
+        )
+    """
+    root_dir: Path
+    leaderboard_path: Path
+    selection_path: Path
+    strategy: str
+    trials: int
+    seed: int
+    workers: int
+    threads_per_trial: int
+    metric: str
+    pruning: bool
+    accuracy_bar: float
+    space: dict
+
+
+@dataclass(frozen=True)
+class BenchmarkEntity:
+    """
+    Configuration data class for the benchmark suite.
+
+    Attributes:
+        root_dir (Path): Working directory of the benchmarks (manifest, image cache, exported models).
+        synthetic_data_dir (Path): Directory the synthetic class-per-folder dataset is generated in.
+        results_dir (Path): Directory the JSON results are written to, one file per run.
+        images_per_class (int): Number of synthetic images generated per class.
+        batch_sizes (list): Batch sizes the training step and inference throughput are measured at.
+        input_batches (int): Number of batches read from every input pipeline.
+        train_steps (int): Number of timed training steps per batch size.
+        latency_runs (int): Number of timed predictions per model format and batch size.
+        params_image_size (list): Input image size of the model.
+        params_resize_mode (str): How images are fitted to params_image_size: "stretch", "center_crop" or "letterbox".
+        params_classes (int): Number of classes of the model and of the synthetic dataset.
+        params_batch_size (int): Batch size of the input pipeline benchmarks.
+        params_lr (float): Learning rate of the benchmarked model.
+        params_freeze_all (bool): Whether the backbone of the benchmarked model is frozen.
+        params_backbone (str): Backbone of the benchmarked model.
+        params_head (str): Classification head of the benchmarked model.
+        params_weight_sparsity (float): Magnitude pruning applied before the export of the benchmarked model.
+        params_tfrecord_compression (str): Compression of the TFRecord shards of the synthetic dataset.
+        params_shuffle_buffer (int): Shuffle buffer of the streaming manifest pipeline in the memory benchmark.
+        params_prefetch_batches (int): Prefetch depth of the streaming manifest pipeline in the memory benchmark.
+        params_quantization (str): Quantization of the benchmarked TFLite model.
+        params_calibration_samples (int): Calibration images of the int8 TFLite model.
+        params_seed (int): Seed of the synthetic dataset, split and shuffling.
+
+    Example Usage:
+        # Instantiate BenchmarkEntity with necessary attributes
+        benchmark_entity = BenchmarkEntity(
+            root_dir='artifacts/benchmark',
+            synthetic_data_dir='artifacts/benchmark/synthetic_images',
+            results_dir='benchmark_results',
+            images_per_class=40,
+            batch_sizes=[8, 16, 32],
+            input_batches=30,
+            train_steps=10,
+            latency_runs=50,
+            params_image_size=[224, 224, 3],
+            params_resize_mode="stretch",
+            params_classes=8,
+            params_batch_size=16,
+            params_lr=0.005,
+            params_freeze_all=True,
+            params_backbone='ResNet152V2',
+            params_head='flatten',
+            params_weight_sparsity=0.0,
+            params_tfrecord_compression='',
+            params_shuffle_buffer=2048,
+            params_prefetch_batches=2,
+            params_quantization='int8',
+            params_calibration_samples=200,
+            params_seed=42
+        )
+    """
+    root_dir: Path
+    synthetic_data_dir: Path
+    results_dir: Path
+    images_per_class: int
+    batch_sizes: list
+    input_batches: int
+    train_steps: int
+    latency_runs: int
+    params_image_size: list
+    params_resize_mode: str
+    params_classes: int
+    params_batch_size: int
+    params_lr: float
+    params_freeze_all: bool
+    params_backbone: str
+    params_head: str
+    params_weight_sparsity: float
+    params_tfrecord_compression: str
+    params_shuffle_buffer: int
+    params_prefetch_batches: int
+    params_quantization: str
+    params_calibration_samples: int
+    params_seed: int
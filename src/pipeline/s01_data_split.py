@@ -0,0 +1,35 @@
+from src.config.configuration_manager import ConfigurationManager
+from src.components.data_split_component import DataSplitComponent
+class DataSplitPipeline:
+    """
+    DataSplitPipeline is a class designed to streamline the process of splitting the ingested dataset.
+    It uses the ConfigurationManager to retrieve the data split configuration,
+    instantiates the DataSplitComponent, and writes the split manifest (and the TFRecord shards when enabled).
+
+    Methods:
+        __init__(self): Constructor method to initialize the DataSplitPipeline.
+        main(self): Main method to execute the data split pipeline.
+
+    Example Usage:
+        # Instantiate DataSplitPipeline
+        data_split_pipeline = DataSplitPipeline()
+
+        # Execute the data split pipeline
+        data_split_pipeline.main()
+    """
+    def __init__(self):
+        """
+        Initializes the DataSplitPipeline.
+        """
+        pass  # No specific initialization is performed in this class.
+
+    def main(self):
+        """
+        Main method to execute the data split pipeline.
+        Retrieves data split configuration, instantiates DataSplitComponent,
+        and writes the split manifest.
+        """
+        cm_data_split = ConfigurationManager()
+        data_split_conf = cm_data_split.get_data_split_entity()
+        data_split_compo = DataSplitComponent(data_split_conf)
+        data_split_compo.write_manifest()
@@ -9,6 +9,7 @@ class IngestDataPipeline:
     Methods:
         __init__(self): Constructor method to initialize the IngestDataPipeline.
         main(self): Main method to execute the data ingestion pipeline.
+        is_intact(self) -> bool: Checks the extracted files against the ingest manifest.
 
     Example Usage:
         # Instantiate IngestDataPipeline
@@ -34,5 +35,16 @@ class IngestDataPipeline:
         ingest_data_compo = IngestDataComponent(ingest_data_conf)
         ingest_data_compo.download_data_from_source()
 
+    def is_intact(self) -> bool:
+        """
+        Checks the extracted files against the ingest manifest (size, and SHA-256 when verify_hashes is set),
+        so the stage runner re-runs the ingestion when a file was deleted or truncated.
+
+        Returns:
+            bool: True if the local copy matches the manifest.
+        """
+        ingest_data_conf = ConfigurationManager().get_ingest_data_config()
+        return IngestDataComponent(ingest_data_conf).is_intact()
+
         
 
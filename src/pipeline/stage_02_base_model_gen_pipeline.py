@@ -45,8 +45,8 @@ class BaseModelPipeline:
         base_model_componet = BaseModelGeneratorComponent(base_model_entity)
         base_model = base_model_componet.load_base_model()
         am = base_model_componet.actual_model(classes=self.params.CLASSES,
-            freeze_all=True,
-            freeze_till=0,
+            freeze_all=self.params.FREEZE_ALL,
+            freeze_till=self.params.FREEZE_TILL,
             learning_rate=self.params.LR)
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+from dataclasses import replace
+from src.config.configuration_manager import ConfigurationManager
+from src.components.stage_02_base_model_generator import BaseModelGeneratorComponent
+from src.components.distillation_component import DistillationComponent
+from src.logger import logging
+
+
+class DistillationPipeline:
+    """
+    DistillationPipeline is a class designed to distill the trained model into a compact student model.
+    It builds the student with the base model generator (STUDENT_BACKBONE and STUDENT_HEAD instead of BACKBONE and HEAD),
+    trains it against the cached soft labels of the teacher with the DistillationComponent and saves its report.
+    The stage does nothing unless DISTILL is set in params.yaml.
+
+    Methods:
+        main(self) -> None: Main method to execute the distillation pipeline.
+
+    Example Usage:
+        # Instantiate DistillationPipeline
+        distillation_pipeline = DistillationPipeline()
+
+        # Execute the distillation pipeline
+        distillation_pipeline.main()
+    """
+    def main(self) -> None:
+        """
+        Main method to execute the distillation pipeline.
+        Loads the teacher, caches its soft labels, builds and trains the student, and saves the distillation report.
+        """
+        cm = ConfigurationManager()
+        distillation_entity = cm.get_distillation_entity()
+        if not distillation_entity.params_distill:
+            logging.info("DISTILL is off, skipping the distillation stage")
+            return
+        distillation_component = DistillationComponent(distillation_entity)
+        distillation_component.load_teacher()
+        distillation_component.prepare_data()
+
+        student_entity = replace(cm.get_base_model_generator_entity(),
+                                 BACKBONE=distillation_entity.params_student_backbone,
+                                 HEAD=distillation_entity.params_student_head,
+                                 actual_model_path=distillation_entity.student_model_path)
+        student = BaseModelGeneratorComponent(student_entity).actual_model(
+            classes=len(distillation_component.class_names),
+            freeze_all=False,
+            freeze_till=0,
+            learning_rate=distillation_entity.params_lr)
+        student = distillation_component.distill(student)
+        distillation_component.save_report(student)
@@ -1,4 +1,5 @@
 import os 
+import shutil
 from src.config.configuration_manager import ConfigurationManager
 from src.components.stage_03_callbacks import CALLBACKSCOMPONENT
 from src.components.stage_04_model_training import TrainingComponent
@@ -38,18 +39,25 @@ class ModelTrainingPipeline():
         self.params = read_yaml(params_path)
         self.config = read_yaml(config_path)
     
-    def main():
+    def main(self):
         """
         Main method to execute the model training pipeline.
         Instantiates CALLBACKSCOMPONENT, TrainingComponent, and executes the training pipeline.
+        With pruning enabled, the rung results of earlier runs in pruning_dir are cleared first.
         """
         cm = ConfigurationManager()
+        # TrainingComponent creates the distribution strategy, which has to come before any other TensorFlow op
+        training_entity = cm.get_training_entity()
+        training_component = TrainingComponent(TrainingEntity= training_entity)
+
         callbacksentity = cm.get_callbacks_entity()
+        if callbacksentity.params_pruning and training_component.is_chief:
+            # rung results of earlier runs would make this run look worse than it is; sweep.py gives its trials
+            # a rung directory of their own and clears it when the sweep starts
+            shutil.rmtree(callbacksentity.pruning_dir, ignore_errors=True)
         callbacks_component = CALLBACKSCOMPONENT(callbacksentity)
         callback = callbacks_component.callbacks_list()
 
-        training_entity = cm.get_training_entity()
-        training_component = TrainingComponent(TrainingEntity= training_entity)
         training_component.test_train_split()
         training_component.train(callback_list=callback)
     
\ No newline at end of file
@@ -4,10 +4,14 @@ class ModelEvaluationPipeline:
     """
     ModelEvaluationPipeline is a class designed to streamline the process of evaluating a deep learning model.
     It uses the ConfigurationManager to retrieve model evaluation configuration, instantiates the ModelEvaluation component,
-    performs the evaluation, and saves the evaluation scores.
+    performs the evaluation, and saves the evaluation scores. Several trained models can be evaluated together in one
+    pass over the test split.
+
+    Attributes:
+        models (list or str): Model numbers or a glob of trained model files overriding EVAL_MODELS, or None.
 
     Methods:
-        __init__(self): Constructor method to initialize the ModelEvaluationPipeline.
+        __init__(self, models=None): Constructor method to initialize the ModelEvaluationPipeline.
         main(self) -> None: Main method to execute the model evaluation pipeline.
 
     Example Usage:
@@ -16,19 +20,27 @@ class ModelEvaluationPipeline:
 
         # Execute the model evaluation pipeline
         evaluation_pipeline.main()
+
+        # Compare every trained model in one pass
+        ModelEvaluationPipeline(models="trained_model_*.h5").main()
     """
-    def __init__(self):
+    def __init__(self, models=None):
         """
         Initializes the ModelEvaluationPipeline.
+
+        Args:
+            models (list or str): Model numbers or a glob such as "trained_model_*.h5"; defaults to EVAL_MODELS.
         """
-        pass # No specific initialization is performed in this class.
-    def main()->None:
+        self.models = models
+    def main(self)->None:
         """
         Main method to execute the model evaluation pipeline.
         Retrieves model evaluation configuration, instantiates ModelEvaluation component,
         performs the evaluation, and saves the evaluation scores.
         """
         cm = ConfigurationManager()
+        if self.models is not None:
+            cm.params.EVAL_MODELS = self.models
         model_eval_entity = cm.get_model_evaluation_entity()
         model_eval_component = ModelEvaluation(model_eval_entity)
         model_eval_component.evaluation()
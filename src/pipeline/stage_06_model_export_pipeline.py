@@ -0,0 +1,37 @@
+from src.config.configuration_manager import ConfigurationManager
+from src.components.stage_06_model_export_component import ModelExportComponent
+class ModelExportPipeline:
+    """
+    ModelExportPipeline is a class designed to streamline the process of exporting a trained model for serving.
+    It uses the ConfigurationManager to retrieve the model export configuration, instantiates the ModelExportComponent,
+    writes the SavedModel and TFLite models, and saves the comparison report.
+
+    Methods:
+        __init__(self): Constructor method to initialize the ModelExportPipeline.
+        main(self) -> None: Main method to execute the model export pipeline.
+
+    Example Usage:
+        # Instantiate ModelExportPipeline
+        export_pipeline = ModelExportPipeline()
+
+        # Execute the model export pipeline
+        export_pipeline.main()
+    """
+    def __init__(self):
+        """
+        Initializes the ModelExportPipeline.
+        """
+        pass # No specific initialization is performed in this class.
+
+    def main(self)->None:
+        """
+        Main method to execute the model export pipeline.
+        Retrieves model export configuration, instantiates ModelExportComponent,
+        exports the model and saves the comparison report.
+        """
+        cm = ConfigurationManager()
+        model_export_entity = cm.get_model_export_entity()
+        model_export_component = ModelExportComponent(model_export_entity)
+        model_export_component.export_saved_model()
+        model_export_component.export_tflite()
+        model_export_component.report()
@@ -0,0 +1,312 @@
+import os
+import re
+import json
+import hashlib
+import importlib
+from dataclasses import dataclass, fields
+from __init__ import config_path, params_path
+from src.logger import logging
+from src.config.configuration_manager import ConfigurationManager
+from src.utils.common import read_yaml, save_json, load_json, trained_model_file, eval_model_numbers
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """
+    Declaration of one pipeline stage for the StageRunner.
+
+    Attributes:
+        name (str): Stage name used in logs and for the lock file.
+        command (str): Subcommand of main.py that runs the stage alone.
+        pipeline (str): "module:Class" of the stage pipeline; imported only when the stage runs.
+        entities (tuple): ConfigurationManager getters the stage pipeline configures itself with; every field of the
+            entities they return is part of the fingerprint, so the keys never drift from what the stage reads.
+        deps (tuple): Upstream artifacts (files or directories) as path templates, or functions of the StageRunner
+            returning a list of paths for artifacts that depend on the parameters.
+        outs (tuple): Artifacts the stage produces, in the same form as deps.
+        code (tuple): Source files whose content is part of the fingerprint.
+        params_keys (tuple): params.yaml keys the stage pipeline reads directly rather than through its entities.
+        check (str): Optional method of the stage pipeline that verifies the outputs themselves, e.g. against a
+            manifest of their contents; the stage is only up to date when it returns True. Empty for none.
+
+    Path templates may reference dotted config.yaml keys and params.yaml keys in braces,
+    e.g. "{training.root_dir}/trained_model_{MODEL}.h5".
+    """
+    name: str
+    command: str
+    pipeline: str
+    entities: tuple
+    deps: tuple
+    outs: tuple
+    code: tuple
+    params_keys: tuple = ()
+    check: str = ""
+
+
+def _lookup(box, dotted_key: str):
+    value = box
+    for key in dotted_key.split("."):
+        value = value[key]
+    return value
+
+
+def _evaluated_numbers(runner) -> list:
+    try:
+        return eval_model_numbers(runner.config.training.trained_model_path, runner.params.EVAL_MODELS,
+                                  runner.params.MODEL)
+    except FileNotFoundError:
+        # nothing matches the EVAL_MODELS glob yet; the stage runs and reports it
+        return []
+
+
+def _evaluated_models(runner) -> list:
+    return [trained_model_file(runner.config.training.trained_model_path, number)
+            for number in _evaluated_numbers(runner)]
+
+
+def _evaluation_scores(runner) -> list:
+    scores_dir = os.path.join(os.path.dirname(runner.config.training.trained_model_path), "scores")
+    return [os.path.join(scores_dir, f"training_score_{number}.json")
+            for number in _evaluated_numbers(runner)]
+
+
+def _student_model(runner) -> list:
+    # the student is only written when DISTILL is set
+    if not runner.params.DISTILL:
+        return []
+    return [trained_model_file(runner.config.training.trained_model_path, runner.params.STUDENT_MODEL)]
+
+
+def _path_fingerprint(path: str) -> list:
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+    if os.path.isdir(path):
+        entries = []
+        for root, _, files in sorted(os.walk(path), key=lambda walk: walk[0]):
+            for fname in sorted(files):
+                stat = os.stat(os.path.join(root, fname))
+                entries.append([os.path.relpath(os.path.join(root, fname), path), stat.st_size, stat.st_mtime_ns])
+        return entries
+    return ["missing"]
+
+
+class StageRunner:
+    """
+    StageRunner is a class designed for running pipeline stages only when their inputs changed.
+    The fingerprint of a stage covers the entities it is configured with, the size and modification
+    time of its upstream artifacts, and the content of its source files. When the fingerprint matches the lock file
+    written by the last successful run, all outputs exist and the stage's own check (if any) passes, the stage is
+    skipped and its outputs are reused.
+
+    Attributes:
+        config (ConfigBox): Contents of config.yaml.
+        params (ConfigBox): Contents of params.yaml.
+        config_manager (ConfigurationManager): Builds the entities of the stages from the same files.
+        lock_dir (str): Directory holding one lock file per stage.
+
+    Methods:
+        __init__(self, config_path=config_path, params_path=params_path): Reads the configuration files.
+        resolve(self, template) -> str: Fills a path template from config.yaml and params.yaml.
+        paths(self, items) -> list: Resolves the deps or outs of a stage into paths.
+        fingerprint(self, stage) -> str: Computes the fingerprint of a stage's inputs.
+        is_up_to_date(self, stage) -> bool: Checks the lock file and the outputs of a stage.
+        run(self, stage, force=False) -> bool: Runs a stage unless it is up to date.
+
+    Example Usage:
+        runner = StageRunner()
+        for stage in STAGES:
+            runner.run(stage)
+    """
+    def __init__(self, config_path=config_path, params_path=params_path):
+        self.config = read_yaml(config_path)
+        self.params = read_yaml(params_path)
+        self.config_manager = ConfigurationManager(config_path=config_path, params_path=params_path)
+        self.lock_dir = self.config.stage_runner.lock_dir
+
+    def resolve(self, template: str) -> str:
+        """
+        Fills a path template from config.yaml (dotted keys) and params.yaml (top-level keys).
+
+        Args:
+            template (str): Path template, e.g. "{training.root_dir}/trained_model_{MODEL}.h5".
+
+        Returns:
+            str: The resolved path.
+        """
+        def _value(match):
+            key = match.group(1)
+            return str(self.params[key] if key in self.params else _lookup(self.config, key))
+        return re.sub(r"\{([^}]+)\}", _value, template)
+
+    def paths(self, items: tuple) -> list:
+        """
+        Resolves the deps or outs of a stage into paths.
+
+        Args:
+            items (tuple): Path templates and functions of the StageRunner returning lists of paths.
+
+        Returns:
+            list: The resolved paths.
+        """
+        paths = []
+        for item in items:
+            paths.extend(item(self) if callable(item) else [self.resolve(item)])
+        return paths
+
+    def _entity_values(self, getter: str) -> dict:
+        entity = getattr(self.config_manager, getter)()
+        return {field.name: getattr(entity, field.name) for field in fields(entity)}
+
+    def fingerprint(self, stage: StageSpec) -> str:
+        """
+        Computes the fingerprint of a stage's inputs.
+
+        Args:
+            stage (StageSpec): The stage.
+
+        Returns:
+            str: Hex digest of the stage inputs.
+        """
+        inputs = dict(
+            entities={getter: self._entity_values(getter) for getter in stage.entities},
+            params={key: self.params[key] for key in stage.params_keys},
+            deps={dep: _path_fingerprint(dep) for dep in self.paths(stage.deps)},
+            code={},
+        )
+        for path in stage.code:
+            with open(path, "rb") as source:
+                inputs["code"][path] = hashlib.sha256(source.read()).hexdigest()
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _lock_path(self, stage: StageSpec) -> str:
+        return os.path.join(self.lock_dir, f"{stage.name.lower().replace(' ', '_')}.json")
+
+    def is_up_to_date(self, stage: StageSpec) -> bool:
+        """
+        Checks whether a stage can be skipped.
+
+        Args:
+            stage (StageSpec): The stage.
+
+        Returns:
+            bool: True if the lock file matches the current fingerprint, every output exists and the check passes.
+        """
+        lock_path = self._lock_path(stage)
+        if not os.path.exists(lock_path):
+            return False
+        if load_json(lock_path).get("fingerprint") != self.fingerprint(stage):
+            return False
+        if not all(os.path.exists(out) for out in self.paths(stage.outs)):
+            return False
+        return not stage.check or getattr(self._pipeline(stage), stage.check)()
+
+    @staticmethod
+    def _pipeline(stage: StageSpec):
+        module_name, class_name = stage.pipeline.split(":")
+        return getattr(importlib.import_module(module_name), class_name)()
+
+    def run(self, stage: StageSpec, force: bool = False) -> bool:
+        """
+        Runs a stage unless it is up to date, and records its fingerprint after a successful run.
+
+        Args:
+            stage (StageSpec): The stage.
+            force (bool): Run even if the stage is up to date.
+
+        Returns:
+            bool: True if the stage ran, False if it was skipped.
+        """
+        if not force and self.is_up_to_date(stage):
+            logging.info(f"{stage.name} is up to date, reusing its outputs")
+            return False
+        logging.info(f"{stage.name} Started")
+        self._pipeline(stage).main()
+        # deps are fingerprinted after the run so outputs an earlier stage rewrote in this run are accounted for
+        os.makedirs(self.lock_dir, exist_ok=True)
+        save_json(values=dict(stage=stage.name, fingerprint=self.fingerprint(stage)), path=self._lock_path(stage))
+        logging.info(f"{stage.name} Ended")
+        return True
+
+
+STAGES = (
+    StageSpec(
+        name="Data Ingestion",
+        command="ingest",
+        pipeline="src.pipeline.s01_ingest_data:IngestDataPipeline",
+        entities=("get_ingest_data_config",),
+        deps=(),
+        outs=("{Ingest_Data.manifest_path}", "{training.training_data_path}"),
+        code=("src/components/ingest_data_component.py", "src/pipeline/s01_ingest_data.py"),
+        # a deleted or truncated image leaves the fingerprint unchanged; the ingest manifest catches it
+        check="is_intact",
+    ),
+    StageSpec(
+        name="Data Split",
+        command="split",
+        pipeline="src.pipeline.s01_data_split:DataSplitPipeline",
+        entities=("get_data_split_entity",),
+        deps=("{Ingest_Data.manifest_path}",),
+        outs=("{data_split.manifest_path}",),
+        code=("src/components/data_split_component.py", "src/pipeline/s01_data_split.py",
+              "src/utils/dataset_files.py", "src/utils/tfrecords.py"),
+    ),
+    StageSpec(
+        name="Base Model Generator",
+        command="base-model",
+        pipeline="src.pipeline.stage_02_base_model_gen_pipeline:BaseModelPipeline",
+        entities=("get_base_model_generator_entity",),
+        deps=(),
+        outs=("{base_model_generator.base_model_path}", "{base_model_generator.actual_model_path}"),
+        code=("src/components/stage_02_base_model_generator.py", "src/pipeline/stage_02_base_model_gen_pipeline.py",
+              "src/utils/model_profile.py"),
+        params_keys=("FREEZE_ALL", "FREEZE_TILL"),
+    ),
+    StageSpec(
+        name="Model Training",
+        command="train",
+        pipeline="src.pipeline.stage_04_model_training_pipeline:ModelTrainingPipeline",
+        entities=("get_training_entity", "get_callbacks_entity"),
+        deps=("{base_model_generator.actual_model_path}", "{data_split.manifest_path}"),
+        outs=("{training.root_dir}/trained_model_{MODEL}.h5",),
+        code=("src/components/stage_03_callbacks.py", "src/components/stage_04_model_training.py",
+              "src/pipeline/stage_04_model_training_pipeline.py", "src/utils/data_pipeline.py",
+              "src/utils/image_cache.py", "src/utils/feature_cache.py", "src/utils/precision.py",
+              "src/utils/distribute.py", "src/utils/preprocessing.py", "src/utils/tfrecords.py"),
+    ),
+    StageSpec(
+        name="Distillation",
+        command="distill",
+        pipeline="src.pipeline.stage_04_distillation_pipeline:DistillationPipeline",
+        # the student is built from the base model generator entity with the student backbone and head
+        entities=("get_distillation_entity", "get_base_model_generator_entity"),
+        deps=("{training.root_dir}/trained_model_{MODEL}.h5", "{data_split.manifest_path}"),
+        outs=(_student_model,),
+        code=("src/components/distillation_component.py", "src/pipeline/stage_04_distillation_pipeline.py",
+              "src/components/stage_02_base_model_generator.py", "src/utils/data_pipeline.py",
+              "src/utils/image_cache.py", "src/utils/feature_cache.py", "src/utils/model_profile.py",
+              "src/utils/preprocessing.py"),
+    ),
+    StageSpec(
+        name="Model Evaluation",
+        command="evaluate",
+        pipeline="src.pipeline.stage_05_model_evaluation_pipeline:ModelEvaluationPipeline",
+        entities=("get_model_evaluation_entity",),
+        deps=(_evaluated_models, "{data_split.manifest_path}"),
+        outs=(_evaluation_scores,),
+        code=("src/components/stage_05_model_evaluation_component.py",
+              "src/pipeline/stage_05_model_evaluation_pipeline.py", "src/utils/data_pipeline.py",
+              "src/utils/image_cache.py", "src/utils/metrics.py", "src/utils/preprocessing.py",
+              "src/utils/tfrecords.py"),
+    ),
+    StageSpec(
+        name="Model Export",
+        command="export",
+        pipeline="src.pipeline.stage_06_model_export_pipeline:ModelExportPipeline",
+        entities=("get_model_export_entity",),
+        deps=("{training.root_dir}/trained_model_{MODEL}.h5", "{data_split.manifest_path}"),
+        outs=("{model_export.root_dir}/export_report_{MODEL}.json",),
+        code=("src/components/stage_06_model_export_component.py", "src/pipeline/stage_06_model_export_pipeline.py",
+              "src/utils/data_pipeline.py", "src/utils/model_profile.py", "src/utils/preprocessing.py"),
+    ),
+)
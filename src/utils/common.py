@@ -1,4 +1,6 @@
 import os
+import re
+import glob
 import yaml 
 from box import ConfigBox
 import json
@@ -70,3 +72,66 @@ def write_yaml(values:dict, path:Path):
     """
     with open(path, 'w') as json_file:
         yaml.dump(values, json_file)
+
+def load_json(path:Path)-> dict:
+    """
+    Loads a JSON file into a dictionary.
+
+    Args:
+        path (Path): Path to the JSON file.
+
+    Returns:
+        dict: Contents of the JSON file.
+
+    Example Usage:
+        # Load a dictionary from a JSON file
+        values = load_json(Path('/path/to/file.json'))
+    """
+    with open(path, 'r') as json_file:
+        return json.load(json_file)
+
+def trained_model_file(trained_model_path:Path, model_no:int)-> str:
+    """
+    Returns the file the training stage saves model number model_no to.
+
+    Args:
+        trained_model_path (Path): trained_model_path from the training section of config.yaml.
+        model_no (int): Model number or identifier.
+
+    Returns:
+        str: Path to trained_model_{model_no}.h5 next to trained_model_path.
+
+    Example Usage:
+        # Path of model number 2
+        trained_model_file('artifacts/training/trained_model.h5', 2)
+    """
+    return os.path.join(os.path.dirname(trained_model_path), f"trained_model_{model_no}.h5")
+
+def eval_model_numbers(trained_model_path:Path, eval_models, model_no:int)-> list:
+    """
+    Resolves EVAL_MODELS into the numbers of the models to evaluate: a list of model numbers is used as is, a glob
+    (e.g. "trained_model_*.h5") is matched against the files next to trained_model_path, and an empty value selects
+    model_no only.
+
+    Args:
+        trained_model_path (Path): trained_model_path from the training section of config.yaml.
+        eval_models (list or str): EVAL_MODELS from params.yaml.
+        model_no (int): MODEL from params.yaml.
+
+    Returns:
+        list: Model numbers to evaluate.
+
+    Example Usage:
+        # Every trained model next to trained_model_path
+        eval_model_numbers('artifacts/training/trained_model.h5', 'trained_model_*.h5', 1)
+    """
+    if not eval_models:
+        return [model_no]
+    if isinstance(eval_models, str):
+        pattern = os.path.join(os.path.dirname(trained_model_path), eval_models)
+        matches = (re.fullmatch(r"trained_model_(\d+)\.h5", os.path.basename(path)) for path in glob.glob(pattern))
+        numbers = sorted(int(match.group(1)) for match in matches if match)
+        if not numbers:
+            raise FileNotFoundError(f"No trained model matches EVAL_MODELS {pattern!r}")
+        return numbers
+    return [int(number) for number in eval_models]
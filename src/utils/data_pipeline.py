@@ -0,0 +1,375 @@
+import os
+import csv
+import numpy as np
+import tensorflow as tf
+from src.utils.preprocessing import RESIZE_MODE, decode_and_resize, decode_bytes
+from src.utils.tfrecords import TFRECORD_READ_BUFFER, TFRECORD_CYCLE_LENGTH, read_tfrecord_index, parse_example
+from src.utils.dataset_files import SPLITS
+
+AUTOTUNE = tf.data.AUTOTUNE
+# manifest rows the streaming pipeline shuffles among, and batches it prepares ahead of the model
+SHUFFLE_BUFFER = 2048
+PREFETCH_BATCHES = 2
+
+
+def read_manifest(manifest_path: str, data_dir: str):
+    """
+    Reads the split manifest written by the data split stage.
+
+    Args:
+        manifest_path (str): Path to the manifest CSV (columns: path, label, class_name, split).
+        data_dir (str): Dataset root the manifest paths are relative to.
+
+    Returns:
+        tuple: (paths, labels, splits, class_names) with one entry per manifest row, in manifest order.
+
+    Example Usage:
+        paths, labels, splits, class_names = read_manifest('artifacts/data_split/manifest.csv',
+                                                           'artifacts/data/data/natural_images')
+    """
+    paths, labels, splits, class_names = [], [], [], {}
+    with open(manifest_path, newline="") as manifest_file:
+        for row in csv.DictReader(manifest_file):
+            label = int(row["label"])
+            paths.append(os.path.join(data_dir, row["path"]))
+            labels.append(label)
+            splits.append(row["split"])
+            class_names[label] = row["class_name"]
+    return paths, labels, splits, [class_names[label] for label in sorted(class_names)]
+
+
+def subset_indices(splits: list, subset: str) -> list:
+    """
+    Returns the manifest rows assigned to a split.
+
+    Args:
+        splits (list): Split assignment of every manifest row.
+        subset (str): One of 'train', 'valid' or 'test'.
+
+    Returns:
+        list: Row indices belonging to the subset.
+    """
+    if subset not in SPLITS:
+        raise ValueError(f"subset must be one of {SPLITS}, got {subset!r}")
+    return [index for index, split in enumerate(splits) if split == subset]
+
+
+def augmentation_layers(seed: int = None) -> tf.keras.Sequential:
+    """
+    Batched equivalent of the ImageDataGenerator augmentation used for training.
+    shear_range=0.2 is in degrees there, which is visually a no-op, so it is not reproduced.
+
+    Args:
+        seed (int): Optional seed for the random layers.
+
+    Returns:
+        tf.keras.Sequential: Augmentation model that operates on whole batches.
+    """
+    return tf.keras.Sequential([
+        tf.keras.layers.RandomFlip("horizontal", seed=seed),
+        tf.keras.layers.RandomRotation(40 / 360, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomTranslation(0.2, 0.2, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomZoom(0.2, fill_mode="nearest", seed=seed),
+    ], name="augmentation")
+
+
+def _augment_and_prefetch(dataset: tf.data.Dataset, augment: bool, seed: int, prefetch: int = AUTOTUNE) -> tf.data.Dataset:
+    if augment:
+        augmentation = augmentation_layers(seed)
+        dataset = dataset.map(lambda images, targets: (augmentation(images, training=True), targets),
+                              num_parallel_calls=AUTOTUNE)
+    return dataset.prefetch(prefetch or AUTOTUNE)
+
+
+def _epoch_shuffled(items: list, labels: list, seed: int, initial_epoch: int, per_epoch) -> tf.data.Dataset:
+    """
+    Repeats (item, label) pairs endlessly in a new order every epoch. The order of epoch e depends only on
+    (seed, e), so a run resumed at the start of epoch e reads exactly the batches an uninterrupted run would.
+
+    Args:
+        items (list): Paths or cache rows.
+        labels (list): Integer labels aligned with items.
+        seed (int): Shuffle seed.
+        initial_epoch (int): First epoch produced.
+        per_epoch (callable): Applied to the dataset of each epoch, e.g. to batch it without crossing epochs.
+
+    Returns:
+        tf.data.Dataset: Infinite dataset; epoch e ends after ceil(len(items) / batch_size) batches.
+    """
+    items, labels = tf.constant(items), tf.constant(labels)
+
+    def _epoch(epoch):
+        order = tf.random.experimental.stateless_shuffle(tf.range(tf.shape(labels)[0]),
+                                                         seed=tf.stack([tf.constant(seed, tf.int64), epoch]))
+        return per_epoch(tf.data.Dataset.from_tensor_slices((tf.gather(items, order), tf.gather(labels, order))))
+
+    return tf.data.Dataset.range(initial_epoch, 2 ** 31).flat_map(_epoch)
+
+
+def build_dataset(paths: list, labels: list, num_classes: int, image_size: list,
+                  batch_size: int, augment: bool = False, shuffle: bool = False,
+                  seed: int = None, initial_epoch: int = 0, resize_mode: str = RESIZE_MODE) -> tf.data.Dataset:
+    """
+    Builds a parallel tf.data input pipeline: decode and resize with AUTOTUNE parallelism,
+    rescale to [0, 1], batch, optionally augment whole batches, and prefetch.
+
+    Args:
+        paths (list): Image paths.
+        labels (list): Integer labels aligned with paths.
+        num_classes (int): Number of classes used for the one-hot labels.
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        batch_size (int): Batch size.
+        augment (bool): Whether to apply the training augmentation.
+        shuffle (bool): Whether to reshuffle the samples every epoch. A shuffled dataset repeats endlessly
+            (see _epoch_shuffled), so fit needs steps_per_epoch.
+        seed (int): Optional seed for shuffling and augmentation.
+        initial_epoch (int): Epoch a shuffled dataset starts at, when resuming a run.
+        resize_mode (str): How images are fitted to image_size, one of RESIZE_MODES (see resize_images).
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, one_hot_labels) batches.
+
+    Example Usage:
+        dataset = build_dataset(paths, labels, num_classes=8, image_size=[224, 224, 3], batch_size=16)
+    """
+    def _load(path, label):
+        image = decode_and_resize(path, image_size, resize_mode) / 255.0
+        return image, tf.one_hot(label, num_classes)
+
+    def _load_and_batch(dataset):
+        return dataset.map(_load, num_parallel_calls=AUTOTUNE).batch(batch_size)
+
+    if shuffle:
+        dataset = _epoch_shuffled(list(paths), list(labels), seed or 0, initial_epoch, _load_and_batch)
+    else:
+        dataset = _load_and_batch(tf.data.Dataset.from_tensor_slices((list(paths), list(labels))))
+    return _augment_and_prefetch(dataset, augment, seed)
+
+
+def cached_dataset(cache: np.ndarray, indices: list, labels: list, num_classes: int,
+                   batch_size: int, augment: bool = False, shuffle: bool = False,
+                   seed: int = None, scale: float = 1 / 255.0, initial_epoch: int = 0) -> tf.data.Dataset:
+    """
+    Builds a tf.data input pipeline over a memory-mapped array cache. Only the rows of
+    each batch are copied out of the mapping; nothing is decoded or resized.
+
+    Args:
+        cache (np.ndarray): Memory-mapped array of shape (N, ...), e.g. the uint8 images from
+            load_image_cache or the backbone features from load_feature_cache.
+        indices (list): Rows of the cache to read.
+        labels (list): Integer labels aligned with indices.
+        num_classes (int): Number of classes used for the one-hot labels.
+        batch_size (int): Batch size.
+        augment (bool): Whether to apply the training augmentation.
+        shuffle (bool): Whether to reshuffle the samples every epoch. A shuffled dataset repeats endlessly
+            (see _epoch_shuffled), so fit needs steps_per_epoch.
+        seed (int): Optional seed for shuffling and augmentation.
+        scale (float): Factor applied after casting the rows to float32 (1/255 for uint8 images).
+        initial_epoch (int): Epoch a shuffled dataset starts at, when resuming a run.
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, one_hot_labels) batches.
+    """
+    rows = np.asarray(indices, dtype=np.int64)
+    if shuffle:
+        dataset = _epoch_shuffled(rows, list(labels), seed or 0, initial_epoch,
+                                  lambda epoch_dataset: epoch_dataset.batch(batch_size))
+    else:
+        dataset = tf.data.Dataset.from_tensor_slices((rows, list(labels))).batch(batch_size)
+
+    def _load(batch_indices, batch_labels):
+        images = tf.numpy_function(lambda rows: cache[rows], [batch_indices], tf.as_dtype(cache.dtype))
+        images.set_shape([None, *cache.shape[1:]])
+        return tf.cast(images, tf.float32) * scale, tf.one_hot(batch_labels, num_classes)
+
+    dataset = dataset.map(_load, num_parallel_calls=AUTOTUNE)
+    return _augment_and_prefetch(dataset, augment, seed)
+
+
+def tfrecord_dataset(tfrecord_dir: str, subset: str, num_classes: int, image_size: list, batch_size: int,
+                     augment: bool = False, shuffle: bool = False, seed: int = None, resize_mode: str = RESIZE_MODE,
+                     shuffle_buffer: int = SHUFFLE_BUFFER, prefetch: int = AUTOTUNE) -> tf.data.Dataset:
+    """
+    Builds the dataset of a subset from the TFRecord shards written by the data split stage. Only the shards of the
+    subset are read, with a parallel interleave in large sequential reads, and the images are decoded and resized
+    in parallel.
+
+    Args:
+        tfrecord_dir (str): Directory of the shards and their index.
+        subset (str): One of 'train', 'valid' or 'test'.
+        num_classes (int): Number of classes used for the one-hot labels.
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        batch_size (int): Batch size.
+        augment (bool): Whether to apply the training augmentation.
+        shuffle (bool): Whether to shuffle the shard order and the records (within shuffle_buffer) every epoch.
+            A shuffled dataset repeats endlessly, so fit needs steps_per_epoch.
+        seed (int): Optional seed for shuffling and augmentation.
+        resize_mode (str): How images are fitted to image_size, one of RESIZE_MODES.
+        shuffle_buffer (int): Number of records the shuffle draws from; every record holds an encoded image.
+        prefetch (int): Number of batches prepared ahead of the model, 0 or AUTOTUNE to let tf.data decide.
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, one_hot_labels) batches.
+
+    Example Usage:
+        dataset = tfrecord_dataset('artifacts/data_split/tfrecords', 'train',
+                                   num_classes=8, image_size=[224, 224, 3], batch_size=16, shuffle=True)
+    """
+    if subset not in SPLITS:
+        raise ValueError(f"subset must be one of {SPLITS}, got {subset!r}")
+    index = read_tfrecord_index(tfrecord_dir)
+    if subset not in index["splits"]:
+        raise ValueError(f"{tfrecord_dir} holds no {subset} records; run the data split stage again")
+    files = [os.path.join(tfrecord_dir, shard["file"]) for shard in index["splits"][subset]["shards"]]
+
+    dataset = tf.data.Dataset.from_tensor_slices(files)
+    if shuffle:
+        dataset = dataset.shuffle(len(files), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.interleave(
+        lambda shard: tf.data.TFRecordDataset(shard, compression_type=index["compression"],
+                                              buffer_size=TFRECORD_READ_BUFFER),
+        cycle_length=min(len(files), TFRECORD_CYCLE_LENGTH),
+        num_parallel_calls=AUTOTUNE,
+        deterministic=not shuffle)
+    if shuffle:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True).repeat()
+
+    def _load(serialized):
+        _, label, image_bytes = parse_example(serialized)
+        image = decode_bytes(image_bytes, image_size, resize_mode) / 255.0
+        return image, tf.one_hot(label, num_classes)
+
+    dataset = dataset.map(_load, num_parallel_calls=AUTOTUNE).batch(batch_size)
+    return _augment_and_prefetch(dataset, augment, seed, prefetch)
+
+
+def manifest_dataset(manifest_path: str, data_dir: str, subset: str, num_classes: int, image_size: list,
+                     batch_size: int, augment: bool = False, shuffle: bool = False, seed: int = None,
+                     resize_mode: str = RESIZE_MODE, shuffle_buffer: int = SHUFFLE_BUFFER,
+                     prefetch: int = PREFETCH_BATCHES) -> tf.data.Dataset:
+    """
+    Builds the dataset of a subset by streaming the split manifest, so its memory does not grow with the number of
+    images: the manifest rows are read from the CSV file inside the pipeline (no file list is built in Python or
+    embedded in the graph), the shuffle draws from shuffle_buffer rows (paths and labels, not images), and at most
+    prefetch decoded batches wait for the model.
+
+    Args:
+        manifest_path (str): Path to the manifest CSV (columns: path, label, class_name, split).
+        data_dir (str): Dataset root the manifest paths are relative to.
+        subset (str): One of 'train', 'valid' or 'test'.
+        num_classes (int): Number of classes used for the one-hot labels.
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        batch_size (int): Batch size.
+        augment (bool): Whether to apply the training augmentation.
+        shuffle (bool): Whether to shuffle the rows within shuffle_buffer every epoch. A shuffled dataset repeats
+            endlessly, so fit needs steps_per_epoch.
+        seed (int): Optional seed for shuffling and augmentation.
+        resize_mode (str): How images are fitted to image_size, one of RESIZE_MODES.
+        shuffle_buffer (int): Number of manifest rows the shuffle draws from.
+        prefetch (int): Number of batches prepared ahead of the model, 0 or AUTOTUNE to let tf.data decide.
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, one_hot_labels) batches.
+
+    Example Usage:
+        dataset = manifest_dataset('artifacts/data_split/manifest.csv', 'artifacts/data/data/natural_images',
+                                   'train', num_classes=8, image_size=[224, 224, 3], batch_size=16, shuffle=True)
+    """
+    if subset not in SPLITS:
+        raise ValueError(f"subset must be one of {SPLITS}, got {subset!r}")
+    rows = tf.data.experimental.CsvDataset(manifest_path, record_defaults=[tf.string, tf.int64, tf.string],
+                                           header=True, select_cols=[0, 1, 3])
+    rows = rows.filter(lambda path, label, split: tf.equal(split, subset))
+    if shuffle:
+        rows = rows.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True).repeat()
+    prefix = os.path.join(data_dir, "")
+
+    def _load(path, label, split):
+        image = decode_and_resize(tf.strings.join([prefix, path]), image_size, resize_mode) / 255.0
+        return image, tf.one_hot(label, num_classes)
+
+    dataset = rows.map(_load, num_parallel_calls=AUTOTUNE).batch(batch_size)
+    return _augment_and_prefetch(dataset, augment, seed, prefetch)
+
+
+def make_dataset(paths: list, labels: list, indices: list, cache: np.ndarray = None,
+                 **dataset_kwargs) -> tf.data.Dataset:
+    """
+    Builds the dataset for a subset of the file list, reading from the image cache when one is given
+    and decoding the image files otherwise.
+
+    Args:
+        paths (list): Image paths as returned by read_manifest.
+        labels (list): Integer labels aligned with paths.
+        indices (list): Indices of the subset to read.
+        cache (np.ndarray): Optional memory-mapped cache aligned with paths.
+        **dataset_kwargs: num_classes, image_size, batch_size, augment, shuffle, seed, initial_epoch and
+            resize_mode (and scale when reading a cache, whose images are already resized).
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, one_hot_labels) batches.
+    """
+    subset_labels = [labels[index] for index in indices]
+    if cache is not None:
+        dataset_kwargs.pop("image_size", None)
+        dataset_kwargs.pop("resize_mode", None)
+        return cached_dataset(cache, indices, subset_labels, **dataset_kwargs)
+    return build_dataset([paths[index] for index in indices], subset_labels, **dataset_kwargs)
+
+
+def soft_target_dataset(paths: list, labels: list, indices: list, soft_targets: np.ndarray, num_classes: int,
+                        image_size: list, batch_size: int, cache: np.ndarray = None, augment: bool = False,
+                        shuffle: bool = False, seed: int = None, resize_mode: str = RESIZE_MODE) -> tf.data.Dataset:
+    """
+    Builds the dataset of a subset whose targets carry per-sample soft labels (e.g. the predictions of a teacher
+    model) next to the one-hot labels. Only the soft label rows of each batch are copied out of soft_targets.
+
+    Args:
+        paths (list): Image paths as returned by read_manifest.
+        labels (list): Integer labels aligned with paths.
+        indices (list): Indices of the subset to read.
+        soft_targets (np.ndarray): Array of shape (len(indices), num_classes); row i belongs to paths[indices[i]].
+        num_classes (int): Number of classes used for the one-hot labels.
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        batch_size (int): Batch size.
+        cache (np.ndarray): Optional memory-mapped image cache aligned with paths.
+        augment (bool): Whether to apply the training augmentation.
+        shuffle (bool): Whether to reshuffle the samples every epoch. A shuffled dataset repeats endlessly
+            (see _epoch_shuffled), so fit needs steps_per_epoch.
+        seed (int): Optional seed for shuffling and augmentation.
+        resize_mode (str): How images are fitted to image_size when they are decoded, one of RESIZE_MODES.
+
+    Returns:
+        tf.data.Dataset: Dataset yielding (images, targets) batches, targets being the one-hot labels
+            concatenated with the soft labels, shape (batch, 2 * num_classes).
+    """
+    rows = np.asarray(indices, dtype=np.int64)
+    subset_paths = tf.constant([paths[index] for index in indices])
+
+    def _read_batch(dataset):
+        if cache is not None:
+            def _load(positions, batch_labels):
+                images = tf.numpy_function(lambda positions: cache[rows[positions]], [positions], tf.uint8)
+                images.set_shape([None, *cache.shape[1:]])
+                return tf.cast(images, tf.float32) / 255.0, positions, batch_labels
+            return dataset.batch(batch_size).map(_load, num_parallel_calls=AUTOTUNE)
+
+        def _decode(position, label):
+            return decode_and_resize(subset_paths[position], image_size, resize_mode) / 255.0, position, label
+        return dataset.map(_decode, num_parallel_calls=AUTOTUNE).batch(batch_size)
+
+    positions = np.arange(len(rows), dtype=np.int64)
+    subset_labels = [labels[index] for index in indices]
+    if shuffle:
+        dataset = _epoch_shuffled(positions, subset_labels, seed or 0, 0, _read_batch)
+    else:
+        dataset = _read_batch(tf.data.Dataset.from_tensor_slices((positions, subset_labels)))
+
+    def _targets(images, batch_positions, batch_labels):
+        soft = tf.numpy_function(lambda positions: np.asarray(soft_targets[positions], dtype=np.float32),
+                                 [batch_positions], tf.float32)
+        soft.set_shape([None, num_classes])
+        return images, tf.concat([tf.one_hot(batch_labels, num_classes), soft], axis=-1)
+
+    dataset = dataset.map(_targets, num_parallel_calls=AUTOTUNE)
+    return _augment_and_prefetch(dataset, augment, seed)
@@ -0,0 +1,33 @@
+import os
+from src.logger import logging
+
+# same white list ImageDataGenerator.flow_from_directory uses
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".ppm", ".tif", ".tiff")
+SPLITS = ("train", "valid", "test")
+
+
+def list_image_files(directory: str):
+    """
+    Lists the images of a class-per-folder dataset in the same order as flow_from_directory.
+    Only the standard library is used, so stages that just list files do not load TensorFlow.
+
+    Args:
+        directory (str): Root folder containing one sub folder per class.
+
+    Returns:
+        tuple: (paths, labels, class_names) where labels index into the sorted class_names.
+
+    Example Usage:
+        paths, labels, class_names = list_image_files('artifacts/data/data/natural_images')
+    """
+    class_names = sorted(entry.name for entry in os.scandir(directory) if entry.is_dir())
+    paths, labels = [], []
+    for label, class_name in enumerate(class_names):
+        class_dir = os.path.join(directory, class_name)
+        for root, _, files in sorted(os.walk(class_dir), key=lambda walk: walk[0]):
+            for fname in sorted(files):
+                if fname.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(root, fname))
+                    labels.append(label)
+    logging.info(f"Found {len(paths)} images belonging to {len(class_names)} classes in {directory}")
+    return paths, labels, class_names
@@ -0,0 +1,108 @@
+import os
+import json
+import tensorflow as tf
+from src.logger import logging
+
+STRATEGIES = ("none", "multi_worker_mirrored")
+
+
+def cluster_tf_config(workers: list, task_index: int) -> str:
+    """
+    Builds the TF_CONFIG of one worker of a MultiWorkerMirroredStrategy cluster.
+
+    Args:
+        workers (list): "host:port" of every worker; worker 0 is the chief.
+        task_index (int): Index of this worker in workers.
+
+    Returns:
+        str: JSON for the TF_CONFIG environment variable.
+    """
+    return json.dumps(dict(cluster=dict(worker=list(workers)), task=dict(type="worker", index=int(task_index))))
+
+
+def get_strategy(strategy: str) -> tf.distribute.Strategy:
+    """
+    Returns the distribution strategy to train with. It has to be created before any other TensorFlow op runs.
+    "multi_worker_mirrored" reads the cluster from TF_CONFIG (see cluster_tf_config); without TF_CONFIG it runs
+    as a single-worker cluster. "none" returns the default single-device strategy.
+
+    Args:
+        strategy (str): distributed.strategy from config.yaml.
+
+    Returns:
+        tf.distribute.Strategy: The strategy.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"distributed.strategy must be one of {STRATEGIES}, got {strategy!r}")
+    if strategy == "none":
+        return tf.distribute.get_strategy()
+    communication = tf.distribute.experimental.CommunicationOptions(
+        implementation=tf.distribute.experimental.CommunicationImplementation.RING)
+    multi_worker = tf.distribute.MultiWorkerMirroredStrategy(communication_options=communication)
+    logging.info(f"MultiWorkerMirroredStrategy with {multi_worker.num_replicas_in_sync} replicas, "
+                 f"task {task_identity(multi_worker)}")
+    return multi_worker
+
+
+def task_identity(strategy: tf.distribute.Strategy) -> tuple:
+    """
+    Returns the (task_type, task_id) of this process, (None, None) outside a cluster.
+    """
+    resolver = getattr(strategy, "cluster_resolver", None)
+    if resolver is None:
+        return None, None
+    return resolver.task_type, resolver.task_id
+
+
+def is_chief(strategy: tf.distribute.Strategy) -> bool:
+    """
+    Checks whether this process writes the shared outputs (model, history, checkpoints).
+    The chief is the "chief" task, or worker 0 of a cluster without one.
+
+    Args:
+        strategy (tf.distribute.Strategy): The training strategy.
+
+    Returns:
+        bool: True for the chief and outside a cluster.
+    """
+    task_type, task_id = task_identity(strategy)
+    if task_type is None or task_type == "chief":
+        return True
+    cluster = strategy.cluster_resolver.cluster_spec().as_dict()
+    return task_type == "worker" and task_id == 0 and "chief" not in cluster
+
+
+def worker_dir(path: str, strategy: tf.distribute.Strategy) -> str:
+    """
+    Returns path for the chief, and a per-worker scratch directory under it for the other workers, which take part
+    in every collective save but must not overwrite the chief's files.
+    """
+    if is_chief(strategy):
+        return path
+    task_type, task_id = task_identity(strategy)
+    return os.path.join(path, f"scratch_{task_type}_{task_id}")
+
+
+def broadcast_from_chief(strategy: tf.distribute.Strategy, value: int) -> int:
+    """
+    Returns the chief's value on every worker of a cluster, e.g. the epoch the chief resumes at. This is a collective
+    operation, so every worker has to call it; outside a cluster the value is returned as is.
+
+    Args:
+        strategy (tf.distribute.Strategy): The training strategy.
+        value (int): The value of this worker; only the chief's is kept.
+
+    Returns:
+        int: The chief's value.
+    """
+    if task_identity(strategy)[0] is None:
+        return value
+    # the replicas of the chief share its value, the other workers contribute nothing to the sum
+    share = float(value) / len(strategy.extended.worker_devices) if is_chief(strategy) else 0.0
+
+    @tf.function
+    def _share():
+        return tf.constant(share, tf.float32)
+
+    total = strategy.reduce(tf.distribute.ReduceOp.SUM, strategy.run(_share), axis=None)
+    return int(round(float(total.numpy())))
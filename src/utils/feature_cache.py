@@ -0,0 +1,119 @@
+import os
+import glob
+import hashlib
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import create_dirs
+from src.utils.image_cache import dataset_fingerprint
+from src.utils.preprocessing import RESIZE_MODE
+
+# layers that start the classification head on top of the backbone
+HEAD_START_LAYERS = (tf.keras.layers.Flatten, tf.keras.layers.GlobalAveragePooling2D)
+
+
+def _head_start(model: tf.keras.Model) -> int:
+    for index, layer in enumerate(model.layers):
+        if isinstance(layer, HEAD_START_LAYERS):
+            return index
+    raise ValueError(f"{model.name} has no {[layer.__name__ for layer in HEAD_START_LAYERS]} head")
+
+
+def backbone_is_frozen(model: tf.keras.Model) -> bool:
+    """
+    Checks whether every layer below the classification head is frozen.
+
+    Args:
+        model (tf.keras.Model): Model built by the base model generator stage.
+
+    Returns:
+        bool: True if the backbone has no trainable weights.
+    """
+    return not any(layer.trainable_weights for layer in model.layers[:_head_start(model)])
+
+
+def split_frozen_backbone(model: tf.keras.Model):
+    """
+    Splits a model into the backbone feature extractor and the classification head.
+    The head reuses the layers of model, so training it updates model as well.
+
+    Args:
+        model (tf.keras.Model): Model built by the base model generator stage.
+
+    Returns:
+        tuple: (feature_model, head_model) where head_model takes the backbone output as input.
+    """
+    head_start = _head_start(model)
+    feature_model = tf.keras.Model(inputs=model.input, outputs=model.layers[head_start].input)
+    features = tf.keras.Input(shape=feature_model.output_shape[1:])
+    outputs = features
+    for layer in model.layers[head_start:]:
+        outputs = layer(outputs)
+    head_model = tf.keras.Model(inputs=features, outputs=outputs)
+    return feature_model, head_model
+
+
+def _weights_digest(model: tf.keras.Model) -> str:
+    digest = hashlib.sha256()
+    for weight in model.get_weights():
+        digest.update(np.ascontiguousarray(weight).tobytes())
+    return digest.hexdigest()
+
+
+def _cache_prefix(feature_model: tf.keras.Model, image_size: list, resize_mode: str) -> str:
+    # the shapes of the weights and of the output identify the architecture, whatever the weights hold
+    shapes = [tuple(weight.shape) for weight in feature_model.weights] + [tuple(feature_model.output_shape[1:])]
+    architecture = hashlib.sha256(repr(shapes).encode()).hexdigest()[:12]
+    return f"features_{int(image_size[0])}x{int(image_size[1])}_{resize_mode}_{architecture}_"
+
+
+def load_feature_cache(feature_model: tf.keras.Model, dataset: tf.data.Dataset, paths: list,
+                       image_size: list, cache_dir: str, resize_mode: str = RESIZE_MODE) -> np.ndarray:
+    """
+    Returns the backbone output of every image as a read-only memory-mapped float32 array,
+    running the backbone over dataset once if no cache exists for these images and weights.
+    Building a cache removes the caches of the same architecture, image size and resize mode it supersedes.
+
+    Args:
+        feature_model (tf.keras.Model): Frozen backbone from split_frozen_backbone.
+        dataset (tf.data.Dataset): Unshuffled, unaugmented (images, labels) batches aligned with paths.
+        paths (list): Image paths; row i of the returned array belongs to paths[i].
+        image_size (list): Image size the dataset was resized to.
+        cache_dir (str): Directory holding the feature cache files.
+        resize_mode (str): How the dataset fitted the images to image_size, one of RESIZE_MODES.
+
+    Returns:
+        np.ndarray: Memory-mapped array of shape (len(paths), *feature_model.output_shape[1:]).
+
+    Example Usage:
+        feature_model, head_model = split_frozen_backbone(model)
+        features = load_feature_cache(feature_model, dataset, paths, [224, 224, 3], 'artifacts/training/features')
+    """
+    key = hashlib.sha256(
+        f"{dataset_fingerprint(paths, image_size, resize_mode, hash_dir=cache_dir)}:{_weights_digest(feature_model)}".encode()
+    ).hexdigest()[:20]
+    prefix = _cache_prefix(feature_model, image_size, resize_mode)
+    cache_path = os.path.join(cache_dir, f"{prefix}{key}.npy")
+    if os.path.exists(cache_path):
+        logging.info(f"Using feature cache {cache_path}")
+        return np.load(cache_path, mmap_mode="r")
+
+    logging.info(f"Building feature cache {cache_path} for {len(paths)} images")
+    create_dirs([cache_path])
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    features = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32,
+                                         shape=(len(paths), *feature_model.output_shape[1:]))
+    row = 0
+    for images, _ in dataset:
+        batch_features = feature_model.predict_on_batch(images)
+        features[row:row + len(batch_features)] = batch_features
+        row += len(batch_features)
+    features.flush()
+    del features
+    os.replace(tmp_path, cache_path)
+    # caches of the same architecture for older versions of the images or weights are superseded
+    for stale in glob.glob(os.path.join(cache_dir, f"{prefix}*.npy")):
+        if stale != cache_path:
+            logging.info(f"Removing superseded feature cache {stale}")
+            os.remove(stale)
+    return np.load(cache_path, mmap_mode="r")
@@ -0,0 +1,145 @@
+import os
+import glob
+import json
+import hashlib
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import create_dirs
+from src.utils.data_pipeline import AUTOTUNE
+from src.utils.preprocessing import RESIZE_MODE, decode_and_resize
+
+
+# per-directory record of the content hash of every image, keyed by path and revalidated by size and mtime
+CONTENT_HASHES = "content_hashes.json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as image_file:
+        for chunk in iter(lambda: image_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _content_hashes(paths: list, hash_dir: str = None) -> list:
+    """
+    Returns the SHA-256 of every file. With hash_dir, hashes are remembered in hash_dir/CONTENT_HASHES
+    together with the size and modification time of the file, and a file is only read again when either changed.
+    """
+    record_path = os.path.join(hash_dir, CONTENT_HASHES) if hash_dir else None
+    record = {}
+    if record_path and os.path.exists(record_path):
+        with open(record_path) as record_file:
+            record = json.load(record_file)
+    hashes, changed = [], False
+    for path in paths:
+        stat = os.stat(path)
+        entry = record.get(path)
+        if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+            entry = [stat.st_size, stat.st_mtime_ns, _sha256(path)]
+            record[path] = entry
+            changed = True
+        hashes.append(entry[2])
+    if record_path and changed:
+        create_dirs([record_path])
+        tmp_path = f"{record_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as record_file:
+            json.dump(record, record_file)
+        os.replace(tmp_path, record_path)
+    return hashes
+
+
+def dataset_fingerprint(paths: list, image_size: list, resize_mode: str = RESIZE_MODE, hash_dir: str = None) -> str:
+    """
+    Computes the key of an image cache from the file list and contents, the target image size and the resize mode.
+    Every file contributes its path and the SHA-256 of its bytes, so adding, removing or replacing an image changes
+    the key, while touching or re-extracting identical files does not. The hashes are remembered in hash_dir and only
+    recomputed for files whose size or modification time changed, so an unchanged dataset is not read again.
+
+    Args:
+        paths (list): Image paths in cache row order.
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        resize_mode (str): How the images are fitted to image_size, one of RESIZE_MODES.
+        hash_dir (str): Directory remembering the content hashes; None hashes every file.
+
+    Returns:
+        str: Hex digest identifying the cache.
+    """
+    digest = hashlib.sha256(json.dumps([[int(dim) for dim in image_size[:2]], resize_mode]).encode())
+    for path, content_hash in zip(paths, _content_hashes(paths, hash_dir)):
+        digest.update(f"{path}\0{content_hash}\n".encode())
+    return digest.hexdigest()[:20]
+
+
+def image_cache_path(paths: list, image_size: list, cache_dir: str, resize_mode: str = RESIZE_MODE) -> str:
+    """
+    Returns the path of the image cache of paths at image_size, e.g. cache_dir/images_224x224_stretch_{key}.npy.
+    """
+    key = dataset_fingerprint(paths, image_size, resize_mode, hash_dir=cache_dir)
+    return os.path.join(cache_dir, f"{_cache_prefix(image_size, resize_mode)}{key}.npy")
+
+
+def _cache_prefix(image_size: list, resize_mode: str) -> str:
+    return f"images_{int(image_size[0])}x{int(image_size[1])}_{resize_mode}_"
+
+
+def _build_image_cache(paths: list, image_size: list, cache_path: str, resize_mode: str = RESIZE_MODE) -> None:
+    """
+    Decodes and resizes every image once and writes the uint8 tensors into a .npy file.
+    The file is written under a temporary name and renamed when complete, so an interrupted
+    build is never picked up as a valid cache.
+    """
+    create_dirs([cache_path])
+    height, width = int(image_size[0]), int(image_size[1])
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    cache = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                      shape=(len(paths), height, width, 3))
+
+    def _to_uint8(path):
+        image = tf.round(decode_and_resize(path, image_size, resize_mode))
+        return tf.cast(tf.clip_by_value(image, 0, 255), tf.uint8)
+
+    dataset = tf.data.Dataset.from_tensor_slices(list(paths))
+    dataset = dataset.map(_to_uint8, num_parallel_calls=AUTOTUNE).batch(256).prefetch(AUTOTUNE)
+    row = 0
+    for images in dataset.as_numpy_iterator():
+        cache[row:row + len(images)] = images
+        row += len(images)
+    cache.flush()
+    del cache
+    os.replace(tmp_path, cache_path)
+
+
+def load_image_cache(paths: list, image_size: list, cache_dir: str, resize_mode: str = RESIZE_MODE) -> np.ndarray:
+    """
+    Returns the decoded-and-resized images of paths as a read-only memory-mapped uint8 array,
+    building the cache first if no cache exists for the current files and image size. Building a cache removes
+    the caches of the same image size and resize mode it supersedes, so cache_dir does not grow with every change.
+
+    Args:
+        paths (list): Image paths; row i of the returned array is paths[i].
+        image_size (list): Target image size, e.g. [224, 224, 3].
+        cache_dir (str): Directory holding the cache files.
+        resize_mode (str): How the images are fitted to image_size, one of RESIZE_MODES.
+
+    Returns:
+        np.ndarray: Memory-mapped array of shape (len(paths), height, width, 3).
+
+    Example Usage:
+        paths, labels, splits, class_names = read_manifest('artifacts/data_split/manifest.csv',
+                                                           'artifacts/data/data/natural_images')
+        cache = load_image_cache(paths, [224, 224, 3], 'artifacts/image_cache')
+    """
+    cache_path = image_cache_path(paths, image_size, cache_dir, resize_mode)
+    if os.path.exists(cache_path):
+        logging.info(f"Using image cache {cache_path}")
+    else:
+        logging.info(f"Building image cache {cache_path} for {len(paths)} images")
+        _build_image_cache(paths, image_size, cache_path, resize_mode)
+        # caches of the same image size and resize mode for older versions of the files are superseded
+        for stale in glob.glob(os.path.join(cache_dir, f"{_cache_prefix(image_size, resize_mode)}*.npy")):
+            if stale != cache_path:
+                logging.info(f"Removing superseded image cache {stale}")
+                os.remove(stale)
+    return np.load(cache_path, mmap_mode="r")
@@ -0,0 +1,144 @@
+import numpy as np
+
+CALIBRATION_BINS = 15
+# same clipping keras applies before the log of CategoricalCrossentropy
+EPSILON = 1e-7
+
+
+class StreamingClassificationMetrics:
+    """
+    Accumulates classification metrics over batches of predicted probabilities in a single pass.
+    Only running counts are kept (a confusion matrix, top-k hit counts and calibration bins), so memory
+    does not grow with the number of samples, and every update is vectorized over the batch.
+
+    Attributes:
+        num_classes (int): Number of classes.
+        top_k (int): Largest k of the top-k accuracies.
+        confusion (np.ndarray): Counts of shape (num_classes, num_classes); rows are true, columns predicted classes.
+        top_k_hits (np.ndarray): Samples whose true class is among the k most likely ones, for k = 1..top_k.
+        loss_sum (float): Sum of the per-sample cross-entropy.
+        bin_count (np.ndarray), bin_confidence (np.ndarray), bin_correct (np.ndarray): Sample count, summed top-1
+            confidence and correct top-1 predictions per confidence bin.
+
+    Methods:
+        update(self, y_true, probabilities): Adds a batch.
+        result(self, class_names=None) -> dict: Loss, accuracy, top-k accuracy, calibration error and per-class scores.
+
+    Example Usage:
+        metrics = StreamingClassificationMetrics(num_classes=8, top_k=3)
+        for images, targets in dataset:
+            metrics.update(targets, model.predict_on_batch(images))
+        report = metrics.result(class_names)
+    """
+    def __init__(self, num_classes: int, top_k: int = 1, bins: int = CALIBRATION_BINS):
+        self.num_classes = num_classes
+        self.top_k = max(1, min(top_k, num_classes))
+        self.bins = bins
+        self.confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        self.top_k_hits = np.zeros(self.top_k, dtype=np.int64)
+        self.loss_sum = 0.0
+        self.bin_count = np.zeros(bins, dtype=np.int64)
+        self.bin_confidence = np.zeros(bins, dtype=np.float64)
+        self.bin_correct = np.zeros(bins, dtype=np.int64)
+
+    def update(self, y_true, probabilities) -> None:
+        """
+        Adds a batch of predictions.
+
+        Args:
+            y_true (np.ndarray): Integer labels of shape (batch,) or one-hot labels of shape (batch, num_classes).
+            probabilities (np.ndarray): Predicted class probabilities of shape (batch, num_classes).
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        y_true = np.asarray(y_true)
+        if y_true.ndim == 2:
+            y_true = y_true.argmax(axis=1)
+        y_true = y_true.astype(np.int64)
+        rows = np.arange(len(y_true))
+
+        y_pred = probabilities.argmax(axis=1)
+        self.confusion += np.bincount(y_true * self.num_classes + y_pred,
+                                      minlength=self.num_classes ** 2).reshape(self.num_classes, self.num_classes)
+
+        # rank of the true class: number of classes scored strictly higher
+        true_scores = probabilities[rows, y_true]
+        rank = (probabilities > true_scores[:, None]).sum(axis=1)
+        self.top_k_hits += np.bincount(np.minimum(rank, self.top_k), minlength=self.top_k + 1)[:self.top_k].cumsum()
+
+        self.loss_sum += float(-np.log(np.clip(true_scores, EPSILON, 1.0 - EPSILON)).sum())
+
+        confidence = probabilities[rows, y_pred]
+        bin_index = np.minimum((confidence * self.bins).astype(np.int64), self.bins - 1)
+        self.bin_count += np.bincount(bin_index, minlength=self.bins)
+        self.bin_confidence += np.bincount(bin_index, weights=confidence, minlength=self.bins)
+        self.bin_correct += np.bincount(bin_index, weights=y_pred == y_true, minlength=self.bins).astype(np.int64)
+
+    def result(self, class_names: list = None) -> dict:
+        """
+        Computes the metrics from the accumulated counts.
+
+        Args:
+            class_names (list): Optional class names for the per-class scores, defaults to the class indices.
+
+        Returns:
+            dict: samples, loss, accuracy, top_{k}_accuracy, expected calibration error (ece), macro and weighted
+                precision/recall/F1, per_class scores and the confusion matrix.
+        """
+        samples = int(self.confusion.sum())
+        true_positives = np.diag(self.confusion).astype(np.float64)
+        support = self.confusion.sum(axis=1)
+        predicted = self.confusion.sum(axis=0)
+        precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+        f1 = np.divide(2 * precision * recall, precision + recall,
+                       out=np.zeros_like(true_positives), where=(precision + recall) > 0)
+        weights = support / max(samples, 1)
+        ece = float(np.abs(self.bin_correct - self.bin_confidence).sum() / max(samples, 1))
+
+        class_names = class_names or [str(label) for label in range(self.num_classes)]
+        return dict(
+            samples=samples,
+            loss=self.loss_sum / max(samples, 1),
+            accuracy=float(true_positives.sum() / max(samples, 1)),
+            **{f"top_{k}_accuracy": float(self.top_k_hits[k - 1] / max(samples, 1)) for k in range(2, self.top_k + 1)},
+            ece=ece,
+            macro_precision=float(precision.mean()),
+            macro_recall=float(recall.mean()),
+            macro_f1=float(f1.mean()),
+            weighted_f1=float((f1 * weights).sum()),
+            per_class={name: dict(precision=float(precision[label]),
+                                  recall=float(recall[label]),
+                                  f1=float(f1[label]),
+                                  support=int(support[label]))
+                       for label, name in enumerate(class_names)},
+            confusion_matrix=self.confusion.tolist(),
+            class_names=list(class_names),
+        )
+
+
+def plot_confusion_matrix(confusion: list, class_names: list, path: str) -> None:
+    """
+    Saves the confusion matrix as a heatmap, with the rows normalized to the recall of each class.
+
+    Args:
+        confusion (list): Confusion matrix as returned by StreamingClassificationMetrics.result.
+        class_names (list): Class names in label order.
+        path (str): Image file to write.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    counts = np.asarray(confusion, dtype=np.float64)
+    normalized = np.divide(counts, counts.sum(axis=1, keepdims=True),
+                           out=np.zeros_like(counts), where=counts.sum(axis=1, keepdims=True) > 0)
+    size = max(6, len(class_names) * 0.8)
+    figure, axes = plt.subplots(figsize=(size, size))
+    sns.heatmap(normalized, annot=counts.astype(np.int64), fmt="d", cmap="Blues", vmin=0, vmax=1,
+                xticklabels=class_names, yticklabels=class_names, ax=axes)
+    axes.set_xlabel("Predicted")
+    axes.set_ylabel("True")
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
@@ -0,0 +1,128 @@
+import time
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+
+PRUNABLE_LAYERS = (tf.keras.layers.Dense, tf.keras.layers.Conv2D, tf.keras.layers.DepthwiseConv2D)
+
+
+def count_flops(model: tf.keras.Model) -> int:
+    """
+    Counts the floating point operations of one forward pass of a single image, from the frozen inference graph.
+    A multiply-add counts as two operations.
+
+    Args:
+        model (tf.keras.Model): The model.
+
+    Returns:
+        int: FLOPs per image, 0 if the profiler is not available.
+    """
+    from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+    spec = tf.TensorSpec([1, *model.input_shape[1:]], model.inputs[0].dtype)
+    forward = tf.function(lambda images: model(images, training=False)).get_concrete_function(spec)
+    graph = convert_variables_to_constants_v2(forward).graph
+    options = tf.compat.v1.profiler.ProfileOptionBuilder.float_operation()
+    options["output"] = "none"
+    try:
+        profile = tf.compat.v1.profiler.profile(graph=graph, run_meta=tf.compat.v1.RunMetadata(),
+                                                cmd="op", options=options)
+    except Exception as e:
+        logging.warning(f"Could not count the FLOPs of {model.name}: {e}")
+        return 0
+    return int(profile.total_float_ops)
+
+
+def cpu_latency(model: tf.keras.Model, runs: int = 20, warmup: int = 3) -> dict:
+    """
+    Measures the latency of predicting a single image, after a few warm-up calls.
+
+    Args:
+        model (tf.keras.Model): The model.
+        runs (int): Number of timed predictions.
+        warmup (int): Number of untimed predictions before the timed ones.
+
+    Returns:
+        dict: Mean, p50 and p90 latency in milliseconds.
+    """
+    image = np.random.default_rng(0).random((1, *model.input_shape[1:]), dtype=np.float32)
+    for _ in range(warmup):
+        model.predict_on_batch(image)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.predict_on_batch(image)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    latencies = np.array(latencies)
+    return dict(mean=float(latencies.mean()),
+                p50=float(np.percentile(latencies, 50)),
+                p90=float(np.percentile(latencies, 90)))
+
+
+def weight_sparsity(model: tf.keras.Model) -> float:
+    """
+    Returns the fraction of zero weights in the kernels of the Dense and convolution layers.
+    """
+    kernels = [_kernel(layer).numpy() for layer in _prunable_layers(model)]
+    total = sum(kernel.size for kernel in kernels)
+    return float(sum((kernel == 0).sum() for kernel in kernels) / total) if total else 0.0
+
+
+def _kernel(layer: tf.keras.layers.Layer) -> tf.Variable:
+    if isinstance(layer, tf.keras.layers.DepthwiseConv2D):
+        return layer.depthwise_kernel
+    return layer.kernel
+
+
+def _prunable_layers(model: tf.keras.Model) -> list:
+    layers = []
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.Model):
+            layers.extend(_prunable_layers(layer))
+        elif isinstance(layer, PRUNABLE_LAYERS):
+            layers.append(layer)
+    return layers
+
+
+def prune_by_magnitude(model: tf.keras.Model, sparsity: float) -> tf.keras.Model:
+    """
+    Zeroes the smallest-magnitude weights of every Dense and convolution kernel in place, so that each kernel
+    reaches the target sparsity. Biases and normalization parameters are kept.
+
+    Args:
+        model (tf.keras.Model): The model to prune.
+        sparsity (float): Fraction of every kernel set to zero, in [0, 1).
+
+    Returns:
+        tf.keras.Model: model, pruned.
+    """
+    if not 0.0 <= sparsity < 1.0:
+        raise ValueError(f"WEIGHT_SPARSITY must be in [0, 1), got {sparsity}")
+    if sparsity == 0.0:
+        return model
+    for layer in _prunable_layers(model):
+        kernel = _kernel(layer).numpy()
+        threshold = np.quantile(np.abs(kernel), sparsity)
+        _kernel(layer).assign(np.where(np.abs(kernel) <= threshold, 0.0, kernel).astype(kernel.dtype))
+    logging.info(f"Pruned {model.name} to {weight_sparsity(model):.1%} zero kernel weights")
+    return model
+
+
+def profile_model(model: tf.keras.Model, runs: int = 20) -> dict:
+    """
+    Describes the cost of a model: parameter counts, FLOPs per image, kernel sparsity and single-image CPU latency.
+
+    Args:
+        model (tf.keras.Model): The model.
+        runs (int): Number of timed predictions.
+
+    Returns:
+        dict: params, trainable_params, flops, sparsity and latency_ms.
+
+    Example Usage:
+        profile = profile_model(tf.keras.models.load_model('artifacts/training/trained_model_1.h5', compile=False))
+    """
+    return dict(params=int(model.count_params()),
+                trainable_params=int(sum(np.prod(weight.shape) for weight in model.trainable_weights)),
+                flops=count_flops(model),
+                sparsity=weight_sparsity(model),
+                latency_ms=cpu_latency(model, runs=runs))
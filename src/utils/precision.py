@@ -0,0 +1,69 @@
+import tensorflow as tf
+from src.logger import logging
+
+MIXED_POLICY = "mixed_bfloat16"
+
+
+def bf16_supported() -> bool:
+    """
+    Checks whether the machine computes bfloat16 natively: a GPU of compute capability 8.0 or newer,
+    or a CPU advertising the avx512_bf16 or amx_bf16 flags. Without native support bfloat16 is emulated
+    and slower than float32.
+
+    Returns:
+        bool: True if the mixed_bfloat16 policy is worth enabling.
+    """
+    for gpu in tf.config.list_physical_devices("GPU"):
+        if tf.config.experimental.get_device_details(gpu).get("compute_capability", (0, 0)) >= (8, 0):
+            return True
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            flags = cpuinfo.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def resolve_precision_policy(mixed_precision: bool) -> str:
+    """
+    Returns the Keras dtype policy to train with.
+
+    Args:
+        mixed_precision (bool): MIXED_PRECISION from params.yaml.
+
+    Returns:
+        str: "mixed_bfloat16" if requested and supported, "float32" otherwise.
+    """
+    if not mixed_precision:
+        return "float32"
+    if not bf16_supported():
+        logging.warning("MIXED_PRECISION requested but this machine has no native bfloat16 support, training in float32")
+        return "float32"
+    return MIXED_POLICY
+
+
+def apply_precision_policy(model: tf.keras.Model, policy: str) -> tf.keras.Model:
+    """
+    Clones model with every layer computing in policy, except the output layer which stays in float32
+    so the softmax and the loss are computed in full precision. Weights and trainable flags are copied.
+
+    Args:
+        model (tf.keras.Model): float32 model.
+        policy (str): Keras dtype policy name, e.g. "mixed_bfloat16".
+
+    Returns:
+        tf.keras.Model: The cloned model (model itself when policy is "float32").
+    """
+    if policy == "float32":
+        return model
+    output_layer = model.layers[-1]
+
+    def _clone_layer(layer):
+        config = layer.get_config()
+        config["dtype"] = "float32" if layer is output_layer else policy
+        return layer.__class__.from_config(config)
+
+    clone = tf.keras.models.clone_model(model, clone_function=_clone_layer)
+    clone.set_weights(model.get_weights())
+    logging.info(f"Training with the {policy} policy, output layer kept in float32")
+    return clone
@@ -0,0 +1,67 @@
+import tensorflow as tf
+
+# how an image is fitted to the model input: "stretch" resizes both sides independently, "center_crop" scales the
+# shorter side to fit and cuts the center, "letterbox" scales the longer side to fit and pads the rest with black
+RESIZE_MODES = ("stretch", "center_crop", "letterbox")
+RESIZE_MODE = "stretch"
+
+
+def resize_images(images, image_size: list, mode: str = RESIZE_MODE) -> tf.Tensor:
+    """
+    Fits an image, or a batch of images of the same size, to image_size with native TensorFlow ops, so the resize
+    runs inside the graph of the input pipeline or the model call instead of in Python.
+
+    Args:
+        images (tf.Tensor): Image of shape (height, width, 3) or batch of shape (batch, height, width, 3).
+        image_size (list): Target [height, width] (a trailing channel entry is ignored).
+        mode (str): One of RESIZE_MODES.
+
+    Returns:
+        tf.Tensor: float32 images of the target size, values in the range of the input.
+
+    Example Usage:
+        images = resize_images(tf.io.decode_jpeg(encoded), [224, 224, 3], mode="center_crop")
+    """
+    if mode not in RESIZE_MODES:
+        raise ValueError(f"RESIZE_MODE must be one of {RESIZE_MODES}, got {mode!r}")
+    height, width = int(image_size[0]), int(image_size[1])
+    images = tf.cast(images, tf.float32)
+    if mode == "stretch":
+        return tf.image.resize(images, [height, width])
+    if mode == "letterbox":
+        return tf.image.resize_with_pad(images, height, width)
+    shape = tf.cast(tf.shape(images)[-3:-1], tf.float32)
+    scale = tf.reduce_max(tf.constant([height, width], tf.float32) / shape)
+    images = tf.image.resize(images, tf.cast(tf.math.ceil(shape * scale), tf.int32))
+    return tf.image.resize_with_crop_or_pad(images, height, width)
+
+
+def decode_and_resize(path, image_size: list, mode: str = RESIZE_MODE) -> tf.Tensor:
+    """
+    Reads an image file and resizes it inside the graph.
+
+    Args:
+        path (tf.Tensor): Scalar string tensor with the image path.
+        image_size (list): Target [height, width] (a trailing channel entry is ignored).
+        mode (str): One of RESIZE_MODES.
+
+    Returns:
+        tf.Tensor: float32 image of shape (height, width, 3) with values in [0, 255].
+    """
+    return decode_bytes(tf.io.read_file(path), image_size, mode)
+
+
+def decode_bytes(image_bytes, image_size: list, mode: str = RESIZE_MODE) -> tf.Tensor:
+    """
+    Decodes an encoded image (JPEG, PNG, BMP or GIF) and resizes it inside the graph.
+
+    Args:
+        image_bytes (tf.Tensor or bytes): Encoded image file.
+        image_size (list): Target [height, width] (a trailing channel entry is ignored).
+        mode (str): One of RESIZE_MODES.
+
+    Returns:
+        tf.Tensor: float32 image of shape (height, width, 3) with values in [0, 255].
+    """
+    image = tf.io.decode_image(image_bytes, channels=3, expand_animations=False)
+    return resize_images(image, image_size, mode)
@@ -0,0 +1,66 @@
+import os
+import shutil
+import numpy as np
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import save_json, load_json
+
+
+def _synthetic_image(rng: np.random.Generator, height: int, width: int, label: int, classes: int) -> np.ndarray:
+    """
+    Draws one image: a colour gradient whose hue depends on the class, a few random rectangles and noise.
+    Pure noise would compress badly and make JPEG decoding slower than for photographs.
+    """
+    hue = label / max(classes, 1)
+    base = np.array([np.sin(2 * np.pi * (hue + shift)) * 0.5 + 0.5 for shift in (0.0, 1 / 3, 2 / 3)]) * 255
+    rows = np.linspace(0.4, 1.0, height, dtype=np.float32)[:, None, None]
+    cols = np.linspace(1.0, 0.6, width, dtype=np.float32)[None, :, None]
+    image = base[None, None, :] * rows * cols
+    for _ in range(rng.integers(2, 6)):
+        top, left = rng.integers(0, height // 2), rng.integers(0, width // 2)
+        bottom, right = top + rng.integers(height // 8, height // 2), left + rng.integers(width // 8, width // 2)
+        image[top:bottom, left:right] = rng.integers(0, 256, size=3)
+    image += rng.normal(0, 8, size=image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def make_synthetic_dataset(data_dir: str, classes: int, images_per_class: int, seed: int,
+                           min_side: int = 100, max_side: int = 400) -> str:
+    """
+    Writes a class-per-folder dataset of JPEG images with the layout of the natural images dataset, so the
+    input pipelines and models can be benchmarked offline. Image sides vary like in the real dataset, so the
+    resize cost is part of the measurement. The dataset is generated again only when its arguments change.
+
+    Args:
+        data_dir (str): Directory the class folders are written to.
+        classes (int): Number of classes.
+        images_per_class (int): Number of images per class.
+        seed (int): Seed of the image contents and sizes.
+        min_side (int): Smallest image height or width.
+        max_side (int): Largest image height or width.
+
+    Returns:
+        str: data_dir.
+
+    Example Usage:
+        data_dir = make_synthetic_dataset('artifacts/benchmark/synthetic_images', classes=8,
+                                          images_per_class=40, seed=42)
+    """
+    spec = dict(classes=classes, images_per_class=images_per_class, seed=seed, min_side=min_side, max_side=max_side)
+    spec_path = os.path.join(data_dir, "synthetic.json")
+    if os.path.exists(spec_path) and load_json(spec_path) == spec:
+        logging.info(f"Reusing synthetic dataset {data_dir}")
+        return data_dir
+
+    shutil.rmtree(data_dir, ignore_errors=True)
+    rng = np.random.default_rng(seed)
+    for label in range(classes):
+        class_dir = os.path.join(data_dir, f"class_{label:02d}")
+        os.makedirs(class_dir, exist_ok=True)
+        for number in range(images_per_class):
+            height, width = rng.integers(min_side, max_side + 1, size=2)
+            image = _synthetic_image(rng, int(height), int(width), label, classes)
+            tf.io.write_file(os.path.join(class_dir, f"{number:05d}.jpg"), tf.io.encode_jpeg(image, quality=90))
+    save_json(values=spec, path=spec_path)
+    logging.info(f"Generated {classes * images_per_class} synthetic images in {data_dir}")
+    return data_dir
@@ -0,0 +1,153 @@
+import os
+import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import tensorflow as tf
+from src.logger import logging
+from src.utils.common import create_dirs, save_json, load_json
+
+TFRECORD_INDEX = "index.json"
+TFRECORD_COMPRESSIONS = ("", "GZIP", "ZLIB")
+# read buffer of every open shard, so each one is read in large sequential requests
+TFRECORD_READ_BUFFER = 8 << 20
+# shards read at the same time by the parallel interleave
+TFRECORD_CYCLE_LENGTH = 8
+
+
+def _shard_name(shard: int, num_shards: int) -> str:
+    return f"shard-{shard:05d}-of-{num_shards:05d}.tfrecord"
+
+
+def _files_fingerprint(paths: list, splits: list, data_dir: str, num_shards: int, compression: str) -> str:
+    digest = hashlib.sha256(f"{num_shards}:{compression}".encode())
+    for path, split in zip(paths, splits):
+        stat = os.stat(path)
+        digest.update(f"{os.path.relpath(path, data_dir)}\0{split}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:20]
+
+
+def _example(relative_path: str, label: int, image_bytes: bytes) -> bytes:
+    feature = dict(
+        path=tf.train.Feature(bytes_list=tf.train.BytesList(value=[relative_path.encode()])),
+        label=tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+        image=tf.train.Feature(bytes_list=tf.train.BytesList(value=[image_bytes])),
+    )
+    return tf.train.Example(features=tf.train.Features(feature=feature)).SerializeToString()
+
+
+def write_tfrecord_shards(paths: list, labels: list, splits: list, class_names: list, data_dir: str,
+                          output_dir: str, num_shards: int, compression: str = "", workers: int = 8) -> dict:
+    """
+    Packs the encoded image files and their labels into TFRecord shards, one shard set per split in
+    output_dir/{split}, so a consumer of one split reads only its own records. The num_shards shards are divided
+    between the splits in proportion to their sizes (at least one each), and the images of a split go round-robin
+    into its shards, so every shard holds all classes. The images are stored as they are on disk, not decoded.
+    Shards are written under a temporary name and the index last, so an interrupted run never leaves a readable but
+    incomplete dataset. Nothing is written when the index already matches the files, their splits, the shard count
+    and the compression.
+
+    Args:
+        paths (list): Image paths as returned by read_manifest.
+        labels (list): Integer labels aligned with paths.
+        splits (list): Split of every image, aligned with paths.
+        class_names (list): Class names in label order.
+        data_dir (str): Dataset root; records are keyed by the path relative to it, like the split manifest.
+        output_dir (str): Directory of the split directories and the index.
+        num_shards (int): Number of shards over all splits.
+        compression (str): "", "GZIP" or "ZLIB".
+        workers (int): Number of shards written at the same time.
+
+    Returns:
+        dict: The index.
+
+    Example Usage:
+        paths, labels, splits, class_names = read_manifest('artifacts/data_split/manifest.csv',
+                                                           'artifacts/data/data/natural_images')
+        write_tfrecord_shards(paths, labels, splits, class_names, 'artifacts/data/data/natural_images',
+                              'artifacts/data_split/tfrecords', num_shards=8, compression='GZIP')
+    """
+    if compression not in TFRECORD_COMPRESSIONS:
+        raise ValueError(f"TFRECORD_COMPRESSION must be one of {TFRECORD_COMPRESSIONS}, got {compression!r}")
+    index_path = os.path.join(output_dir, TFRECORD_INDEX)
+    fingerprint = _files_fingerprint(paths, splits, data_dir, num_shards, compression)
+    if os.path.exists(index_path) and load_json(index_path).get("fingerprint") == fingerprint:
+        logging.info(f"TFRecord shards in {output_dir} are up to date")
+        return load_json(index_path)
+
+    create_dirs([index_path])
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    options = tf.io.TFRecordOptions(compression_type=compression)
+    members = {}
+    for index, split in enumerate(splits):
+        members.setdefault(split, []).append(index)
+    split_shards = {split: max(1, round(num_shards * len(indices) / len(paths))) for split, indices in members.items()}
+
+    def _write_shard(task):
+        split, shard = task
+        indices = members[split][shard::split_shards[split]]
+        name = _shard_name(shard, split_shards[split])
+        split_dir = os.path.join(output_dir, split)
+        tmp_path = os.path.join(split_dir, f"{name}.{os.getpid()}.tmp")
+        with tf.io.TFRecordWriter(tmp_path, options=options) as writer:
+            for index in indices:
+                with open(paths[index], "rb") as image_file:
+                    writer.write(_example(os.path.relpath(paths[index], data_dir), labels[index], image_file.read()))
+        shard_path = os.path.join(split_dir, name)
+        os.replace(tmp_path, shard_path)
+        return split, dict(file=os.path.join(split, name), records=len(indices), bytes=os.path.getsize(shard_path))
+
+    create_dirs([os.path.join(output_dir, split) for split in members])
+    tasks = [(split, shard) for split in members for shard in range(split_shards[split])]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        written = list(executor.map(_write_shard, tasks))
+    shard_files = {shard["file"] for _, shard in written}
+    for stale in glob.glob(os.path.join(output_dir, "**", "shard-*.tfrecord"), recursive=True):
+        if os.path.relpath(stale, output_dir) not in shard_files:
+            os.remove(stale)
+
+    index = dict(fingerprint=fingerprint,
+                 compression=compression,
+                 class_names=list(class_names),
+                 splits={split: dict(records=len(indices),
+                                     shards=[shard for shard_split, shard in written if shard_split == split])
+                         for split, indices in members.items()})
+    save_json(values=index, path=index_path)
+    logging.info(f"Wrote {len(paths)} images into {len(tasks)} TFRecord shards in {output_dir} "
+                 f"({sum(shard['bytes'] for _, shard in written) / 2 ** 20:.1f} MiB), shards per split: {split_shards}")
+    return index
+
+
+def read_tfrecord_index(tfrecord_dir: str) -> dict:
+    """
+    Reads the index sidecar written by write_tfrecord_shards.
+
+    Args:
+        tfrecord_dir (str): Directory of the shards.
+
+    Returns:
+        dict: fingerprint, compression, class_names and splits (split name to the number of records and the
+            shards, each with its file relative to tfrecord_dir, records and bytes).
+    """
+    index_path = os.path.join(tfrecord_dir, TFRECORD_INDEX)
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"{index_path} does not exist; set TFRECORD_SHARDS and run the data split stage")
+    return load_json(index_path)
+
+
+def parse_example(serialized: tf.Tensor) -> tuple:
+    """
+    Parses one record of write_tfrecord_shards.
+
+    Args:
+        serialized (tf.Tensor): Scalar string tensor with the serialized tf.train.Example.
+
+    Returns:
+        tuple: (relative_path, label, image_bytes) tensors.
+    """
+    features = tf.io.parse_single_example(serialized, dict(
+        path=tf.io.FixedLenFeature([], tf.string),
+        label=tf.io.FixedLenFeature([], tf.int64),
+        image=tf.io.FixedLenFeature([], tf.string),
+    ))
+    return features["path"], features["label"], features["image"]
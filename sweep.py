@@ -0,0 +1,24 @@
+import argparse
+from dataclasses import replace
+from src.config.configuration_manager import ConfigurationManager
+from src.components.sweep_component import SweepComponent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train and rank params.yaml variants from the sweep search space.")
+    parser.add_argument("--strategy", choices=["grid", "random"], default=None, help="Defaults to STRATEGY in sweep.yaml")
+    parser.add_argument("--trials", type=int, default=None, help="Random trials, defaults to TRIALS in sweep.yaml")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel trials, defaults to WORKERS in sweep.yaml")
+    parser.add_argument("--threads-per-trial", type=int, default=None,
+                        help="Cores pinned to each worker, defaults to THREADS_PER_TRIAL in sweep.yaml")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sweep_entity = ConfigurationManager().get_sweep_entity()
+    overrides = dict(strategy=args.strategy, trials=args.trials, workers=args.workers,
+                     threads_per_trial=args.threads_per_trial)
+    sweep_entity = replace(sweep_entity, **{key: value for key, value in overrides.items() if value is not None})
+    leaderboard = SweepComponent(sweep_entity).run()
+    print(leaderboard.to_string(index=False))
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+from src.config.configuration_manager import ConfigurationManager
+from src.components.stage_03_callbacks import CALLBACKSCOMPONENT
+from src.components.stage_04_model_training import TrainingComponent
+from src.utils.distribute import cluster_tf_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train with MultiWorkerMirroredStrategy across several workers.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--local-workers", type=int,
+                      help="Start this many workers on this machine, each with an even share of the CPU cores")
+    mode.add_argument("--task-index", type=int,
+                      help="Run worker TASK_INDEX of distributed.workers in config.yaml on this machine")
+    parser.add_argument("--workers", default=None,
+                        help="Comma-separated host:port list overriding distributed.workers")
+    return parser.parse_args()
+
+
+def _free_ports(count: int) -> list:
+    sockets = [socket.socket() for _ in range(count)]
+    for sock in sockets:
+        sock.bind(("localhost", 0))
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def run_worker(task_index: int, workers: list):
+    os.environ["TF_CONFIG"] = cluster_tf_config(workers, task_index)
+    cm = ConfigurationManager()
+    if cm.config.distributed.strategy == "none":
+        cm.config.distributed.strategy = "multi_worker_mirrored"
+    training = TrainingComponent(TrainingEntity=cm.get_training_entity())
+    callbacks = CALLBACKSCOMPONENT(cm.get_callbacks_entity()).callbacks_list()
+    training.test_train_split()
+    training.train(callback_list=callbacks)
+
+
+def launch_local(count: int) -> int:
+    workers = [f"localhost:{port}" for port in _free_ports(count)]
+    threads = max(1, (os.cpu_count() or 1) // count)
+    env = dict(os.environ, TF_NUM_INTRAOP_THREADS=str(threads), TF_NUM_INTEROP_THREADS="2")
+    processes = [subprocess.Popen([sys.executable, __file__, "--task-index", str(index), "--workers", ",".join(workers)],
+                                  env=env)
+                 for index in range(count)]
+    # a worker that dies leaves the others blocked in collectives, so stop them all
+    while any(process.poll() is None for process in processes):
+        if any(process.poll() not in (None, 0) for process in processes):
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+        time.sleep(1)
+    return max(abs(process.returncode) for process in processes)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.local_workers:
+        sys.exit(launch_local(args.local_workers))
+    workers = args.workers.split(",") if args.workers else list(ConfigurationManager().config.distributed.workers)
+    run_worker(args.task_index, workers)